@@ -15,6 +15,12 @@ app_datas = [
     (os.path.join(SPEC_DIR, "instructions_parser.py"), "."),
     (os.path.join(SPEC_DIR, "excel_builder.py"), "."),
     (os.path.join(SPEC_DIR, "find_station_rows.py"), "."),
+    (os.path.join(SPEC_DIR, "xlsx_reader.py"), "."),
+    (os.path.join(SPEC_DIR, "ramp_engine.py"), "."),
+    (os.path.join(SPEC_DIR, "report_rows.py"), "."),
+    (os.path.join(SPEC_DIR, "lookup_cache.py"), "."),
+    (os.path.join(SPEC_DIR, "report_pipeline.py"), "."),
+    (os.path.join(SPEC_DIR, "report_export.py"), "."),
 ]
 streamlit_config = os.path.join(SPEC_DIR, ".streamlit", "config.toml")
 if os.path.isfile(streamlit_config):
@@ -39,6 +45,9 @@ a = Analysis(
         "streamlit",
         "streamlit.web.cli",
         "pandas",
+        "numpy",
+        "pyarrow",
+        "pyarrow.parquet",
         "openpyxl",
         "st_aggrid",
     ] + streamlit_hidden + altair_hidden,
@@ -4,6 +4,8 @@ Streamlit Desktop App for Find Station Rows
 Converts the command-line tool into a user-friendly GUI
 """
 
+import functools
+import io
 import json
 import os
 import sys
@@ -14,18 +16,28 @@ import uuid
 from pathlib import Path
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 from background_job import read_job as background_read_job
 from background_job import write_job as background_write_job
-from config import BACKGROUND_JOB_FILE, PAGE_SIZE_ALL, PARTIAL_OUTPUT_WRITE_INTERVAL, PROCESSING_BATCH_SIZE, REPORTS_DIR, table_height
-from excel_builder import build_report_workbook
+from config import BACKGROUND_JOB_FILE, BD_CACHE_DIR, BD_PRELOAD_WORKERS, BD_RESAMPLE, LOOKUP_CACHE_DIR, PAGE_SIZE_ALL, PARTIAL_OUTPUT_WRITE_INTERVAL, PROCESSING_BATCH_SIZE, REPORTS_DIR, XLSX_READER_ENGINE, table_height
+import lookup_cache
+import ramp_engine
+import report_pipeline
+from excel_builder import build_scenario_workbook
 from instructions_parser import extract_stations_and_title
+from report_export import available_formats as export_formats_available
 from reports_store import append_entry as reports_append_entry
+from reports_store import export_base as reports_export_base
+from reports_store import export_files as reports_export_files
+from reports_store import file_bytes as reports_file_bytes
 from reports_store import load_index as reports_load_index
-from reports_store import save_file as reports_save_file
+from reports_store import load_frame as reports_load_frame
+from reports_store import save_bytes as reports_save_bytes
 from url_utils import url_main, url_report_file, url_reports_list
+from xlsx_reader import load_workbook as xlsx_load_workbook
 
 try:
     import openpyxl
@@ -47,15 +59,19 @@ sys.path.insert(0, str(Path(__file__).parent))
 try:
     import find_station_rows as fsr
     # Get the functions we need from find_station_rows
-    format_value = fsr.format_value
-    slots_15min = fsr.slots_15min
-    time_to_minutes = fsr.time_to_minutes
-    convert_date_to_sheet_format = fsr.convert_date_to_sheet_format
+    slot_times = fsr.slot_times
     SCADALookupCache = fsr.SCADALookupCache
+    bd_duplicate_warnings = fsr.bd_duplicate_warnings
+    RESAMPLE_METHODS = fsr.RESAMPLE_METHODS
     find_scada_value = fsr.find_scada_value
     find_dc_value = fsr.find_dc_value
+    DCIndex = fsr.DCIndex
+    DayPrefetcher = fsr.DayPrefetcher
     find_column_by_name = fsr.find_column_by_name
     find_matching_rows = fsr.find_matching_rows
+    load_instructions_table = fsr.load_instructions_table
+    parse_scada_column_map = fsr.parse_scada_column_map
+    scada_column_for_station = fsr.scada_column_for_station
 except ImportError as e:
     st.error(f"Failed to import find_station_rows module: {e}")
     st.stop()
@@ -71,11 +87,31 @@ def _parse_float(val, default: float) -> float:
         return default
 
 
+def _load_report_frame(report_path: Path) -> pd.DataFrame:
+    """Saved report rows for the viewer: from the columnar sidecar when there is one, else from the xlsx."""
+    df = reports_load_frame(report_path.name)
+    if df is None:
+        df = _reconstruct_ins_end_marker(pd.read_excel(report_path, engine="openpyxl"))
+    return df
+
+
+def _lazy_file_data(path: Path):
+    """download_button data for a stored file: read (via the download cache) only when the button is clicked."""
+    return lambda: reports_file_bytes(path) or b""
+
+
+def _cell_texts(column: pd.Series) -> np.ndarray:
+    """Stripped text of every cell of a column ("" for blanks)."""
+    return column.map(lambda x: str(x).strip() if pd.notna(x) else "").to_numpy(dtype=object)
+
+
 def _reconstruct_ins_end_marker(df: pd.DataFrame) -> pd.DataFrame:
     """
     Reconstruct the _ins_end marker for DataFrames loaded from Excel.
     If _ins_end column exists (from saved Excel), convert string values to boolean.
-    Otherwise, try to detect instruction ends from the data pattern.
+    Otherwise, detect instruction ends from the data pattern, one pass over the columns:
+    a block is the run of slot rows up to a row before a new Date or a Sum Mus row (no From);
+    its instruction ends where the first gap starts (To != next From), else on its last row.
     """
     if "_ins_end" in df.columns:
         # Convert string values ("TRUE"/"FALSE") to boolean
@@ -84,98 +120,47 @@ def _reconstruct_ins_end_marker(df: pd.DataFrame) -> pd.DataFrame:
             lambda x: True if str(x).upper() == "TRUE" else False
         )
         return df
-    
+
     df = df.copy()
     df["_ins_end"] = False
-    
+
     if "From" not in df.columns or "To" not in df.columns or "Date" not in df.columns:
         return df
-    
+
     n = len(df)
-    for i in range(n):
-        row = df.iloc[i]
-        to_val = str(row.get("To", "")).strip() if pd.notna(row.get("To")) else ""
-        from_val = str(row.get("From", "")).strip() if pd.notna(row.get("From")) else ""
-        
-        # Skip rows without From/To (Sum Mus rows)
-        if not to_val or not from_val:
-            continue
-        
-        # Check if next row starts a new instruction (has Date value)
-        if i + 1 < n:
-            next_row = df.iloc[i + 1]
-            next_date = str(next_row.get("Date", "")).strip() if pd.notna(next_row.get("Date")) else ""
-            next_from = str(next_row.get("From", "")).strip() if pd.notna(next_row.get("From")) else ""
-            
-            # Next row has a Date = new instruction starts
-            # The row BEFORE next_date is either instruction end or gap end
-            # We need to find the actual instruction end (where gap starts, if any)
-            if next_date:
-                # Look backwards from current row to find where instruction ends
-                # Instruction end is where To time matches next_date row's From time
-                # OR where there's a discontinuity (gap starts)
-                
-                # Walk backwards to find first row of current block (has Date or follows Sum Mus)
-                block_start_idx = i
-                for j in range(i, -1, -1):
-                    check_row = df.iloc[j]
-                    check_date = str(check_row.get("Date", "")).strip() if pd.notna(check_row.get("Date")) else ""
-                    check_from = str(check_row.get("From", "")).strip() if pd.notna(check_row.get("From")) else ""
-                    if check_date:
-                        block_start_idx = j
-                        break
-                    if not check_from:  # Hit Sum Mus row
-                        block_start_idx = j + 1
-                        break
-                
-                # Now scan forward from block_start to find where To doesn't match next From
-                # That's where instruction ends and gap begins
-                found_gap_start = False
-                for j in range(block_start_idx, i):
-                    curr_to = str(df.iloc[j].get("To", "")).strip() if pd.notna(df.iloc[j].get("To")) else ""
-                    next_f = str(df.iloc[j + 1].get("From", "")).strip() if pd.notna(df.iloc[j + 1].get("From")) else ""
-                    if curr_to and next_f and curr_to != next_f:
-                        # Gap found - row j is instruction end
-                        df.iloc[j, df.columns.get_loc("_ins_end")] = True
-                        found_gap_start = True
-                        break
-                
-                # If no gap found, the row before next Date is instruction end
-                if not found_gap_start:
-                    df.iloc[i, df.columns.get_loc("_ins_end")] = True
-                continue
-            
-            # Next row is Sum Mus row (no From value)
-            if not next_from:
-                # Similar logic: find where gap starts within this block
-                block_start_idx = i
-                for j in range(i, -1, -1):
-                    check_row = df.iloc[j]
-                    check_date = str(check_row.get("Date", "")).strip() if pd.notna(check_row.get("Date")) else ""
-                    check_from = str(check_row.get("From", "")).strip() if pd.notna(check_row.get("From")) else ""
-                    if check_date:
-                        block_start_idx = j
-                        break
-                    if not check_from:
-                        block_start_idx = j + 1
-                        break
-                
-                found_gap_start = False
-                for j in range(block_start_idx, i):
-                    curr_to = str(df.iloc[j].get("To", "")).strip() if pd.notna(df.iloc[j].get("To")) else ""
-                    next_f = str(df.iloc[j + 1].get("From", "")).strip() if pd.notna(df.iloc[j + 1].get("From")) else ""
-                    if curr_to and next_f and curr_to != next_f:
-                        df.iloc[j, df.columns.get_loc("_ins_end")] = True
-                        found_gap_start = True
-                        break
-                
-                if not found_gap_start:
-                    df.iloc[i, df.columns.get_loc("_ins_end")] = True
-        else:
-            # Last row in dataframe
-            if to_val:
-                df.iloc[i, df.columns.get_loc("_ins_end")] = True
-    
+    if n == 0:
+        return df
+    has_date = _cell_texts(df["Date"]) != ""
+    from_text = _cell_texts(df["From"])
+    to_text = _cell_texts(df["To"])
+    has_from = from_text != ""
+    has_to = to_text != ""
+    positions = np.arange(n)
+
+    # Block ends: slot rows followed by a new Date or a Sum Mus row (or the last row)
+    next_starts = np.ones(n, dtype=bool)
+    next_starts[:-1] = has_date[1:] | ~has_from[1:]
+    block_end = has_from & has_to & next_starts
+
+    # Block start of every row: the nearest row at or above with a Date, or the row after a Sum Mus row
+    boundary = has_date | ~has_from
+    last_boundary = np.maximum.accumulate(np.where(boundary, positions, -1))
+    block_start = np.where(
+        last_boundary < 0, positions, last_boundary + ~has_date[np.maximum(last_boundary, 0)]
+    )
+
+    # Gap starts: To differs from the next row's From; next_gap[k] = first gap start at or after row k
+    gap_start = np.zeros(n, dtype=bool)
+    gap_start[:-1] = has_to[:-1] & has_from[1:] & (to_text[:-1] != from_text[1:])
+    next_gap = np.minimum.accumulate(np.where(gap_start, positions, n)[::-1])[::-1]
+
+    ends = positions[block_end]
+    first_gap = next_gap[block_start[ends]]
+    # The last row is an instruction end on its own (no block scan)
+    marked = np.where((first_gap < ends) & (ends < n - 1), first_gap, ends)
+    ins_end = np.zeros(n, dtype=bool)
+    ins_end[marked] = True
+    df["_ins_end"] = ins_end
     return df
 
 
@@ -189,16 +174,23 @@ def _run_report_generation_worker(job_data: dict) -> None:
     column_name = job_data.get("column_name") or "Name of the station"
     station_name = job_data.get("station_name") or ""
     header_rows = int(job_data.get("header_rows", 10))
-    data_only = bool(job_data.get("data_only", False))
+    data_only = bool(job_data.get("data_only", True))
     bd_sheet = job_data.get("bd_sheet") or ""
     scada_column = job_data.get("scada_column") or ""
+    bd_resample = job_data.get("bd_resample") or BD_RESAMPLE
     report_title = job_data.get("report_title") or "Back Down Calculator"
-    ramp_up_5 = float(job_data.get("ramp_up_5", 15))
-    ramp_up_10 = float(job_data.get("ramp_up_10", 27.5))
-    ramp_up_15 = float(job_data.get("ramp_up_15", 40))
-    ramp_down_5 = float(job_data.get("ramp_down_5", 15))
-    ramp_down_10 = float(job_data.get("ramp_down_10", 27.5))
-    ramp_down_15 = float(job_data.get("ramp_down_15", 40))
+    rates = ramp_engine.RampRates(
+        up_5=float(job_data.get("ramp_up_5", 15)),
+        up_10=float(job_data.get("ramp_up_10", 27.5)),
+        up_15=float(job_data.get("ramp_up_15", 40)),
+        down_5=float(job_data.get("ramp_down_5", 15)),
+        down_10=float(job_data.get("ramp_down_10", 27.5)),
+        down_15=float(job_data.get("ramp_down_15", 40)),
+    )
+    # Extra ramp-rate scenarios to compare (Sum Mus / Sum MU per instruction), evaluated on the same lookups
+    ramp_scenarios = [ramp_engine.RampRates(**s) for s in job_data.get("ramp_scenarios") or []]
+    # CSV / Parquet / NDJSON copies of each report, written next to it in the reports store
+    export_formats = [fmt for fmt in job_data.get("export_formats") or [] if fmt in export_formats_available()]
     verbose = False
 
     def update_progress(**kwargs):
@@ -206,6 +198,7 @@ def _run_report_generation_worker(job_data: dict) -> None:
         d.update(kwargs)
         background_write_job(d)
 
+    prefetcher = None
     try:
         instructions_path = temp_path / instructions_name
         dc_path = temp_path / dc_name if dc_name and (temp_path / dc_name).exists() else None
@@ -221,474 +214,233 @@ def _run_report_generation_worker(job_data: dict) -> None:
             if not bd_folder or not bd_folder.exists() or not bd_folder.is_dir():
                 bd_folder = None
 
-        wb = openpyxl.load_workbook(instructions_path, read_only=True, data_only=data_only)
-        if sheet_name:
-            sheet_found = None
-            target = sheet_name.strip().lower()
-            for name in wb.sheetnames:
-                if name.strip().lower() == target or target in name.strip().lower():
-                    sheet_found = name
-                    break
-            ws = wb[sheet_found] if sheet_found else wb.active
-        else:
-            ws = wb.active
-
-        col_idx, header_row = find_column_by_name(ws, column_name, max_header_rows=header_rows)
-        if col_idx is None:
-            wb.close()
-            update_progress(status="error", error_message=f"Column '{column_name}' not found")
-            return
-
-        matches = find_matching_rows(ws, col_idx, station_name, header_row)
-        if not matches:
-            wb.close()
-            update_progress(status="error", error_message="No matching rows found")
-            return
-
-        from_time_col = to_time_col = date_col = None
-        from_date_col = None  # Prefer "From Date" for instruction block date
-        to_load_col = None  # To Load (MW) = floor for MW as per ramp
-        for c in range(1, ws.max_column + 1):
-            val = (ws.cell(row=header_row, column=c).value or "").strip().lower()
-            if "from" in val and "time" in val:
-                from_time_col = c
-            elif "to" in val and "time" in val:
-                to_time_col = c
-            elif "from" in val and "date" in val:
-                from_date_col = c
-            elif "date" in val and date_col is None:
-                date_col = c
-            elif "to" in val and "load" in val:
-                to_load_col = c
-        if from_date_col is not None:
-            date_col = from_date_col
-
-        start_data_row = 2
+        # Stations to report on: a batch list (all stations use exact names) or the single station
+        batch_stations = [s for s in (job_data.get("stations") or []) if s]
+        scada_columns = job_data.get("scada_columns") or {}
+
+        # Resolved DC / SCADA lookups depend on these inputs only (not on ramp rates): reuse them when unchanged
+        lookup_fingerprint = lookup_cache.input_fingerprint(instructions_path, dc_path, bd_folder, {
+            "sheet_name": sheet_name,
+            "column_name": column_name,
+            "header_rows": header_rows,
+            "data_only": data_only,
+            "stations": batch_stations or [station_name],
+            "scada_column": scada_column,
+            "scada_columns": scada_columns,
+            "bd_sheet": bd_sheet,
+            "bd_resample": bd_resample,
+        })
+        cached_lookups = lookup_cache.load(LOOKUP_CACHE_DIR, lookup_fingerprint)
+
+        bd_warnings = []
         scada_cache = None
-        if bd_folder and scada_column:
-            scada_cache = SCADALookupCache(bd_folder, scada_column, bd_sheet if bd_sheet else None)
-        dc_wb = openpyxl.load_workbook(dc_path, read_only=True, data_only=True) if dc_path else None
-
-        total_slots = 0
-        for _idx, (_row_num, row_data) in enumerate(matches, 1):
-            if from_time_col and to_time_col and from_time_col <= len(row_data) and to_time_col <= len(row_data):
-                from_time_val = row_data[from_time_col - 1] if from_time_col > 0 else None
-                to_time_val = row_data[to_time_col - 1] if to_time_col > 0 else None
-                if from_time_val is not None and to_time_val is not None:
-                    slots = slots_15min(from_time_val, to_time_val)
-                    total_slots += len(slots) if slots else 0
-
-        output_rows = []
-        dc_found_count = dc_not_found_count = scada_found_count = scada_not_found_count = 0
-        processed_slots = 0
-        current_date = None
-        previous_date_with_data = None
-        date_start_row = None
-        row_idx = start_data_row
-        last_progress_update = [0]
-        entry_start_idx = 0  # Track start of current instruction entry
-        pending_entry_start_idx = None  # Track start idx for pending Sum Mus calculation
-        prev_instruction_end_time = None  # "HH:MM" of last slot To of previous instruction
-        prev_instruction_end_mw_ramp = None  # last MW as per ramp of previous instruction
-        prev_instruction_date_str = None  # date for gap rows between blocks
-
-        def _num_display(val, decimals=2):
-            """Format value for DC/SCADA columns: numeric to 2 decimals, else as-is."""
-            if val is None or val == "":
-                return ""
-            try:
-                n = float(val) if isinstance(val, (int, float, str)) and str(val).strip() else None
-                return round(n, decimals) if n is not None else val
-            except (ValueError, TypeError):
-                return val
-
-        for idx, (row_num, row_data) in enumerate(matches, 1):
-            if not (from_time_col and to_time_col and from_time_col <= len(row_data) and to_time_col <= len(row_data)):
-                continue
-            from_time_val = row_data[from_time_col - 1] if from_time_col > 0 else None
-            to_time_val = row_data[to_time_col - 1] if to_time_col > 0 else None
-            date_val = row_data[date_col - 1] if date_col and date_col <= len(row_data) else None
-            if from_time_val is None or to_time_val is None:
-                continue
-            slots = slots_15min(from_time_val, to_time_val)
-            if not slots:
-                continue
-            date_str = format_value(date_val) if date_val else ""
-            if date_str and date_str != previous_date_with_data and previous_date_with_data is not None:
-                date_start_row = None
-            if date_str and date_str != current_date:
-                current_date = date_str
-                previous_date_with_data = date_str
-                date_start_row = row_idx
-
-            # Check if there's a gap from previous instruction to this one
-            # Gap info is stored and will be added AFTER the previous instruction's Sum Mus
-            first_slot_from = slots[0][0] if slots else None
-            there_was_gap = (
-                prev_instruction_end_time is not None
-                and first_slot_from is not None
-                and str(prev_instruction_end_time).strip() != str(first_slot_from).strip()
-                and prev_instruction_date_str
+        dc_index = None
+
+        lookups_from_cache = bool(cached_lookups and cached_lookups.get("stations"))
+        if lookups_from_cache:
+            # Only the ramp rates (or nothing) changed: skip instructions, DC and BD files
+            station_runs = [
+                (entry["station"], entry["instructions"], entry["blocks"], None, None)
+                for entry in cached_lookups["stations"]
+            ]
+            total_slots = sum(len(block["slots"]) for entry in cached_lookups["stations"] for block in entry["blocks"])
+            bd_warnings = cached_lookups.get("warnings") or []
+            if bd_warnings:
+                update_progress(warnings=bd_warnings)
+        else:
+            # One parse of the instructions sheet, the same cached table station discovery loaded
+            instructions = load_instructions_table(
+                instructions_path, column_name, sheet_name, data_only=data_only, max_header_rows=header_rows
             )
-
-            # Helper for gap processing
-            def _time_to_minutes(t):
-                try:
-                    parts = str(t).strip().split(":")
-                    return int(parts[0]) * 60 + int(parts[1])
-                except:
-                    return 0
-
-            # If there was a pending instruction (not first iteration), add its gap rows and Sum Mus now
-            if pending_entry_start_idx is not None:
-                # Add gap rows from previous instruction end to current instruction start
-                if there_was_gap:
-                    gap_slots = slots_15min(prev_instruction_end_time, from_time_val)
-                    gap_prev_mw = prev_instruction_end_mw_ramp
-                    prev_end_mins = _time_to_minutes(prev_instruction_end_time)
-                    dates_differ = (prev_instruction_date_str != date_str)
-                    last_added_g_to = None
-                    last_added_g_mw = None
-
-                    for g_from, g_to in gap_slots:
-                        g_from_mins = _time_to_minutes(g_from)
-                        if dates_differ:
-                            if g_from_mins < prev_end_mins:
-                                gap_date_lookup = date_str
-                            else:
-                                gap_date_lookup = prev_instruction_date_str
-                        else:
-                            gap_date_lookup = prev_instruction_date_str
-
-                        g_dc = None
-                        if dc_wb and gap_date_lookup:
-                            sheet_name_dc = convert_date_to_sheet_format(gap_date_lookup)
-                            if sheet_name_dc:
-                                g_dc = find_dc_value(dc_wb, sheet_name_dc, g_from, g_to, debug=verbose)
-                        g_scada = None
-                        if scada_cache and gap_date_lookup:
-                            g_scada = find_scada_value(scada_cache, gap_date_lookup, g_from, debug=verbose, show_progress=False)
-                        try:
-                            g_dc_num = float(g_dc) if g_dc is not None else None
-                        except (ValueError, TypeError):
-                            g_dc_num = None
-                        try:
-                            g_scada_num = float(g_scada) if g_scada is not None else None
-                        except (ValueError, TypeError):
-                            g_scada_num = None
-
-                        if gap_prev_mw is not None:
-                            would_be = gap_prev_mw + ramp_up_15
-                            if verbose:
-                                print(f"  [GAP] {g_from}-{g_to}: prev_mw={gap_prev_mw:.2f}, would_be={would_be:.2f}, scada={g_scada_num}, dc={g_dc_num}", file=sys.stderr)
-                            if g_scada_num is not None and would_be > g_scada_num:
-                                if verbose:
-                                    print(f"  [GAP] STOPPING: would_be {would_be:.2f} > scada {g_scada_num}", file=sys.stderr)
-                                break
-                            g_mw_ramp = would_be
-                            if g_dc_num is not None and g_mw_ramp > g_dc_num:
-                                g_mw_ramp = g_dc_num
-                        else:
-                            g_mw_ramp = None
-
-                        gap_prev_mw = g_mw_ramp
-                        # DC , Scada Diff (MW) = DC - Scada
-                        g_diff = round(g_dc_num - g_scada_num, 2) if g_dc_num is not None and g_scada_num is not None else None
-                        g_mus = round(g_diff / 4000, 10) if g_diff is not None else None
-                        # Diff = Scada - MW as per ramp
-                        g_scada_mw_diff = round(g_scada_num - g_mw_ramp, 2) if g_scada_num is not None and g_mw_ramp is not None else None
-                        # MU = Diff/4000 if > 0, else 0
-                        g_mu = round(g_scada_mw_diff / 4000, 10) if g_scada_mw_diff is not None and g_scada_mw_diff / 4000 > 0 else 0
-                        # Gap rows have no Date (continue from previous instruction)
-                        output_rows.append({
-                            "Date": "",
-                            "From": g_from,
-                            "To": g_to,
-                            "DC (MW)": _num_display(g_dc) if g_dc is not None else "",
-                            "As per SLDC Scada in MW": _num_display(g_scada) if g_scada is not None else "",
-                            "MW as per ramp": round(g_mw_ramp, 2) if g_mw_ramp is not None else "",
-                            "DC , Scada Diff (MW)": g_diff if g_diff is not None else "",
-                            "Mus": g_mus if g_mus is not None else "",
-                            "Sum Mus": "",
-                            "Diff": g_scada_mw_diff if g_scada_mw_diff is not None else "",
-                            "MU": g_mu if g_mu is not None else "",
-                            "Sum MU": "",
-                            "_ins_end": False,  # Gap rows are not instruction ends
-                        })
-                        row_idx += 1
-                        last_added_g_to = g_to
-                        last_added_g_mw = g_mw_ramp
-
-                    # Update prev values for continuity with next instruction (use last ADDED row's values)
-                    if last_added_g_to is not None:
-                        prev_instruction_end_time = last_added_g_to
-                        prev_instruction_end_mw_ramp = last_added_g_mw
-
-                # Now add Sum Mus for the previous instruction (including gap rows just added)
-                entry_end_idx = len(output_rows)
-                if entry_end_idx > pending_entry_start_idx:
-                    mus_sum = 0.0
-                    mu_sum = 0.0
-                    for i in range(pending_entry_start_idx, entry_end_idx):
-                        mus_val = output_rows[i].get("Mus")
-                        if mus_val != "" and mus_val is not None:
-                            try:
-                                mus_sum += float(mus_val)
-                            except (TypeError, ValueError):
-                                pass
-                        mu_val = output_rows[i].get("MU")
-                        if mu_val != "" and mu_val is not None:
-                            try:
-                                mu_sum += float(mu_val)
-                            except (TypeError, ValueError):
-                                pass
-                    mus_sum_rounded = round(mus_sum, 3) if mus_sum else 0.0
-                    mu_sum_rounded = round(mu_sum, 3) if mu_sum else 0.0
-                    output_rows.append({
-                        "Date": "", "From": "", "To": "", "DC (MW)": "",
-                        "As per SLDC Scada in MW": "", "MW as per ramp": "",
-                        "DC , Scada Diff (MW)": "", "Mus": "", "Sum Mus": mus_sum_rounded, "Diff": "", "MU": "", "Sum MU": mu_sum_rounded,
-                        "_ins_end": False,  # Sum rows are not instruction ends
-                    })
-                    row_idx += 1
-
-            # To Load (floor for ramp down) from instruction row
-            to_load = None
-            if to_load_col and to_load_col <= len(row_data):
-                try:
-                    to_load = float(format_value(row_data[to_load_col - 1])) if row_data[to_load_col - 1] else None
-                except (TypeError, ValueError):
-                    to_load = None
-            # Ramp down must not go below 270 (min floor); use To Load from row if higher
-            floor_mw = max(270.0, to_load) if to_load is not None else 270.0
-            prev_slot_mw_ramp = None
-
-            # Start of this instruction's block (gap rows will be added after this instruction, before Sum Mus)
-            entry_start_idx = len(output_rows)
-
-            for slot_idx, (slot_from, slot_to) in enumerate(slots):
-                # Show date at start of each instruction entry (first slot of this row only)
-                row_date = date_str if (slot_idx == 0 and date_str) else ""
-                dc_value = None
-                if dc_wb and date_str:
-                    sheet_name_dc = convert_date_to_sheet_format(date_str)
-                    if sheet_name_dc:
-                        dc_value = find_dc_value(dc_wb, sheet_name_dc, slot_from, slot_to, debug=verbose)
-                        if dc_value is not None:
-                            dc_found_count += 1
-                        else:
-                            dc_not_found_count += 1
-                scada_value = None
-                if scada_cache and date_str:
-                    scada_value = find_scada_value(scada_cache, date_str, slot_from, debug=verbose, show_progress=False)
-                    if scada_value is not None:
-                        scada_found_count += 1
-                    else:
-                        scada_not_found_count += 1
-                # MW as per ramp (rules from docs/MW_as_per_ramp_rules.md)
-                dc_num = None
-                if dc_value is not None:
-                    try:
-                        dc_num = float(dc_value) if isinstance(dc_value, (int, float, str)) and str(dc_value).strip() else None
-                    except (ValueError, TypeError):
-                        pass
-                slot_min = time_to_minutes(slot_from)
-                mw_as_per_ramp = None
-                if slot_idx == 0:
-                    # First slot of instruction block:
-                    # - If continuous with prev (times match) OR gap was filled → use prev_mw - ramp_down
-                    # - If no previous data → use DC - ramp_down (fresh start)
-                    times_match = (
-                        prev_instruction_end_time is not None
-                        and str(slot_from).strip() == str(prev_instruction_end_time).strip()
-                    )
-                    # When gap rows were filled, prev_instruction_end_mw_ramp holds the last gap MW
-                    # and prev_instruction_end_time equals slot_from, so times_match will be True
-                    if times_match and prev_instruction_end_mw_ramp is not None:
-                        # Continuous from previous (either direct or via filled gap rows)
-                        # Apply ramp down from previous MW value
-                        raw = prev_instruction_end_mw_ramp - ramp_down_15
-                        try:
-                            scada_num = float(scada_value) if scada_value is not None else None
-                        except (ValueError, TypeError):
-                            scada_num = None
-                        if scada_num is not None and raw > scada_num:
-                            raw = scada_num
-                        mw_as_per_ramp = max(floor_mw, raw)
-                        if prev_instruction_end_mw_ramp <= floor_mw:
-                            mw_as_per_ramp = floor_mw
-                    else:
-                        # No previous data or times don't match → fresh start from DC - ramp_down
-                        if prev_instruction_end_time is None:
-                            gap_min = 15
-                            if slot_min is not None:
-                                gap_min = slot_min - (slot_min // 15) * 15
-                                if gap_min == 0:
-                                    gap_min = 15
-                        else:
-                            prev_min = time_to_minutes(prev_instruction_end_time)
-                            if prev_min is not None and slot_min is not None:
-                                gap_min = (slot_min - prev_min) % (24 * 60)
-                                if gap_min <= 0:
-                                    gap_min += 24 * 60
-                            else:
-                                gap_min = 15
-                        ramp_down_val = ramp_down_15 if gap_min >= 15 else (ramp_down_10 if gap_min >= 10 else ramp_down_5)
-                        mw_as_per_ramp = (dc_num - ramp_down_val) if dc_num is not None else None
+            if instructions.station_col is None:
+                update_progress(status="error", error_message=f"Column '{column_name}' not found")
+                return
+
+            station_jobs = []  # [(station, matches, SCADA column)]
+            for station in batch_stations or [station_name]:
+                station_matches = instructions.match(station, exact=bool(batch_stations))
+                if station_matches:
+                    station_jobs.append((station, station_matches, scada_column_for_station(scada_columns, station, scada_column)))
+            if not station_jobs:
+                update_progress(status="error", error_message="No matching rows found")
+                return
+
+            # One SCADA cache for every station: each BD file is parsed once for all SCADA columns
+            bd_columns = list(dict.fromkeys(column for _station, _matches, column in station_jobs if column))
+            if bd_folder and bd_columns:
+                scada_cache = SCADALookupCache(bd_folder, bd_columns, bd_sheet if bd_sheet else None, cache_dir=BD_CACHE_DIR, engine=XLSX_READER_ENGINE,
+                                               resample=bd_resample)
+                bd_warnings = bd_duplicate_warnings(scada_cache.duplicate_dates)
+                if bd_warnings:
+                    update_progress(warnings=bd_warnings)
+            # One DC index shared by all stations
+            dc_wb = xlsx_load_workbook(dc_path, engine=XLSX_READER_ENGINE) if dc_path else None
+            dc_index = DCIndex(dc_wb) if dc_wb else None
+
+            # Planning pass over the slot expansion stage only (no lookups): progress total and BD preload dates
+            total_slots = 0
+            dates_needed = []  # Instruction dates of all stations, in order, for BD preload
+            station_dates = {}
+            for station, station_matches, _column in station_jobs:
+                dates = []
+                for instruction in report_pipeline.expand_instructions(station_matches, instructions):
+                    total_slots += len(instruction["slots"])
+                    if instruction["date"]:
+                        dates.append(instruction["date"])
+                station_dates[station] = dates
+                dates_needed.extend(dates)
+            if scada_cache:
+                # Parse every needed BD file up front (in parallel) instead of on first touch
+                scada_cache.preload(dict.fromkeys(dates_needed), workers=BD_PRELOAD_WORKERS)
+
+            station_runs = [
+                (station, len(station_matches), None, station_matches, station_scada_column)
+                for station, station_matches, station_scada_column in station_jobs
+            ]
+
+        def _report_progress(processed_slots, current_date):
+            """Job progress (called by the pipeline's StatsSink every PROCESSING_BATCH_SIZE slots)."""
+            if total_slots > 0:
+                pct = min(99, int(100 * processed_slots / total_slots))
+                update_progress(processed_slots=processed_slots, total_slots=total_slots, progress_pct=pct, current_date=current_date or "")
+
+        def _save_station_report(station, instruction_count, output_stem, output_wb, output_rows):
+            """Write one station's report workbook, save it to the reports store and return its filename."""
+            output_filename = f"{output_stem}.xlsx"
+            # Serialized once in memory and written straight into the reports store
+            buffer = io.BytesIO()
+            output_wb.save(buffer)
+            reports_save_bytes(buffer.getbuffer(), output_filename, rows=output_rows)
+            date_from = date_to = ""
+            if " — " in report_title:
+                part = report_title.split(" — ", 1)[1].strip()
+                if " to " in part:
+                    date_from, date_to = (s.strip() for s in part.split(" to ", 1))
                 else:
-                    # From second slot onward: always ramp down (continuous within block)
-                    if prev_slot_mw_ramp is not None:
-                        mw_as_per_ramp = max(floor_mw, prev_slot_mw_ramp - ramp_down_15)
-                        if prev_slot_mw_ramp <= floor_mw:
-                            mw_as_per_ramp = floor_mw
-                    else:
-                        mw_as_per_ramp = None
-                prev_slot_mw_ramp = mw_as_per_ramp
-                mw_ramp_display = round(mw_as_per_ramp, 2) if mw_as_per_ramp is not None else ""
-                # Parse scada_num for calculations
-                try:
-                    scada_num = float(scada_value) if scada_value is not None else None
-                except (ValueError, TypeError):
-                    scada_num = None
-                # DC , Scada Diff (MW) = DC - Scada
-                diff_value = round(dc_num - scada_num, 2) if dc_num is not None and scada_num is not None else None
-                mus_value = (float(diff_value) / 4000 if diff_value is not None else None) if diff_value is not None else None
-                if diff_value is not None and mus_value is not None:
-                    mus_value = round(mus_value, 10)
-                # Diff = Scada - MW as per ramp
-                scada_mw_diff = round(scada_num - mw_as_per_ramp, 2) if scada_num is not None and mw_as_per_ramp is not None else None
-                # MU = Diff/4000 if > 0, else 0
-                mu_value = round(scada_mw_diff / 4000, 10) if scada_mw_diff is not None and scada_mw_diff / 4000 > 0 else 0
-
-                # Mark this row as instruction end if it's the last slot of the instruction
-                is_instruction_end = (slot_to == slots[-1][1])
-                
-                output_rows.append({
-                    "Date": row_date,
-                    "From": slot_from,
-                    "To": slot_to,
-                    "DC (MW)": _num_display(dc_value) if dc_value is not None else "",
-                    "As per SLDC Scada in MW": _num_display(scada_value) if scada_value is not None else "",
-                    "MW as per ramp": mw_ramp_display,
-                    "DC , Scada Diff (MW)": diff_value if diff_value is not None else "",
-                    "Mus": mus_value if mus_value is not None else "",
-                    "Sum Mus": "",
-                    "Diff": scada_mw_diff if scada_mw_diff is not None else "",
-                    "MU": mu_value if mu_value is not None else "",
-                    "Sum MU": "",
-                    "_ins_end": is_instruction_end,  # Hidden marker for styling
-                })
-                row_idx += 1
-                processed_slots += 1
-                if total_slots > 0 and processed_slots - last_progress_update[0] >= max(1, PROCESSING_BATCH_SIZE):
-                    last_progress_update[0] = processed_slots
-                    pct = min(99, int(100 * processed_slots / total_slots))
-                    update_progress(processed_slots=processed_slots, total_slots=total_slots, progress_pct=pct, current_date=date_str or "")
-                    # Write partial output every N slots to reduce I/O; also write first batch so table appears soon
-                    if (
-                        processed_slots % PARTIAL_OUTPUT_WRITE_INTERVAL == 0
-                        or processed_slots == PROCESSING_BATCH_SIZE
-                    ):
-                        try:
-                            partial_path = temp_path / "partial_output.json"
-                            with open(partial_path, "w", encoding="utf-8") as f:
-                                json.dump(output_rows, f, default=str, indent=0)
-                        except Exception:
-                            pass
-
-            # End of this instruction: remember last slot for next block and date for gap rows
-            if slots:
-                prev_instruction_end_time = slots[-1][1]
-                prev_instruction_end_mw_ramp = prev_slot_mw_ramp
-                prev_instruction_date_str = date_str
-
-            # Mark this instruction's start for deferred Sum Mus calculation (gap + Sum Mus added at start of next iteration)
-            pending_entry_start_idx = entry_start_idx
-
-        # After loop: add Sum Mus for the last instruction (no more instructions to trigger deferred processing)
-        if pending_entry_start_idx is not None:
-            entry_end_idx = len(output_rows)
-            if entry_end_idx > pending_entry_start_idx:
-                mus_sum = 0.0
-                mu_sum = 0.0
-                for i in range(pending_entry_start_idx, entry_end_idx):
-                    mus_val = output_rows[i].get("Mus")
-                    if mus_val != "" and mus_val is not None:
-                        try:
-                            mus_sum += float(mus_val)
-                        except (TypeError, ValueError):
-                            pass
-                    mu_val = output_rows[i].get("MU")
-                    if mu_val != "" and mu_val is not None:
-                        try:
-                            mu_sum += float(mu_val)
-                        except (TypeError, ValueError):
-                            pass
-                mus_sum_rounded = round(mus_sum, 3) if mus_sum else 0.0
-                mu_sum_rounded = round(mu_sum, 3) if mu_sum else 0.0
-                output_rows.append({
-                    "Date": "", "From": "", "To": "", "DC (MW)": "",
-                    "As per SLDC Scada in MW": "", "MW as per ramp": "",
-                    "DC , Scada Diff (MW)": "", "Mus": "", "Sum Mus": mus_sum_rounded, "Diff": "", "MU": "", "Sum MU": mu_sum_rounded,
-                    "_ins_end": False,  # Sum rows are not instruction ends
-                })
-
-        wb.close()
-        if dc_wb:
-            dc_wb.close()
+                    date_from = part
+            elif " FROM " in report_title.upper():
+                # Parse "⚡ GENERATE REPORT FROM 01-Jan-2026 TO 31-Jan-2026" (from instructions_parser)
+                idx_from = report_title.upper().index(" FROM ")
+                part = report_title[idx_from + 6 :].strip()  # after " FROM "
+                if " TO " in part.upper():
+                    idx_to = part.upper().index(" TO ")
+                    date_from = part[:idx_to].strip()
+                    date_to = part[idx_to + 4 :].strip()
+                else:
+                    date_from = part
+            if not date_from and output_rows:
+                # Fallback: derive from actual data
+                dates_in_data = output_rows.dates()
+                if dates_in_data:
+                    date_from = min(dates_in_data)
+                    date_to = max(dates_in_data) if len(dates_in_data) > 1 else ""
+            reports_append_entry({
+                "filename": output_filename,
+                "station": station,
+                "date_from": date_from,
+                "date_to": date_to,
+                "run_at": datetime.now().isoformat(),
+                "row_count": len(output_rows),
+                "total_instructions": instruction_count,
+            })
+
+            return output_filename
+
+        output_filenames = []
+        export_warnings = []
+        resolved_stations = []  # Blocks per station, kept for re-runs with other ramp rates
+        # Progress is measured by the pipeline itself (slots that reached the ramp / MU stage)
+        stats = report_pipeline.StatsSink(
+            on_progress=None if lookups_from_cache else _report_progress, every=PROCESSING_BATCH_SIZE
+        )
+        for station, instruction_count, cached_blocks, station_matches, station_scada_column in station_runs:
+            if batch_stations:
+                update_progress(current_station=station)
+            output_stem = f"{station.replace(' ', '_').replace('/', '_')}_{datetime.now().strftime('%d-%b-%Y_%H-%M-%S-%p')}"
+            collector = report_pipeline.BlockCollector()
+            report_sink = report_pipeline.WorkbookSink(functools.partial(_save_station_report, station, instruction_count, output_stem))
+            sinks = [collector, stats]
+            export_sink = None
+            if export_formats:
+                # Exports are written on helper threads while the xlsx is built and saved
+                export_sink = report_pipeline.ExportSink(reports_export_base(f"{output_stem}.xlsx"), export_formats)
+                sinks.append(export_sink)
+            sinks.append(report_sink)
+            if cached_blocks is None:
+                if (scada_cache or dc_index) and station_dates[station]:
+                    # Load day N+1 (BD file, DC sheet) on a helper thread while day N is computed
+                    prefetcher = DayPrefetcher(station_dates[station], scada_cache=scada_cache, dc_index=dc_index)
+                lookup = report_pipeline.SlotLookup(dc_index, scada_cache, station_scada_column if scada_cache else "", debug=verbose)
+                blocks = report_pipeline.enrich_blocks(
+                    report_pipeline.expand_instructions(station_matches, instructions), lookup, prefetcher
+                )
+                sinks.append(report_pipeline.PartialPreviewSink(temp_path / "partial_output.json", PARTIAL_OUTPUT_WRITE_INTERVAL))
+            else:
+                blocks = cached_blocks
+            # Rows are assembled per instruction block; only the ramp / MU arithmetic depends on the rates
+            report_pipeline.assemble(blocks, rates, sinks)
+            if export_sink:
+                # Wait for the export threads: the job is only done once every file is written
+                export_sink.result()
+                export_warnings.extend(f"{station} export {error}" for error in export_sink.errors)
+            if prefetcher:
+                prefetcher.close()
+                prefetcher = None
+            resolved_stations.append({"station": station, "instructions": instruction_count, "blocks": collector.blocks})
+            output_filenames.append(report_sink.result)
+
+        if dc_index:
+            dc_index.close()
         if scada_cache:
             scada_cache.close_all()
+        if not lookups_from_cache:
+            lookup_cache.save(LOOKUP_CACHE_DIR, lookup_fingerprint, {"stations": resolved_stations, "warnings": bd_warnings})
+
+        # Scenario sweep: the report's rates first, then every other scenario, in one pass per station
+        scenario_file = ""
+        scenario_totals = []
+        if ramp_scenarios:
+            scenarios = [rates] + [s for s in ramp_scenarios if s != rates]
+            labels = [ramp_engine.scenario_label(s, rates) for s in scenarios]
+            sweep_stations = []
+            for entry in resolved_stations:
+                blocks = entry["blocks"]
+                sweep_stations.append({
+                    "station": entry["station"],
+                    "instructions": [(b["date"], slot_times(b["slots"][0])[0], slot_times(b["slots"][-1])[1]) for b in blocks],
+                    "sums": ramp_engine.sweep_instruction_sums(blocks, scenarios),
+                })
+            scenario_path = temp_path / f"Ramp_scenarios_{datetime.now().strftime('%d-%b-%Y_%H-%M-%S-%p')}.xlsx"
+            build_scenario_workbook(sweep_stations, labels).save(scenario_path)
+            scenario_file = str(scenario_path)
+            for idx, label in enumerate(labels):
+                scenario_totals.append({
+                    "Scenario": label,
+                    "Sum Mus": round(sum(s[0] for e in sweep_stations for s in e["sums"][idx]), 3),
+                    "Sum MU": round(sum(s[1] for e in sweep_stations for s in e["sums"][idx]), 3),
+                })
 
-        output_wb = build_report_workbook(output_rows)
-        output_filename = f"{station_name.replace(' ', '_').replace('/', '_')}_{datetime.now().strftime('%d-%b-%Y_%H-%M-%S-%p')}.xlsx"
-        output_path = temp_path / output_filename
-        output_wb.save(output_path)
-
-        reports_save_file(Path(output_path), output_filename)
-        date_from = date_to = ""
-        if " — " in report_title:
-            part = report_title.split(" — ", 1)[1].strip()
-            if " to " in part:
-                date_from, date_to = (s.strip() for s in part.split(" to ", 1))
-            else:
-                date_from = part
-        elif " FROM " in report_title.upper():
-            # Parse "⚡ GENERATE REPORT FROM 01-Jan-2026 TO 31-Jan-2026" (from instructions_parser)
-            idx_from = report_title.upper().index(" FROM ")
-            part = report_title[idx_from + 6 :].strip()  # after " FROM "
-            if " TO " in part.upper():
-                idx_to = part.upper().index(" TO ")
-                date_from = part[:idx_to].strip()
-                date_to = part[idx_to + 4 :].strip()
-            else:
-                date_from = part
-        if not date_from and output_rows:
-            # Fallback: derive from actual data
-            dates_in_data = [r.get("Date") for r in output_rows if r.get("Date")]
-            if dates_in_data:
-                date_from = min(dates_in_data)
-                date_to = max(dates_in_data) if len(dates_in_data) > 1 else ""
-        reports_append_entry({
-            "filename": output_filename,
-            "station": station_name,
-            "date_from": date_from,
-            "date_to": date_to,
-            "run_at": datetime.now().isoformat(),
-            "row_count": len(output_rows),
-            "total_instructions": len(matches),
-        })
-
+        # The last station's report is shown when done; every report is in the reports store
+        last_station, last_instruction_count = resolved_stations[-1]["station"], resolved_stations[-1]["instructions"]
         update_progress(
             status="done",
-            output_filename=output_filename,
+            station_name=last_station if batch_stations else station_name,
+            output_filename=output_filenames[-1],
+            output_filenames=output_filenames,
             progress_pct=100,
-            processed_slots=processed_slots,
+            processed_slots=stats.slots,
             total_slots=total_slots,
-            total_instructions=len(matches),
+            total_instructions=last_instruction_count,
+            scenario_file=scenario_file,
+            scenario_totals=scenario_totals,
+            warnings=bd_warnings + export_warnings,
             error_message=None,
         )
     except Exception as e:
         update_progress(status="error", error_message=str(e))
+    finally:
+        if prefetcher:
+            prefetcher.close()
 
 
 # Page config
@@ -822,6 +574,13 @@ with st.sidebar:
                     key="station_selectbox"
                 )
                 st.caption(f"✓ Found {len(station_names)} unique station(s)")
+                if len(station_names) > 1:
+                    st.checkbox(
+                        "Generate for all stations",
+                        value=False,
+                        help="One job writes one report per station, sharing the DC and BD data",
+                        key="batch_all_stations"
+                    )
             else:
                 # Show empty selectbox (not editable) if no stations found
                 station_name = st.selectbox(
@@ -989,6 +748,29 @@ with st.sidebar:
             )
             if bd_folder_path and bd_sheet:
                 st.caption("⚠️ Could not extract columns. Check BD folder path and sheet name.")
+        _resample_labels = {
+            "sample": "Value at slot start (legacy, first 100 rows)",
+            "mean": "Mean of samples",
+            "last": "Last sample",
+            "twa": "Time-weighted average",
+        }
+        if st.session_state.get("batch_all_stations") and station_names:
+            st.text_area(
+                "SCADA Column per Station",
+                value="",
+                placeholder="HINDUJA = HNJA4_AG.STTN.X_BUS_GEN.MW",
+                help="One 'STATION = SCADA column' per line. Stations not listed use the SCADA Column Name above.",
+                key="batch_scada_map"
+            )
+        st.selectbox(
+            "SCADA Resolution",
+            options=list(RESAMPLE_METHODS),
+            index=list(RESAMPLE_METHODS).index(BD_RESAMPLE),
+            format_func=lambda m: _resample_labels.get(m, m),
+            help="How SCADA samples are reduced to 15-minute slots. Last sample reads the whole day and matches "
+                 "the slot-start value for 15-minute BD exports; the legacy slot-start mode drops 1- or 5-minute data.",
+            key="bd_resample_select"
+        )
         
         st.divider()
         st.header("📈 Ramp Rates")
@@ -1008,10 +790,26 @@ with st.sidebar:
             ramp_down_10 = st.text_input("10 min", value="27.5", placeholder="27.5", key="ramp_down_10_input")
         with rd3:
             ramp_down_15 = st.text_input("15 min", value="40", placeholder="40", key="ramp_down_15_input")
+        st.text_area(
+            "Ramp Scenarios",
+            value="",
+            placeholder="down_15 = 30, 40, 50\nup_15 = 40, 60",
+            help="Optional: compare Sum Mus / Sum MU under other ramp rates. One 'RATE = values' line per rate "
+                 "(up_5, up_10, up_15, down_5, down_10, down_15); every combination is a scenario, other rates stay as above.",
+            key="ramp_scenarios_text"
+        )
+        st.multiselect(
+            "Also Export As",
+            options=list(export_formats_available()),
+            format_func=str.upper,
+            help="Optional: also save each report as CSV, Parquet and/or NDJSON (same columns in every format, "
+                 "numbers as numbers, blanks empty) for systems that should not parse the xlsx.",
+            key="export_formats_select"
+        )
         
         # Defaults (advanced options removed for now)
         header_rows = 10
-        data_only = False
+        data_only = True
         verbose = False
         
         # Generate button at bottom of sidebar - enabled only when all required fields are filled
@@ -1061,7 +859,7 @@ with st.sidebar:
         scada_column = None
         bd_sheet = ""
         header_rows = 10
-        data_only = False
+        data_only = True
         verbose = False
         st.caption("**Back Down reports** — select a report")
         reports_list_sidebar = reports_load_index()
@@ -1114,11 +912,9 @@ with st.sidebar:
                         url_report_file(fn)
                         st.rerun()
                 with c2:
-                    if not is_generating:
-                        report_path = REPORTS_DIR / fn
-                        if report_path.exists():
-                            with open(report_path, "rb") as f:
-                                st.download_button("📥", data=f.read(), file_name=fn, mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", key=f"sidebar_dl_{i}_{fn}")
+                    # Every listed report gets a button, but a file is only read when its button is clicked
+                    if not is_generating and (REPORTS_DIR / fn).is_file():
+                        st.download_button("📥", data=_lazy_file_data(REPORTS_DIR / fn), file_name=fn, mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", key=f"sidebar_dl_{i}_{fn}")
 
 # Global CSS for sidebar menu buttons (square box look); report list: two-line label
 st.markdown("""
@@ -1167,6 +963,8 @@ if _status == "done" and _reports_view_filename == "__generating__":
     _reports_view_filename = _reports_view_entry = None
     _viewing_saved_report = False
 if _status in ("running", "done", "error"):
+    for _warning in _bg_job.get("warnings") or []:
+        st.warning(f"⚠️ {_warning}")
     if _status == "running":
         # Only show "generating" banner when viewing Home or the in-progress report, not when viewing a completed report
         if not _viewing_saved_report or _reports_view_filename == "__generating__":
@@ -1180,15 +978,18 @@ if _status in ("running", "done", "error"):
     elif _status == "done":
         # Only show "Report ready" banner on Home page, not when viewing Reports page
         if not _viewing_saved_report and not _on_reports_list:
-            st.success(f"✅ **Report ready.** Displaying below. Also saved to **Reports**.")
+            _done_count = len(_bg_job.get("output_filenames") or [])
+            if _done_count > 1:
+                st.success(f"✅ **{_done_count} reports ready** (one per station), saved to **Reports**. Displaying the last one below.")
+            else:
+                st.success(f"✅ **Report ready.** Displaying below. Also saved to **Reports**.")
             # Automatically load and display the completed report on home page
             _done_filename = _bg_job.get("output_filename")
             if _done_filename:
                 _done_report_path = REPORTS_DIR / _done_filename
                 if _done_report_path.exists():
                     try:
-                        _done_df = pd.read_excel(_done_report_path, engine="openpyxl")
-                        _done_df = _reconstruct_ins_end_marker(_done_df)
+                        _done_df = _load_report_frame(_done_report_path)
                         _done_report_key = f"output_data_home_{_done_filename}"
                         st.session_state[_done_report_key] = _done_df
                         st.session_state["display_output_data_key"] = _done_report_key
@@ -1206,6 +1007,17 @@ if _status in ("running", "done", "error"):
                             "total_instructions": _done_total_instructions,
                             "output_rows": len(_done_df),
                         }
+                        # Scenario comparison belongs to this report; keep it past clearing the job
+                        _scenario_file = _bg_job.get("scenario_file")
+                        if _scenario_file and Path(_scenario_file).exists():
+                            st.session_state["scenario_comparison"] = {
+                                "report_key": _done_report_key,
+                                "filename": Path(_scenario_file).name,
+                                "data": Path(_scenario_file).read_bytes(),
+                                "totals": _bg_job.get("scenario_totals") or [],
+                            }
+                        else:
+                            st.session_state.pop("scenario_comparison", None)
                         # Clear background job after loading
                         background_write_job({})
                     except Exception:
@@ -1233,17 +1045,18 @@ _viewing_generating_report = _viewing_saved_report and _reports_view_filename ==
 if _status == "running" and _bg_job and (not _viewing_saved_report or _viewing_generating_report):
     _temp_path = Path(_bg_job.get("temp_path", ""))
     _partial_file = _temp_path / "partial_output.json" if _temp_path else None
-    _partial_rows = []
+    _partial_columns = {}  # {report column: values}, written by the worker (ReportRows.to_columns)
     _partial_file_exists = _partial_file and _partial_file.exists()
     
     if _partial_file_exists:
         try:
             with open(_partial_file, "r", encoding="utf-8") as f:
-                _partial_rows = json.load(f)
+                _partial_columns = json.load(f)
         except Exception:
-            _partial_rows = []
-    
-    if not _partial_rows:
+            _partial_columns = {}
+    _n_partial_rows = len(_partial_columns.get("Date") or []) if isinstance(_partial_columns, dict) else 0
+
+    if not _n_partial_rows:
         # Waiting for first batch - auto-refresh, don't show anything else
         st.caption("⏳ Waiting for first batch of data…")
         time.sleep(2)
@@ -1256,11 +1069,12 @@ if _status == "running" and _bg_job and (not _viewing_saved_report or _viewing_g
         _current_date = _bg_job.get("current_date", "")
         _station_bg = _bg_job.get("station_name", "")
         st.progress(_pct / 100.0)
+        _current_station = _bg_job.get("current_station", "")
         if _current_date:
-            st.caption(f"⏳ Processing day {_current_date} — {len(_partial_rows)} rows so far")
+            st.caption(f"⏳ Processing {_current_station + ', ' if _current_station else ''}day {_current_date} — {_n_partial_rows} rows so far")
         else:
-            st.caption(f"⏳ Processing... {len(_partial_rows)} rows so far")
-        _df_partial = pd.DataFrame(_partial_rows).fillna("").replace("None", "")
+            st.caption(f"⏳ Processing... {_n_partial_rows} rows so far")
+        _df_partial = pd.DataFrame(_partial_columns).fillna("").replace("None", "")
         for _col in ("DC (MW)", "As per SLDC Scada in MW", "MW as per ramp", "DC , Scada Diff (MW)", "Mus", "Sum Mus", "Diff", "MU", "Sum MU"):
             if _col in _df_partial.columns:
                 _df_partial[_col] = pd.to_numeric(_df_partial[_col], errors="coerce")
@@ -1417,8 +1231,7 @@ if _reports_view_filename and _reports_view_entry and st.session_state.get("repo
         report_path = REPORTS_DIR / _reports_view_filename
         if report_path.exists():
             try:
-                df_report = pd.read_excel(report_path, engine="openpyxl")
-                df_report = _reconstruct_ins_end_marker(df_report)
+                df_report = _load_report_frame(report_path)
                 st.session_state[report_key] = df_report
                 st.session_state["display_output_data_key"] = report_key
                 st.session_state["display_station_name"] = _reports_view_entry.get("station", "")
@@ -1482,8 +1295,7 @@ if _is_home_page and not _showing_bg_job_table and _status not in ("running", "d
                 _latest_path = REPORTS_DIR / _latest_filename
                 if _latest_path.exists():
                     try:
-                        _latest_df = pd.read_excel(_latest_path, engine="openpyxl")
-                        _latest_df = _reconstruct_ins_end_marker(_latest_df)
+                        _latest_df = _load_report_frame(_latest_path)
                         _latest_key = f"output_data_latest_{_latest_filename}"
                         st.session_state[_latest_key] = _latest_df
                         st.session_state["display_output_data_key"] = _latest_key
@@ -1566,6 +1378,18 @@ if 'display_output_data_key' in st.session_state and not _showing_bg_job_table a
                     st.metric("Total Instructions", stats.get('total_instructions', 0))
                 with col3:
                     st.metric("Output Rows", stats.get('output_rows', 0))
+                _scenarios = st.session_state.get("scenario_comparison")
+                if _scenarios and _scenarios.get("report_key") == output_data_key:
+                    with st.expander(f"📈 Ramp scenarios ({len(_scenarios['totals'])})", expanded=True):
+                        st.caption("Total Sum Mus / Sum MU per scenario; the workbook has them per instruction.")
+                        st.dataframe(pd.DataFrame(_scenarios["totals"]), width="stretch", hide_index=True)
+                        st.download_button(
+                            label="📥 Download scenario comparison",
+                            data=_scenarios["data"],
+                            file_name=_scenarios["filename"],
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                            key="download_button_scenarios"
+                        )
                 if st.session_state.get("reports_view_active"):
                     url_report_file(st.session_state["reports_view_active"])  # Keep URL: ?view=report&file=...
             
@@ -1685,14 +1509,9 @@ if 'display_output_data_key' in st.session_state and not _showing_bg_job_table a
                 # Priority 1: viewing saved report from Reports page
                 viewing_saved = st.session_state.get("reports_view_active")
                 if viewing_saved and not _dl_file_data:
-                    report_path = REPORTS_DIR / viewing_saved
-                    if report_path.exists():
-                        try:
-                            with open(report_path, "rb") as f:
-                                _dl_file_data = f.read()
-                            _dl_filename = viewing_saved
-                        except Exception:
-                            pass
+                    _dl_file_data = reports_file_bytes(REPORTS_DIR / viewing_saved)
+                    if _dl_file_data:
+                        _dl_filename = viewing_saved
                 
                 # Priority 2: Extract filename from output_data_key (home page latest/generated)
                 if not _dl_file_data and output_data_key:
@@ -1702,14 +1521,9 @@ if 'display_output_data_key' in st.session_state and not _showing_bg_job_table a
                             _extracted_filename = output_data_key[len(prefix):]
                             break
                     if _extracted_filename:
-                        _dl_path = REPORTS_DIR / _extracted_filename
-                        if _dl_path.exists():
-                            try:
-                                with open(_dl_path, "rb") as f:
-                                    _dl_file_data = f.read()
-                                _dl_filename = _extracted_filename
-                            except Exception:
-                                pass
+                        _dl_file_data = reports_file_bytes(REPORTS_DIR / _extracted_filename)
+                        if _dl_file_data:
+                            _dl_filename = _extracted_filename
                 
                 # Priority 3: last_output_file_data from session (just generated)
                 if not _dl_file_data and 'last_output_file_data' in st.session_state:
@@ -1718,14 +1532,9 @@ if 'display_output_data_key' in st.session_state and not _showing_bg_job_table a
                 
                 # Priority 4: last_output_path from session
                 if not _dl_file_data and 'last_output_path' in st.session_state:
-                    output_path = Path(st.session_state['last_output_path'])
-                    if output_path.exists():
-                        try:
-                            with open(output_path, "rb") as f:
-                                _dl_file_data = f.read()
-                            _dl_filename = st.session_state.get('last_output_filename', 'output.xlsx')
-                        except Exception:
-                            pass
+                    _dl_file_data = reports_file_bytes(Path(st.session_state['last_output_path']))
+                    if _dl_file_data:
+                        _dl_filename = st.session_state.get('last_output_filename', 'output.xlsx')
                 
                 # Show download button if we have data
                 if _dl_file_data and _dl_filename:
@@ -1737,6 +1546,19 @@ if 'display_output_data_key' in st.session_state and not _showing_bg_job_table a
                         use_container_width=True,
                         key="download_button_output"
                     )
+                    # CSV / Parquet / NDJSON exports saved with the report
+                    for _export_path in reports_export_files(_dl_filename):
+                        _export_data = reports_file_bytes(_export_path)
+                        if not _export_data:
+                            continue
+                        st.download_button(
+                            label=f"📥 {_export_path.suffix[1:].upper()}",
+                            data=_export_data,
+                            file_name=_export_path.name,
+                            mime="application/octet-stream",
+                            use_container_width=True,
+                            key=f"download_button_export_{_export_path.suffix[1:]}"
+                        )
             
             # Apply day filter
             if available_dates and selected_day and selected_day != "All Days":
@@ -1902,6 +1724,13 @@ if run_generate:
                 f.write(dc_file.getbuffer())
             dc_name = dc_file.name
 
+        # Batch: every station found in the instructions file, each with its SCADA column
+        batch_stations = []
+        batch_scada_columns = {}
+        if st.session_state.get("batch_all_stations") and station_names:
+            batch_stations = list(station_names)
+            batch_scada_columns = parse_scada_column_map(st.session_state.get("batch_scada_map", "").splitlines())
+
         job_data = {
             "status": "running",
             "temp_path": str(temp_path),
@@ -1910,11 +1739,15 @@ if run_generate:
             "bd_folder_path": bd_folder_path or "",
             "sheet_name": sheet_name or "",
             "column_name": column_name or "Name of the station",
-            "station_name": station_name or "",
+            "station_name": f"All stations ({len(batch_stations)})" if batch_stations else (station_name or ""),
+            "stations": batch_stations,
+            "scada_columns": batch_scada_columns,
             "header_rows": header_rows,
             "data_only": data_only,
             "bd_sheet": bd_sheet or "",
             "scada_column": scada_column or "",
+            "bd_resample": st.session_state.get("bd_resample_select", BD_RESAMPLE),
+            "export_formats": list(st.session_state.get("export_formats_select") or []),
             "report_title": st.session_state.get("report_title", "Back Down Calculator"),
             "ramp_up_5": _parse_float(st.session_state.get("ramp_up_5_input", "15"), 15),
             "ramp_up_10": _parse_float(st.session_state.get("ramp_up_10_input", "27.5"), 27.5),
@@ -1927,6 +1760,11 @@ if run_generate:
             "processed_slots": 0,
             "total_slots": 0,
         }
+        # Scenario grid (validated here so a typo fails before the job starts)
+        _base_rates = ramp_engine.RampRates(*(job_data[f"ramp_{field}"] for field in ramp_engine.RampRates._fields))
+        job_data["ramp_scenarios"] = [
+            s._asdict() for s in ramp_engine.parse_rate_grid(st.session_state.get("ramp_scenarios_text", "").splitlines(), _base_rates)
+        ]
         background_write_job(job_data)
         thread = threading.Thread(target=_run_report_generation_worker, args=(job_data,), daemon=True)
         thread.start()
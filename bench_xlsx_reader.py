@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark the xlsx reader engines on BD files (SCADA column extraction) and a DC file.
+
+Usage:
+  python bench_xlsx_reader.py [options]
+
+Example:
+  python bench_xlsx_reader.py
+  python bench_xlsx_reader.py --bd-folder "data/january/BD" --limit 5
+  python bench_xlsx_reader.py --dc-file "data/january/HNPCL revised DC for the month January 2026 SLDC.xlsx"
+"""
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+import find_station_rows as fsr
+import xlsx_reader
+
+
+def _same_slots(a, b):
+    """Compare two slot arrays (NaN == NaN)."""
+    if a is None or b is None:
+        return a is b
+    return all(x == y or (math.isnan(x) and math.isnan(y)) for x, y in zip(a, b))
+
+
+def bench_bd(bd_files, sheet_name, column_name):
+    """Time load_bd_slot_array per engine; returns {engine: seconds} and the number of mismatching files."""
+    totals = dict.fromkeys(xlsx_reader.ENGINES, 0.0)
+    mismatches = 0
+    for bd_file in bd_files:
+        results = {}
+        for engine in xlsx_reader.ENGINES:
+            start = time.perf_counter()
+            results[engine] = fsr.load_bd_slot_array(bd_file, sheet_name, column_name, engine=engine)
+            elapsed = time.perf_counter() - start
+            totals[engine] += elapsed
+            print(f"  {bd_file.name:<40} {engine:<9} {elapsed:8.3f}s")
+        if not _same_slots(results["fast"], results["openpyxl"]):
+            mismatches += 1
+            print(f"  MISMATCH: {bd_file.name}", file=sys.stderr)
+    return totals, mismatches
+
+
+def bench_dc(dc_file):
+    """Time compiling every date sheet of a DC file per engine; returns ({engine: seconds}, mismatches)."""
+    totals = {}
+    days = {}
+    for engine in xlsx_reader.ENGINES:
+        start = time.perf_counter()
+        dc_index = fsr.DCIndex(xlsx_reader.load_workbook(dc_file, engine=engine))
+        days[engine] = {name: dc_index.get_day(name) for name in dc_index.sheet_names}
+        dc_index.close()
+        totals[engine] = time.perf_counter() - start
+        print(f"  {dc_file.name:<40} {engine:<9} {totals[engine]:8.3f}s")
+    mismatches = sum(1 for name in days["fast"] if not _same_slots(days["fast"][name], days["openpyxl"][name]))
+    return totals, mismatches
+
+
+def _print_summary(label, totals, mismatches):
+    fast, slow = totals["fast"], totals["openpyxl"]
+    speedup = f"{slow / fast:.1f}x" if fast > 0 else "n/a"
+    print(f"{label}: openpyxl {slow:.3f}s, fast {fast:.3f}s, speedup {speedup}, mismatches {mismatches}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fast xlsx reader against openpyxl read-only mode.")
+    parser.add_argument("--bd-folder", type=Path, default=Path("data/january/BD"), help="BD folder (default: data/january/BD)")
+    parser.add_argument("--bd-sheet", default="DATA-CMD", help="Sheet to read from BD files (default: DATA-CMD)")
+    parser.add_argument("--scada-column", default="HNJA4_AG.STTN.X_BUS_GEN.MW", help="SCADA column to extract")
+    parser.add_argument("--dc-file", type=Path, default=None, help="DC Excel file to benchmark as well")
+    parser.add_argument("--limit", type=int, default=None, help="Only benchmark the first N BD files")
+    args = parser.parse_args()
+
+    index, _duplicates = fsr.build_bd_file_index(args.bd_folder)
+    bd_files = [index[d] for d in sorted(index)][: args.limit]
+    if not bd_files:
+        print(f"Error: No BD files found in {args.bd_folder}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"BD files ({len(bd_files)}), sheet '{args.bd_sheet}', column '{args.scada_column}':")
+    bd_totals, bd_mismatches = bench_bd(bd_files, args.bd_sheet, args.scada_column)
+    dc_result = None
+    if args.dc_file:
+        print("DC file:")
+        dc_result = bench_dc(args.dc_file)
+
+    print()
+    _print_summary("BD", bd_totals, bd_mismatches)
+    if dc_result:
+        _print_summary("DC", *dc_result)
+
+
+if __name__ == "__main__":
+    main()
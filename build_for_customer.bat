@@ -24,6 +24,12 @@ copy url_utils.py "%OUT%\"
 copy instructions_parser.py "%OUT%\"
 copy excel_builder.py "%OUT%\"
 copy find_station_rows.py "%OUT%\"
+copy xlsx_reader.py "%OUT%\"
+copy ramp_engine.py "%OUT%\"
+copy report_rows.py "%OUT%\"
+copy lookup_cache.py "%OUT%\"
+copy report_pipeline.py "%OUT%\"
+copy report_export.py "%OUT%\"
 copy requirements.txt "%OUT%\"
 if exist CUSTOMER_README.txt copy CUSTOMER_README.txt "%OUT%\README.txt"
 if exist .streamlit\config.toml (
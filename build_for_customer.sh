@@ -17,7 +17,7 @@ source "$VENV/bin/activate"
 pip install -r requirements.txt -q
 
 echo "Copying app files..."
-cp app.py config.py reports_store.py url_utils.py instructions_parser.py excel_builder.py find_station_rows.py requirements.txt "$OUT/"
+cp app.py config.py reports_store.py url_utils.py instructions_parser.py excel_builder.py find_station_rows.py xlsx_reader.py ramp_engine.py report_rows.py lookup_cache.py report_pipeline.py report_export.py requirements.txt "$OUT/"
 [ -f CUSTOMER_README.txt ] && cp CUSTOMER_README.txt "$OUT/README.txt"
 [ -f .streamlit/config.toml ] && mkdir -p "$OUT/.streamlit" && cp .streamlit/config.toml "$OUT/.streamlit/"
 mkdir -p "$OUT/reports"
@@ -6,12 +6,28 @@ from pathlib import Path
 APP_DIR = Path(__file__).resolve().parent
 REPORTS_DIR = APP_DIR / "reports"
 REPORTS_INDEX_FILE = REPORTS_DIR / "reports_index.json"
+# CSV / Parquet / NDJSON exports of saved reports (same name as the report, other extension)
+EXPORTS_DIR = REPORTS_DIR / "exports"
 BACKGROUND_JOB_FILE = APP_DIR / "background_job.json"
+# Compiled BD SCADA arrays (reused while the BD file mtime/size are unchanged)
+BD_CACHE_DIR = APP_DIR / "cache" / "bd"
+# Resolved per-slot DC/SCADA lookups per input fingerprint (re-runs with other ramp rates skip the files)
+LOOKUP_CACHE_DIR = APP_DIR / "cache" / "lookups"
 
 # Processing
 PROCESSING_BATCH_SIZE = 5
 # Write partial_output.json every N slots (job progress still every PROCESSING_BATCH_SIZE)
 PARTIAL_OUTPUT_WRITE_INTERVAL = 25
+# Processes used to parse BD files up front (None = one per CPU core; 1 = serial)
+BD_PRELOAD_WORKERS = None
+# xlsx reader for BD and DC files: "fast" (streams sheet XML, falls back to openpyxl) or "openpyxl"
+XLSX_READER_ENGINE = "fast"
+# Default SCADA slot reduction: "last", "mean" or "twa" (whole day), or legacy "sample" (slot starts, first 100 rows)
+BD_RESAMPLE = "last"
+
+# Downloads: stored report / export files kept in memory for download buttons, bounded by total size
+# (least recently used files are dropped first; a larger file is read for each download instead)
+DOWNLOAD_CACHE_MAX_BYTES = 64 * 1024 * 1024
 
 # Table display
 TABLE_ROW_PX = 35
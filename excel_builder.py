@@ -1,13 +1,17 @@
 """Build report Excel workbook from output rows."""
 
-from typing import Optional
-
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+from openpyxl.cell import Cell
+from openpyxl.styles import Font, Alignment, Border, NamedStyle, Side, PatternFill
+from openpyxl.styles.fonts import DEFAULT_FONT
 from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
+
+from ramp_engine import SUMMARY_COLUMNS
+from report_rows import COLUMNS, ReportRows, RowKind
 
 # Visible columns + hidden marker column
-HEADERS = ["Date", "From", "To", "DC (MW)", "As per SLDC Scada in MW", "DC , Scada Diff (MW)", "Mus", "Sum Mus", "MW as per ramp", "Diff", "MU", "Sum MU", "_ins_end"]
+HEADERS = COLUMNS
 COLUMN_WIDTHS = [15, 10, 10, 12, 25, 12, 12, 12, 14, 12, 12, 12, 8]
 PAD = 0
 
@@ -28,120 +32,202 @@ def _make_styles():
     }
 
 
-def build_report_workbook(output_rows: list[dict]) -> Workbook:
+# Named styles of the report workbook, registered once per workbook (cells refer to them by name)
+STYLE_HEADER = "Report Header"
+STYLE_CELL = "Report Cell"
+STYLE_HIGHLIGHT = "Report Highlight"  # Yellow bold: instruction Date, instruction end To, Total rows
+STYLE_MERGED = "Report Merged Date"  # Date cells covered by a merge: left / right edge
+STYLE_MERGED_LAST = "Report Merged Date End"  # Last covered Date cell: also the bottom edge
+
+
+def _add_named_styles(wb: Workbook) -> dict:
+    """Register the report's named styles; returns {name: style array} to create cells with."""
+    styles = _make_styles()
+    thin = Side(style="thin")
+    arrays = {}
+    for style in (
+        NamedStyle(name=STYLE_HEADER, font=styles["header_font"], alignment=styles["center_align"], border=styles["thin_border"]),
+        NamedStyle(name=STYLE_CELL, font=DEFAULT_FONT, border=styles["thin_border"]),
+        NamedStyle(name=STYLE_HIGHLIGHT, font=Font(bold=True), fill=YELLOW_FILL, border=styles["thin_border"]),
+        NamedStyle(name=STYLE_MERGED, font=DEFAULT_FONT, border=Border(left=thin, right=thin)),
+        NamedStyle(name=STYLE_MERGED_LAST, font=DEFAULT_FONT, border=Border(left=thin, right=thin, bottom=thin)),
+    ):
+        wb.add_named_style(style)
+        arrays[style.name] = style.as_tuple()
+    return arrays
+
+
+def _cell(sheet, value, style_array):
+    """A cell with a registered named style (as cell.style = name would set it, without the lookup)."""
+    return Cell(sheet, row=1, column=1, value=value, style_array=style_array)
+
+
+def _write_time_intervals(sheet, output_rows: ReportRows, styles: dict, write_only: bool) -> None:
     """
-    Build and return an openpyxl Workbook with 'Time Intervals' sheet
-    filled with output_rows. Caller should save to path.
+    Stream the report rows to the 'Time Intervals' sheet. The Date column is merged from each dated row
+    down to the row before the next dated row (a Sum row just before it stays out of the merge); rows are
+    held back only until their merge is known, i.e. one instruction at a time.
     """
-    wb = Workbook()
-    sheet = wb.active
-    sheet.title = "Time Intervals"
-    styles = _make_styles()
-    header_font = styles["header_font"]
-    center_align = styles["center_align"]
-    thin_border = styles["thin_border"]
-
-    header_row = 1 + PAD
     start_col = 1 + PAD
     start_data_row = 2 + PAD
+    lead = [None] * PAD
 
-    # Header row
-    for c, h in enumerate(HEADERS):
-        cell = sheet.cell(row=header_row, column=start_col + c)
-        cell.value = h
-        cell.font = header_font
-        cell.alignment = center_align
-        cell.border = thin_border
-
-    def _is_summary_row(row_dict: dict) -> bool:
-        """Row that only has Sum Mus filled (instruction-entry sum)."""
-        return (
-            not row_dict.get("Date") and not row_dict.get("From") and not row_dict.get("To")
-            and row_dict.get("Sum Mus") != "" and row_dict.get("Sum Mus") is not None
-        )
-
-    # Data rows and date merging
-    date_start_row: Optional[int] = None
-    row_idx = start_data_row
-    for r, row_dict in enumerate(output_rows):
-        out_row = row_idx + r
-        if row_dict.get("Date") and date_start_row is not None and out_row > date_start_row:
-            merge_end = out_row - 1
-            # Exclude summary row from merge so that row keeps empty Date/From/To
-            if r > 0 and _is_summary_row(output_rows[r - 1]):
-                merge_end = out_row - 2
-            if merge_end >= date_start_row:
-                sheet.merge_cells(
-                    f"{get_column_letter(start_col)}{date_start_row}:{get_column_letter(start_col)}{merge_end}"
-                )
-        if row_dict.get("Date"):
-            date_start_row = out_row
-        # Get values
-        date_val = row_dict.get("Date") or ""
-        to_val = row_dict.get("To")
-        ins_end = row_dict.get("_ins_end", False)
-        
-        # Write cell values
-        date_cell = sheet.cell(row=out_row, column=start_col)
-        date_cell.value = date_val
-        
-        sheet.cell(row=out_row, column=start_col + 1).value = row_dict.get("From")
-        
-        to_cell = sheet.cell(row=out_row, column=start_col + 2)
-        to_cell.value = to_val
-        
-        sheet.cell(row=out_row, column=start_col + 3).value = row_dict.get("DC (MW)")
-        sheet.cell(row=out_row, column=start_col + 4).value = row_dict.get("As per SLDC Scada in MW")
-        sheet.cell(row=out_row, column=start_col + 5).value = row_dict.get("DC , Scada Diff (MW)")
-        sheet.cell(row=out_row, column=start_col + 6).value = row_dict.get("Mus")
-        sheet.cell(row=out_row, column=start_col + 7).value = row_dict.get("Sum Mus")
-        sheet.cell(row=out_row, column=start_col + 8).value = row_dict.get("MW as per ramp")
-        sheet.cell(row=out_row, column=start_col + 9).value = row_dict.get("Diff")
-        sheet.cell(row=out_row, column=start_col + 10).value = row_dict.get("MU")
-        sheet.cell(row=out_row, column=start_col + 11).value = row_dict.get("Sum MU")
-        
-        # Write _ins_end marker (hidden column)
-        ins_end_cell = sheet.cell(row=out_row, column=start_col + 12)
-        ins_end_cell.value = "TRUE" if ins_end else "FALSE"
-        
-        # Apply yellow highlighting
-        # Date column: highlight when it has a value (first row of each date/instruction)
-        if date_val and str(date_val).strip():
-            date_cell.fill = YELLOW_FILL
-            date_cell.font = Font(bold=True)
-        
-        # To column: highlight when it's instruction end time
-        if ins_end:
-            to_cell.fill = YELLOW_FILL
-            to_cell.font = Font(bold=True)
-        
-        # Apply borders to all columns including _ins_end
-        for c in range(13):
-            sheet.cell(row=out_row, column=start_col + c).border = thin_border
-
-    if date_start_row is not None:
-        last_data_row = row_idx + len(output_rows) - 1
-        merge_end = last_data_row
-        if output_rows and _is_summary_row(output_rows[-1]):
-            merge_end = last_data_row - 1  # Exclude final summary row from merge
-        if merge_end > date_start_row:
-            sheet.merge_cells(
-                f"{get_column_letter(start_col)}{date_start_row}:{get_column_letter(start_col)}{merge_end}"
-            )
-
-    last_row = row_idx + len(output_rows) - 1
-    last_content_col = start_col + 12  # Including _ins_end column
-
-    sheet.freeze_panes = sheet.cell(row=start_data_row, column=start_col).coordinate
+    # Layout goes before the first row (write-only sheets write it ahead of the rows)
+    sheet.freeze_panes = f"{get_column_letter(start_col)}{start_data_row}"
     sheet.sheet_view.showGridLines = False
-
     for i, w in enumerate(COLUMN_WIDTHS):
         sheet.column_dimensions[get_column_letter(start_col + i)].width = w
-    
     # Hide the _ins_end marker column
     sheet.column_dimensions[get_column_letter(start_col + 12)].hidden = True
 
+    header, plain, highlight = styles[STYLE_HEADER], styles[STYLE_CELL], styles[STYLE_HIGHLIGHT]
+    merged_style, merged_last_style = styles[STYLE_MERGED], styles[STYLE_MERGED_LAST]
+
+    for _ in range(PAD):
+        sheet.append([])
+    sheet.append(lead + [_cell(sheet, h, header) for h in HEADERS])
+
+    def _append_row(values, date_value, date_style):
+        ins_end = values[12]
+        row = lead + [_cell(sheet, date_value, date_style)]
+        for c in range(1, 12):
+            # To column: highlight when it's instruction end time
+            row.append(_cell(sheet, values[c], highlight if c == 2 and ins_end else plain))
+        # _ins_end marker (hidden column)
+        row.append(_cell(sheet, "TRUE" if ins_end else "FALSE", plain))
+        sheet.append(row)
+
+    def _flush(group, group_start, last):
+        """Write one merge group (dated row and the rows up to the next dated row) and merge its Date cells."""
+        merge_end = group_start + len(group) - 1
+        # Exclude summary row (Sum Mus of an instruction) from merge so that row keeps empty Date/From/To
+        if group[-1][0] == RowKind.SUM:
+            merge_end -= 1
+        merged = merge_end > group_start if last else merge_end >= group_start
+        for i, (_kind, values) in enumerate(group):
+            sheet_row = group_start + i
+            if i == 0:
+                # Date column: highlight when it has a value (first row of each date/instruction)
+                _append_row(values, values[0], highlight if str(values[0]).strip() else plain)
+            elif merged and sheet_row <= merge_end:
+                # Covered by the merge: only the merge's outer border
+                _append_row(values, None, merged_last_style if sheet_row == merge_end else merged_style)
+            else:
+                _append_row(values, values[0] or "", plain)
+        if merged:
+            ref = f"{get_column_letter(start_col)}{group_start}:{get_column_letter(start_col)}{merge_end}"
+            if write_only:
+                sheet.merged_cells.add(CellRange(ref))
+            else:
+                sheet.merge_cells(ref)
+
+    group = []  # Rows of the current Date merge, from its dated row on
+    group_start = None
+    out_row = start_data_row
+    for kind, values in output_rows.iter_rows():
+        if values[0]:
+            if group:
+                _flush(group, group_start, last=False)
+            group = []
+            group_start = out_row
+        if group_start is None:
+            _append_row(values, "", plain)  # Before the first dated row: no merge
+        else:
+            group.append((kind, values))
+        out_row += 1
+    if group:
+        _flush(group, group_start, last=True)
+
     # Print area excludes the hidden _ins_end column
+    last_row = start_data_row + len(output_rows) - 1
     sheet.print_area = f"A1:{get_column_letter(start_col + 11)}{last_row}"
 
+
+def _write_summary_sheet(wb: Workbook, summary, styles: dict) -> None:
+    """'Summary' sheet: daily table, then monthly table (ramp_engine.ReportSummary), each with a Total row."""
+    sheet = wb.create_sheet("Summary")
+    sheet.sheet_view.showGridLines = False
+    for c, width in enumerate([15, 14, 10, 10, 12, 12, 12, 12], start=1):
+        sheet.column_dimensions[get_column_letter(c)].width = width
+
+    for t, (label, periods) in enumerate((("Date", summary.days), ("Month", summary.months))):
+        if t:
+            sheet.append([])  # Blank row between the tables
+        sheet.append([_cell(sheet, h, styles[STYLE_HEADER]) for h in [label] + SUMMARY_COLUMNS])
+        for values in periods:
+            sheet.append([_cell(sheet, value, styles[STYLE_CELL]) for value in values])
+        sheet.append([_cell(sheet, value, styles[STYLE_HIGHLIGHT]) for value in ["Total", *summary.total]])
+
+
+def build_report_workbook(output_rows: ReportRows, summary=None, write_only: bool = True) -> Workbook:
+    """
+    Build and return an openpyxl Workbook with 'Time Intervals' sheet
+    filled with output_rows and, when given, a 'Summary' sheet with the daily / monthly
+    totals (ramp_engine.ReportSummary). Caller should save to path.
+    write_only=True streams rows to a write-only workbook (bounded memory; it can be saved once
+    and not read back); write_only=False builds a normal in-memory workbook with the same content.
+    """
+    wb = Workbook(write_only=write_only)
+    styles = _add_named_styles(wb)
+    if write_only:
+        sheet = wb.create_sheet("Time Intervals")
+    else:
+        sheet = wb.active
+        sheet.title = "Time Intervals"
+    _write_time_intervals(sheet, output_rows, styles, write_only)
+    if summary is not None:
+        _write_summary_sheet(wb, summary, styles)
+    return wb
+
+
+def build_scenario_workbook(stations: list[dict], labels: list[str]) -> Workbook:
+    """
+    Build the ramp-rate scenario comparison: one row per instruction (and a Total row per station)
+    with Sum Mus and Sum MU for every scenario. stations is [{"station", "instructions":
+    [(date, from, to)], "sums": [[(sum_mus, sum_mu)] per instruction] per scenario}].
+    """
+    wb = Workbook()
+    sheet = wb.active
+    sheet.title = "Scenarios"
+    styles = _make_styles()
+    thin_border = styles["thin_border"]
+
+    headers = ["Station", "Date", "From", "To"]
+    for label in labels:
+        headers += [f"Sum Mus ({label})", f"Sum MU ({label})"]
+    for c, h in enumerate(headers, start=1):
+        cell = sheet.cell(row=1, column=c)
+        cell.value = h
+        cell.font = styles["header_font"]
+        cell.alignment = styles["center_align"]
+        cell.border = thin_border
+
+    row = 2
+    for entry in stations:
+        per_scenario = entry["sums"]
+        for i, (date, time_from, time_to) in enumerate(entry["instructions"]):
+            values = [entry["station"], date, time_from, time_to]
+            for sums in per_scenario:
+                values += list(sums[i])
+            for c, value in enumerate(values, start=1):
+                cell = sheet.cell(row=row, column=c)
+                cell.value = value
+                cell.border = thin_border
+            row += 1
+        # Station total per scenario
+        totals = [entry["station"], "Total", "", ""]
+        for sums in per_scenario:
+            totals += [round(sum(s[0] for s in sums), 3), round(sum(s[1] for s in sums), 3)]
+        for c, value in enumerate(totals, start=1):
+            cell = sheet.cell(row=row, column=c)
+            cell.value = value
+            cell.border = thin_border
+            cell.font = Font(bold=True)
+            cell.fill = YELLOW_FILL
+        row += 1
+
+    sheet.freeze_panes = "E2"
+    sheet.sheet_view.showGridLines = False
+    for c, width in enumerate([18, 15, 10, 10] + [22] * (len(headers) - 4), start=1):
+        sheet.column_dimensions[get_column_letter(c)].width = width
     return wb
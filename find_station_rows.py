@@ -12,10 +12,24 @@ Example:
 """
 
 import argparse
+import hashlib
+import json
+import math
+import multiprocessing
+import os
 import sys
 import re
+import threading
+from array import array
+from collections import OrderedDict
+from itertools import chain, islice
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from datetime import datetime, date, time
+from typing import NamedTuple
+
+import numpy as np
 
 try:
     import openpyxl
@@ -25,6 +39,9 @@ except ImportError:
     print("Install openpyxl: pip install openpyxl", file=sys.stderr)
     sys.exit(1)
 
+import report_export
+import xlsx_reader
+
 
 def format_value(val):
     """Format cell value for display, especially dates and times."""
@@ -34,9 +51,9 @@ def format_value(val):
         # Check if it's actually a time (1900-01-01 date with time)
         if val.date() == date(1900, 1, 1):
             return val.strftime("%H:%M")
-        return val.strftime("%d-%b-%Y")
+        return date_keys(val).display
     if isinstance(val, date):
-        return val.strftime("%d-%b-%Y")
+        return date_keys(val).display
     # Check if it's a time object
     if isinstance(val, time):
         return val.strftime("%H:%M")
@@ -91,35 +108,47 @@ def minutes_to_time_str(minutes):
     return f"{h:02d}:{m:02d}"
 
 
-def slots_15min(from_time, to_time):
+def slot_range(start_min, end_min):
     """
-    Generate 15-minute slots between from_time and to_time.
-    Start is floored to previous 15-min boundary (e.g. 8:10 → 8:00).
-    End time is respected - slots do not extend beyond the given end time.
-    Returns list of (from_str, to_str) e.g. [("8:00", "8:15"), ("8:15", "8:30"), ...].
-    Handles overnight (e.g. 23:00 to 00:00).
+    15-minute slots from start_min to end_min (minutes since midnight) as integer slot starts.
+    Start is floored to previous 15-min boundary; only slots starting before end_min are included.
+    Overnight (end before start): end is next day and those starts are >= 1440 (day offset 1).
     """
+    start_slot = floor_to_15(start_min)
+    # Overnight: end is next day (e.g. 23:00 → 00:00)
+    if start_slot > end_min:
+        end_min += 24 * 60
+    return range(start_slot, end_min, 15)
+
+
+def slot_starts(from_time, to_time):
+    """Integer slot starts (see slot_range) between from_time and to_time; [] if either is invalid."""
     start_min = time_to_minutes(from_time)
     end_min = time_to_minutes(to_time)
     if start_min is None or end_min is None:
         return []
+    return list(slot_range(start_min, end_min))
 
-    start_slot = floor_to_15(start_min)
-    
-    # Overnight: end is next day (e.g. 23:00 → 00:00)
-    if start_slot > end_min:
-        end_min += 24 * 60
 
-    result = []
-    m = start_slot
-    # Only include slots where the slot's START time is < end_min
-    # This ensures slots don't extend beyond the end time
-    while m < end_min:
-        from_m = m % (24 * 60)
-        to_m = (m + 15) % (24 * 60)
-        result.append((minutes_to_time_str(from_m), minutes_to_time_str(to_m)))
-        m += 15
-    return result
+def slot_index(start):
+    """Slot of the day (0–95) of an integer slot start."""
+    return (start // 15) % SLOTS_PER_DAY
+
+
+def slot_times(start):
+    """(From, To) "HH:MM" strings of an integer slot start (for output only)."""
+    return minutes_to_time_str(start % (24 * 60)), minutes_to_time_str((start + 15) % (24 * 60))
+
+
+def slots_15min(from_time, to_time):
+    """
+    Generate 15-minute slots between from_time and to_time.
+    Start is floored to previous 15-min boundary (e.g. 8:10 → 8:00).
+    End time is respected - slots do not extend beyond the given end time.
+    Returns list of (from_str, to_str) e.g. [("8:00", "8:15"), ("8:15", "8:30"), ...].
+    Handles overnight (e.g. 23:00 to 00:00).
+    """
+    return [slot_times(start) for start in slot_starts(from_time, to_time)]
 
 
 def parse_time_str(time_str):
@@ -127,6 +156,99 @@ def parse_time_str(time_str):
     return time_to_minutes(time_str)
 
 
+# Date formats accepted in instruction / report date cells
+DATE_FORMATS = [
+    "%d-%b-%Y",      # 02-Jan-2026
+    "%d-%b-%y",      # 02-Jan-26
+    "%d.%m.%Y",      # 02.01.2026
+    "%d/%m/%Y",      # 02/01/2026
+    "%Y-%m-%d",      # 2026-01-02
+]
+
+
+class DateKeys(NamedTuple):
+    """A calendar date and every key derived from it."""
+    date: date
+    display: str  # 02-Jan-2026 (report Date column)
+    sheet_name: str  # 02.01.2026 (DC sheet)
+    bd_filename: tuple  # Spellings of the date in BD filenames (02/01/2026, 2/1/2026, 02-01-2026, ...)
+
+
+def _date_keys_for(dt):
+    day_no_zero = str(dt.day)  # Day without leading zero
+    month_no_zero = str(dt.month)  # Month without leading zero
+    variants = [
+        dt.strftime("%d/%m/%Y"),      # 01/01/2026
+        f"{day_no_zero}/{month_no_zero}/{dt.year}",  # 1/1/2026 (no leading zeros)
+        dt.strftime("%d-%m-%Y"),      # 01-01-2026
+        f"{day_no_zero}-{month_no_zero}-{dt.year}",  # 1-1-2026
+        dt.strftime("%Y-%m-%d"),      # 2026-01-01
+        dt.strftime("%Y/%m/%d"),      # 2026/01/01
+    ]
+    return DateKeys(
+        date=dt,
+        display=dt.strftime("%d-%b-%Y"),
+        sheet_name=dt.strftime("%d.%m.%Y"),
+        bd_filename=tuple(dict.fromkeys(variants)),  # Without duplicates, order kept
+    )
+
+
+# Canonicalized dates: a run only sees a handful of distinct dates but asks for them once per slot
+DATE_KEYS_CACHE_MAX = 4096
+_date_keys_cache = OrderedDict()  # {date or stripped date string: DateKeys or None}
+_date_keys_lock = threading.Lock()  # DayPrefetcher resolves dates on a helper thread
+_date_keys_counters = {"hits": 0, "misses": 0}
+
+
+def date_keys(value):
+    """
+    DateKeys of a date value (datetime.date / datetime, or a string in one of DATE_FORMATS);
+    None if it is not a date. Results are memoized in a bounded LRU; see date_keys_stats().
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        key = value.date()
+    elif isinstance(value, date):
+        key = value
+    else:
+        key = str(value).strip()
+    with _date_keys_lock:
+        if key in _date_keys_cache:
+            _date_keys_counters["hits"] += 1
+            _date_keys_cache.move_to_end(key)
+            return _date_keys_cache[key]
+        _date_keys_counters["misses"] += 1
+    
+    keys = None
+    if isinstance(key, date):
+        keys = _date_keys_for(key)
+    else:
+        for fmt in DATE_FORMATS:
+            try:
+                keys = _date_keys_for(datetime.strptime(key, fmt).date())
+                break
+            except ValueError:
+                continue
+    
+    with _date_keys_lock:
+        _date_keys_cache[key] = keys
+        while len(_date_keys_cache) > DATE_KEYS_CACHE_MAX:
+            _date_keys_cache.popitem(last=False)
+    return keys
+
+
+def date_keys_stats():
+    """Date cache counters: hits, misses, entries in memory and the max_entries bound."""
+    with _date_keys_lock:
+        return {
+            "hits": _date_keys_counters["hits"],
+            "misses": _date_keys_counters["misses"],
+            "entries": len(_date_keys_cache),
+            "max_entries": DATE_KEYS_CACHE_MAX,
+        }
+
+
 def convert_date_to_sheet_format(date_str):
     """
     Convert date string from format '02-Jan-2026' to sheet format '02.01.2026'.
@@ -134,28 +256,8 @@ def convert_date_to_sheet_format(date_str):
     """
     if not date_str:
         return None
-    
-    date_str = str(date_str).strip()
-    
-    # List of formats to try
-    formats = [
-        "%d-%b-%Y",      # 02-Jan-2026
-        "%d-%b-%y",      # 02-Jan-26
-        "%d.%m.%Y",      # 02.01.2026 (already in correct format)
-        "%d/%m/%Y",      # 02/01/2026
-        "%Y-%m-%d",      # 2026-01-02
-    ]
-    
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(date_str, fmt)
-            # Convert to DD.MM.YYYY format
-            result = dt.strftime("%d.%m.%Y")
-            return result
-        except ValueError:
-            continue
-    
-    return None
+    keys = date_keys(str(date_str))
+    return keys.sheet_name if keys else None
 
 
 def normalize_time_str(time_str):
@@ -180,43 +282,91 @@ def convert_date_for_bd_filename(date_str):
     """
     if not date_str:
         return []
-    
-    date_str = str(date_str).strip()
-    date_formats = [
-        "%d-%b-%Y",      # 01-Jan-2026
-        "%d-%b-%y",      # 01-Jan-26
-        "%d.%m.%Y",      # 01.01.2026
-        "%d/%m/%Y",      # 01/01/2026
-        "%Y-%m-%d",      # 2026-01-01
+    keys = date_keys(str(date_str))
+    return list(keys.bd_filename) if keys else []
+
+
+def parse_date(date_str):
+    """
+    Parse a date value ('02-Jan-2026', '02.01.2026', datetime, ...) to datetime.date.
+    Returns None if parsing fails.
+    """
+    keys = date_keys(date_str)
+    return keys.date if keys else None
+
+
+# Dates embedded in BD filenames: day first (17-01-2026, 1/1/2026) or ISO (2026-01-17)
+BD_FILENAME_DATE_PATTERNS = [
+    (re.compile(r'(?<!\d)(\d{1,2})[/-](\d{1,2})[/-](\d{4})(?!\d)'), (2, 1, 0)),
+    (re.compile(r'(?<!\d)(\d{4})[/-](\d{1,2})[/-](\d{1,2})(?!\d)'), (0, 1, 2)),
+]
+
+
+def bd_filename_dates(filename):
+    """Return the calendar dates embedded in a BD filename (e.g. 'BD LR_MBED 17-01-2026.xlsx')."""
+    found = []
+    for pattern, (y, m, d) in BD_FILENAME_DATE_PATTERNS:
+        for match in pattern.findall(filename):
+            try:
+                file_date = date(int(match[y]), int(match[m]), int(match[d]))
+            except ValueError:
+                continue  # Not a real date (e.g. 31-02-2026)
+            if file_date not in found:
+                found.append(file_date)
+    return found
+
+
+def build_bd_file_index(bd_folder):
+    """
+    Scan BD folder once and map each date in a filename to its file.
+    Returns (index, duplicates): index is {datetime.date: Path}; duplicates is
+    {datetime.date: [Path, ...]} for dates claimed by more than one file
+    (e.g. 'BD LR' and 'BD LR_MBED' for the same day). Files are taken in name
+    order, so the indexed file for a duplicated date is the first by name.
+    """
+    index = {}
+    duplicates = {}
+    if not bd_folder or not bd_folder.exists() or not bd_folder.is_dir():
+        return index, duplicates
+    
+    excel_files = list(bd_folder.glob("*.xlsx")) + list(bd_folder.glob("*.xls"))
+    for file_path in sorted(excel_files, key=lambda p: p.name.lower()):
+        if file_path.name.startswith("~$"):
+            continue  # Excel lock file for an open workbook
+        for file_date in bd_filename_dates(file_path.name):
+            if file_date in index:
+                duplicates.setdefault(file_date, [index[file_date]]).append(file_path)
+            else:
+                index[file_date] = file_path
+    return index, duplicates
+
+
+# {resolved BD folder: (folder mtime_ns, index, duplicates)}; rebuilt when files are added/removed
+_bd_index_cache = {}
+
+
+def get_bd_file_index(bd_folder):
+    """Return (index, duplicates) for a BD folder, reusing the last scan while the folder is unchanged."""
+    try:
+        key = bd_folder.resolve()
+        mtime_ns = key.stat().st_mtime_ns
+    except (AttributeError, OSError):
+        return build_bd_file_index(bd_folder)
+    cached = _bd_index_cache.get(key)
+    if cached and cached[0] == mtime_ns:
+        return cached[1], cached[2]
+    index, duplicates = build_bd_file_index(bd_folder)
+    _bd_index_cache[key] = (mtime_ns, index, duplicates)
+    return index, duplicates
+
+
+def bd_duplicate_warnings(duplicates):
+    """Human-readable warnings for dates with more than one BD file."""
+    return [
+        f"Multiple BD files for {file_date.strftime('%d-%b-%Y')}: "
+        f"{', '.join(p.name for p in paths)} (using {paths[0].name})"
+        for file_date, paths in sorted(duplicates.items())
     ]
-    
-    possible_dates = []
-    for fmt in date_formats:
-        try:
-            dt = datetime.strptime(date_str, fmt)
-            # Generate various formats for filename matching
-            day_no_zero = str(dt.day)  # Day without leading zero
-            month_no_zero = str(dt.month)  # Month without leading zero
-            possible_dates.extend([
-                dt.strftime("%d/%m/%Y"),      # 01/01/2026
-                f"{day_no_zero}/{month_no_zero}/{dt.year}",  # 1/1/2026 (no leading zeros)
-                dt.strftime("%d-%m-%Y"),      # 01-01-2026
-                f"{day_no_zero}-{month_no_zero}-{dt.year}",  # 1-1-2026
-                dt.strftime("%Y-%m-%d"),      # 2026-01-01
-                dt.strftime("%Y/%m/%d"),      # 2026/01/01
-            ])
-        except ValueError:
-            continue
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_dates = []
-    for date in possible_dates:
-        if date not in seen:
-            seen.add(date)
-            unique_dates.append(date)
-    
-    return unique_dates
 
 
 def find_bd_file(bd_folder, date_str):
@@ -227,393 +377,695 @@ def find_bd_file(bd_folder, date_str):
     if not bd_folder or not bd_folder.exists() or not bd_folder.is_dir():
         return None
     
-    if not date_str:
+    file_date = parse_date(date_str)
+    if file_date is None:
         return None
     
-    # Get possible date formats for filename matching
-    possible_dates = convert_date_for_bd_filename(date_str)
-    
-    # Search for files containing any of the date formats
-    for file_path in bd_folder.glob("*.xlsx"):
-        filename_lower = file_path.name.lower()
-        for date_format in possible_dates:
-            if date_format.lower() in filename_lower:
-                return file_path
+    index, _duplicates = get_bd_file_index(bd_folder)
+    return index.get(file_date)
+
+
+# Slots per day (15-minute blocks)
+SLOTS_PER_DAY = 96
+
+
+def _empty_slot_array():
+    """Return a 96-slot float array with every slot missing (NaN)."""
+    return array("d", [math.nan]) * SLOTS_PER_DAY
+
+
+def _bd_time_to_minutes(raw):
+    """Extract minutes since midnight from a BD time cell (datetime, time or 'date HH:MM' string)."""
+    if isinstance(raw, datetime):
+        return raw.hour * 60 + raw.minute
+    if isinstance(raw, time):
+        return raw.hour * 60 + raw.minute
+    time_str = str(raw)
+    # Extract time part (last part after space if present)
+    if " " in time_str:
+        time_str = time_str.split()[-1]
+    return time_to_minutes(time_str)
+
+
+def _bd_sample_time(raw):
+    """
+    Split a BD time cell into (date or None, fractional minutes since midnight or None).
+    Seconds are kept so 1-minute and sub-minute exports resample correctly.
+    """
+    if isinstance(raw, datetime):
+        # Time-only cells come back as 1899-12-30/1900-01-01 datetimes; they carry no date
+        day = raw.date() if raw.year > 1900 else None
+        return day, raw.hour * 60 + raw.minute + raw.second / 60
+    if isinstance(raw, time):
+        return None, raw.hour * 60 + raw.minute + raw.second / 60
+    time_str = str(raw).strip()
+    # Extract time part (last part after space if present)
+    if " " in time_str:
+        time_str = time_str.split()[-1]
+    parts = time_str.split(":")
+    try:
+        hours, minutes = int(parts[0]), int(parts[1])
+        seconds = float(parts[2]) if len(parts) > 2 else 0.0
+    except (ValueError, IndexError):
+        return None, None
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return None, None
+    return None, hours * 60 + minutes + seconds / 60
+
+
+def _to_float(val):
+    """Convert a cell value to float; NaN if empty or not numeric."""
+    if val is None:
+        return math.nan
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+# How BD samples are reduced to 96 slot values:
+#   last   - last sample in the slot (default); reads the whole day, so it gives the same values as
+#            'sample' for 15-minute exports and keeps 1-/5-minute exports whole
+#   mean   - mean of all samples in the slot
+#   twa    - time-weighted average; each sample holds until the next one (at most 15 minutes)
+#   sample - legacy: value at each slot start. Only the first 100 data rows are read and a later
+#            row for the same slot start wins, so 1-/5-minute exports lose data
+RESAMPLE_METHODS = ("sample", "mean", "last", "twa")
+DEFAULT_RESAMPLE = "last"
+
+
+def resample_slots(samples, method):
+    """
+    Reduce one day of (minutes since midnight, value) samples to a 96-slot array.
+    NaN values are ignored; slots without samples stay NaN. Each method is one pass of numpy
+    array operations over the samples (bincount per slot index).
+    """
+    if method not in ("mean", "last", "twa"):
+        raise ValueError(f"Unknown resample method: {method!r} (expected one of {', '.join(RESAMPLE_METHODS)})")
+    slot_minutes = 24 * 60 // SLOTS_PER_DAY
+    slots = np.full(SLOTS_PER_DAY, np.nan)
+    points = np.fromiter(chain.from_iterable(samples), np.float64, count=2 * len(samples)).reshape(-1, 2)
+    points = points[~np.isnan(points[:, 1])]
+    minutes, values = points[:, 0], points[:, 1]
+    if method == "last":
+        # Latest sample of each slot (ties: the later one in file order)
+        order = np.argsort(minutes, kind="stable")
+        slot_of = (minutes[order] // slot_minutes).astype(np.intp)
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = slot_of[1:] != slot_of[:-1]
+        slots[slot_of[last]] = values[order][last]
+    elif method == "mean":
+        slot_of = (minutes // slot_minutes).astype(np.intp)
+        counts = np.bincount(slot_of, minlength=SLOTS_PER_DAY)
+        sums = np.bincount(slot_of, weights=values, minlength=SLOTS_PER_DAY)
+        np.divide(sums, counts, out=slots, where=counts > 0)
+    else:
+        # twa: zero-order hold until the next sample, never longer than one slot or past midnight
+        # (samples with the same time: the later one in file order holds, as in 'last')
+        order = np.argsort(minutes, kind="stable")
+        start, value = minutes[order], values[order]
+        end = np.minimum(start + slot_minutes, 24 * 60)
+        end[:-1] = np.minimum(end[:-1], start[1:])
+        held = end > start
+        start, end, value = start[held], end[held], value[held]
+        # A hold spans at most two slots: split it at the slot boundary
+        slot_of = (start // slot_minutes).astype(np.intp)
+        boundary = (slot_of + 1) * slot_minutes
+        first_end = np.minimum(end, boundary)
+        spill = end > boundary
+        piece_slot = np.column_stack((slot_of, slot_of + 1)).ravel()
+        piece_len = np.column_stack((first_end - start, np.where(spill, end - boundary, 0.0))).ravel()
+        piece_value = np.repeat(value, 2)
+        keep = np.column_stack((np.ones(len(start), dtype=bool), spill)).ravel()
+        piece_slot, piece_len, piece_value = piece_slot[keep], piece_len[keep], piece_value[keep]
+        weighted = np.bincount(piece_slot, weights=piece_value * piece_len, minlength=SLOTS_PER_DAY)
+        covered = np.bincount(piece_slot, weights=piece_len, minlength=SLOTS_PER_DAY)
+        low = np.full(SLOTS_PER_DAY, np.inf)
+        high = np.full(SLOTS_PER_DAY, -np.inf)
+        np.minimum.at(low, piece_slot, piece_value)
+        np.maximum.at(high, piece_slot, piece_value)
+        # A slot that saw one value keeps it exactly; otherwise the time-weighted mean
+        slots[piece_slot] = piece_value
+        varies = (low != high) & (covered > 0)
+        slots[varies] = weighted[varies] / covered[varies]
+    return array("d", slots.tobytes())
+
+
+# BD files held in memory by SCADALookupCache (LRU); 96-slot arrays are ~1 KB per file and column
+BD_CACHE_MAX_FILES = 400
+
+# On-disk compiled BD cache format version (bump when the slot layout changes)
+BD_CACHE_VERSION = 2
+
+
+def _bd_cache_meta(bd_file, sheet_name, column_name, resample=DEFAULT_RESAMPLE):
+    """Identity of a compiled BD entry: source path, mtime, size, sheet, column and resample method."""
+    stat = bd_file.stat()
+    return {
+        "version": BD_CACHE_VERSION,
+        "path": str(bd_file.resolve()),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sheet": sheet_name or "",
+        "column": column_name,
+        "resample": resample,
+    }
+
+
+def _bd_cache_path(cache_dir, meta):
+    """Compiled cache file for (path, sheet, column, resample); mtime/size are checked on read."""
+    key = "\0".join([meta["path"], meta["sheet"], meta["column"], meta["resample"]])
+    return cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.bin"
+
+
+def read_compiled_slots(cache_dir, bd_file, sheet_name, column_name, resample=DEFAULT_RESAMPLE):
+    """
+    Read compiled 96-slot array for a BD file from cache_dir.
+    Returns (hit, slots): hit is False when missing or stale (source mtime/size changed);
+    slots may be None on a hit when the file is known not to contain the sheet/column.
+    """
+    try:
+        meta = _bd_cache_meta(bd_file, sheet_name, column_name, resample)
+        cache_file = _bd_cache_path(cache_dir, meta)
+        if not cache_file.exists():
+            return False, None
+        with open(cache_file, "rb") as f:
+            header = json.loads(f.readline().decode("utf-8"))
+            payload = f.read()
+    except (OSError, ValueError):
+        return False, None
+    if any(header.get(k) != v for k, v in meta.items()):
+        return False, None  # Stale: source changed since it was compiled
+    if not header.get("found"):
+        return True, None
+    slots = array("d")
+    slots.frombytes(payload)
+    if header.get("byteorder") != sys.byteorder:
+        slots.byteswap()
+    if len(slots) != SLOTS_PER_DAY:
+        return False, None
+    return True, slots
+
+
+def write_compiled_slots(cache_dir, bd_file, sheet_name, column_name, slots, resample=DEFAULT_RESAMPLE):
+    """Write compiled 96-slot array (or a 'not found' marker when slots is None) atomically."""
+    try:
+        meta = _bd_cache_meta(bd_file, sheet_name, column_name, resample)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_file = _bd_cache_path(cache_dir, meta)
+        header = dict(meta, found=slots is not None, byteorder=sys.byteorder)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            if slots is not None:
+                f.write(slots.tobytes())
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass  # Cache is best-effort; lookups still work from the xlsx
+
+
+def _find_bd_header(header_rows, column_name, max_cols=30):
+    """
+    Locate the Time and target column in the first rows of a BD sheet.
+    Returns (time_col, target_col, header_row, detect_row) or None if not found;
+    detect_row is the row where both columns were known, data starts after it.
+    """
+    time_col = None
+    target_col = None
+    header_row = None
+    target_lower = column_name.lower()
+    for row_num, row_data in enumerate(header_rows, start=1):
+        for col_idx, cell_val in enumerate(row_data[:max_cols], start=1):
+            if not cell_val:
+                continue
+            header_val = str(cell_val).strip().lower()
+            if "time" in header_val and time_col is None:
+                time_col = col_idx
+                if header_row is None:
+                    header_row = row_num
+            if target_lower in header_val or header_val in target_lower:
+                target_col = col_idx
+                if header_row is None:
+                    header_row = row_num
+        if time_col and target_col:
+            return time_col, target_col, header_row, row_num
+    return None
+
+
+def _read_bd_columns(wb, sheet_name, column_names, show_progress=False, resample=DEFAULT_RESAMPLE):
+    """Extract the requested SCADA columns from an open BD workbook (see load_bd_slot_arrays)."""
+    if resample not in RESAMPLE_METHODS:
+        raise ValueError(f"Unknown resample method: {resample!r} (expected one of {', '.join(RESAMPLE_METHODS)})")
+    result = dict.fromkeys(column_names)
+    # Get the specified sheet or active sheet
+    if sheet_name:
+        # Try to find sheet by name (case-insensitive, flexible matching)
+        sheet_found = None
+        sheet_name_lower = sheet_name.lower().strip()
+        for name in wb.sheetnames:
+            if name.strip().lower() == sheet_name_lower or sheet_name_lower in name.strip().lower():
+                sheet_found = name
+                break
+        if not sheet_found:
+            return result
+        ws = wb[sheet_found]
+    else:
+        ws = wb.active
     
-    # Also try .xls files
-    for file_path in bd_folder.glob("*.xls"):
-        filename_lower = file_path.name.lower()
-        for date_format in possible_dates:
-            if date_format.lower() in filename_lower:
-                return file_path
+    if show_progress:
+        print(".", end="", flush=True)  # Progress: reading rows
+    max_cols = 30  # Header scan limited to first 30 columns
+    max_header_rows = 10
+    # Limit to 100 data rows per column (enough for one day: 96 slots + buffer);
+    # resampling reads the whole day whatever the export interval
+    max_rows_to_read = 100
+    whole_day = resample != "sample"
+    rows = ws.iter_rows(values_only=True, max_col=max_cols)
+    header_rows = []
+    for row_data in rows:
+        header_rows.append(row_data)
+        if len(header_rows) >= max_header_rows:
+            break
     
-    return None
+    # (column_name, time_col, target_col, first data row, last data row or None, slots or samples)
+    targets = []
+    for column_name in result:
+        header = _find_bd_header(header_rows, column_name, max_cols=max_cols)
+        if header is None:
+            continue
+        time_col, target_col, header_row, detect_row = header
+        if whole_day:
+            targets.append((column_name, time_col, target_col, detect_row + 1, None, []))
+        else:
+            slots = _empty_slot_array()
+            result[column_name] = slots
+            targets.append((column_name, time_col, target_col, detect_row + 1, header_row + max_rows_to_read, slots))
+    if not targets:
+        return result
+    last_row = None if whole_day else max(t[4] for t in targets)
+    day = None  # Date of the first dated sample; rows from other dates (e.g. next day 00:00) are skipped
+    
+    def _data_rows():
+        yield from enumerate(header_rows, start=1)
+        yield from enumerate(rows, start=len(header_rows) + 1)
+    
+    for row_num, row_data in _data_rows():
+        if last_row is not None and row_num > last_row:
+            break
+        for _column_name, time_col, target_col, first_row, end_row, slots in targets:
+            if row_num < first_row or (end_row is not None and row_num > end_row):
+                continue
+            time_raw = row_data[time_col - 1] if time_col <= len(row_data) else None
+            if time_raw is None:
+                continue
+            if whole_day:
+                sample_day, minutes = _bd_sample_time(time_raw)
+                if minutes is None:
+                    continue
+                if sample_day is not None:
+                    if day is None:
+                        day = sample_day
+                    elif sample_day != day:
+                        continue
+                target_raw = row_data[target_col - 1] if target_col <= len(row_data) else None
+                slots.append((minutes, _to_float(target_raw)))  # Raw samples, reduced below
+                continue
+            minutes = _bd_time_to_minutes(time_raw)
+            if minutes is None or minutes % 15:
+                continue
+            target_raw = row_data[target_col - 1] if target_col <= len(row_data) else None
+            slots[minutes // 15] = _to_float(target_raw)
+    if whole_day:
+        for column_name, _time_col, _target_col, _first_row, _end_row, samples in targets:
+            result[column_name] = resample_slots(samples, resample)
+    return result
+
+
+def load_bd_slot_arrays(bd_file, sheet_name, column_names, show_progress=False, engine=xlsx_reader.DEFAULT_ENGINE,
+                        resample=DEFAULT_RESAMPLE):
+    """
+    Read BD file in a single streaming pass and return {column_name: 96-slot value array}
+    for every requested SCADA column. Headers (Time + each column) are detected in the
+    first 10 rows of the same pass. The workbook is closed before returning.
+    A column maps to None if the sheet or its header is not found.
+    engine: xlsx_reader engine ('fast' streams the sheet XML; 'openpyxl').
+    resample: how samples are reduced to slots (see RESAMPLE_METHODS); every method other than
+    'sample' reads the whole day, so 1- or 5-minute SCADA exports are not truncated.
+    """
+    if show_progress:
+        print(".", end="", flush=True)  # Progress: opening file
+    wb = xlsx_reader.load_workbook(bd_file, engine=engine)
+    try:
+        return _read_bd_columns(wb, sheet_name, column_names, show_progress=show_progress, resample=resample)
+    except xlsx_reader.XlsxReaderError:
+        # Fast reader could not parse this file; read it again with openpyxl
+        wb = xlsx_reader.reopen_with_openpyxl(wb)
+        return _read_bd_columns(wb, sheet_name, column_names, show_progress=show_progress, resample=resample)
+    finally:
+        wb.close()
+
+
+def load_bd_slot_array(bd_file, sheet_name, column_name, show_progress=False, engine=xlsx_reader.DEFAULT_ENGINE,
+                       resample=DEFAULT_RESAMPLE):
+    """
+    Read BD file in a single streaming pass and return its 96-slot value array.
+    Returns None if sheet/columns not found.
+    """
+    return load_bd_slot_arrays(
+        bd_file, sheet_name, [column_name], show_progress=show_progress, engine=engine, resample=resample
+    )[column_name]
+
+
+def _compile_bd_file(task):
+    """
+    Process-pool entry point:
+    (bd_file, sheet_name, column_names, engine, resample) -> (bd_file, {column: slots}, error).
+    """
+    bd_file, sheet_name, column_names, engine, resample = task
+    try:
+        return bd_file, load_bd_slot_arrays(bd_file, sheet_name, column_names, engine=engine, resample=resample), None
+    except Exception as e:
+        return bd_file, dict.fromkeys(column_names), str(e)
 
 
 class SCADALookupCache:
-    """Cache for BD file lookups - maintains file list and loads files on demand."""
-    def __init__(self, bd_folder, column_name, sheet_name=None):
+    """
+    Cache for BD file lookups - indexes BD files by date and loads each file once into 96-slot arrays.
+    column_name may be a single SCADA column or a list of them (e.g. one per station);
+    all columns are extracted in the same pass over each BD file and looked up per
+    (column, date, slot). The first column is the default for lookups.
+    If cache_dir is given, compiled arrays are persisted there and reused while the
+    BD file's mtime and size are unchanged, so repeat runs do not open the xlsx files.
+    engine selects the xlsx reader (see xlsx_reader.ENGINES); resample selects how
+    sub-15-minute SCADA samples are reduced to slot values (see RESAMPLE_METHODS).
+    At most max_files BD files are held in memory (least recently used evicted first;
+    None = unbounded); hit/miss/eviction counters are available from stats().
+    """
+    def __init__(self, bd_folder, column_name, sheet_name=None, cache_dir=None, engine=xlsx_reader.DEFAULT_ENGINE,
+                 max_files=BD_CACHE_MAX_FILES, resample=DEFAULT_RESAMPLE):
         self.bd_folder = bd_folder
-        self.column_name = column_name
+        if isinstance(column_name, str):
+            column_name = [column_name]
+        self.column_names = tuple(dict.fromkeys(column_name))  # SCADA columns to extract (ordered, unique)
+        self.column_name = self.column_names[0]  # Default column for lookups
         self.sheet_name = sheet_name  # Specific sheet to read (e.g., "DATA-CMD")
-        self.cache = {}  # {date_str: (wb, ws, time_col, target_col, header_row, time_map)}
-        self.file_list = []  # List of (file_path, possible_dates) tuples
-        self.column_cache = {}  # {file_path: (time_col, target_col, header_row)}
+        self.cache_dir = Path(cache_dir) if cache_dir else None  # Compiled on-disk cache
+        self.engine = engine  # xlsx reader engine for BD files
+        if resample not in RESAMPLE_METHODS:
+            raise ValueError(f"Unknown resample method: {resample!r} (expected one of {', '.join(RESAMPLE_METHODS)})")
+        self.resample = resample  # Slot reduction for BD samples
+        self.cache = {}  # {date_str: file_path, or None if no BD file for that date}
+        # LRU of loaded files: {file_path: {column: array('d') of 96 slot values, or None}}
+        self.file_cache = OrderedDict()
+        self.max_files = max_files
+        self.hits = 0  # Lookups served from memory
+        self.misses = 0  # Lookups that had to load a file (compiled cache or xlsx)
+        self.evictions = 0  # Files dropped from memory to stay within max_files
         
-        # Build file list at initialization (just paths, no opening)
+        # Build date -> file index at initialization (just paths, no opening)
+        self.file_index = {}  # {datetime.date: Path}
+        self.duplicate_dates = {}  # {datetime.date: [Path, ...]} dates with more than one BD file
         self._build_file_list()
     
     def _build_file_list(self):
-        """Build list of BD files with their possible date matches (no file opening)."""
-        if not self.bd_folder or not self.bd_folder.exists():
-            return
-        
-        # Get all Excel files in BD folder
-        excel_files = list(self.bd_folder.glob("*.xlsx")) + list(self.bd_folder.glob("*.xls"))
-        
-        for file_path in excel_files:
-            filename_lower = file_path.name.lower()
-            # Extract possible dates from filename
-            possible_dates = []
-            
-            # Try to extract dates from filename (common patterns)
-            # Pattern for dates like 1/1/2026, 01/01/2026, 2026-01-01, etc.
-            date_patterns = [
-                r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})',  # 1/1/2026 or 01-01-2026
-                r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})',  # 2026-01-01
-            ]
-            
-            for pattern in date_patterns:
-                matches = re.findall(pattern, filename_lower)
-                for match in matches:
-                    if len(match) == 3:
-                        # Try to construct date string
-                        if len(match[2]) == 4:  # YYYY format
-                            month, day, year = match
-                            possible_dates.append(f"{day}/{month}/{year}")
-                            possible_dates.append(f"{int(day)}/{int(month)}/{year}")
-                        else:  # DD/MM/YYYY format
-                            day, month, year = match
-                            possible_dates.append(f"{day}/{month}/{year}")
-                            possible_dates.append(f"{int(day)}/{int(month)}/{year}")
-            
-            if possible_dates:
-                self.file_list.append((file_path, possible_dates))
+        """Index BD files by the date in their filename (no file opening)."""
+        self.file_index, self.duplicate_dates = get_bd_file_index(self.bd_folder)
     
     def _find_file_for_date(self, date_str):
-        """Find BD file for given date from pre-built file list."""
-        # Convert date to possible formats for matching
-        possible_date_formats = convert_date_for_bd_filename(date_str)
-        
-        # Check each file's possible dates
-        for file_path, file_dates in self.file_list:
-            filename_lower = file_path.name.lower()
-            # Check if any of our date formats match file's dates or filename
-            for date_format in possible_date_formats:
-                if date_format.lower() in filename_lower:
-                    return file_path
-            # Also check file's extracted dates
-            for file_date in file_dates:
-                for date_format in possible_date_formats:
-                    if date_format.lower() == file_date.lower():
-                        return file_path
-        
-        return None
-    
-    def get_workbook_for_date(self, date_str, show_progress=False):
-        """Get or load workbook for given date (loads file only when needed)."""
+        """Find BD file for given date from the pre-built index."""
+        file_date = parse_date(date_str)
+        if file_date is None:
+            return None
+        return self.file_index.get(file_date)
+    
+    def _read_compiled(self, bd_file):
+        """Read every column of a BD file from the compiled cache. Returns (columns, missing column names)."""
+        columns = {}
+        missing = []
+        for column_name in self.column_names:
+            hit, slots = (False, None)
+            if self.cache_dir:
+                hit, slots = read_compiled_slots(self.cache_dir, bd_file, self.sheet_name, column_name, self.resample)
+            if hit:
+                columns[column_name] = slots
+            else:
+                missing.append(column_name)
+        return columns, missing
+    
+    def _remember(self, bd_file, columns):
+        """Put a loaded file at the most recently used end of the LRU, evicting the oldest beyond max_files."""
+        self.file_cache[bd_file] = columns
+        self.file_cache.move_to_end(bd_file)
+        while self.max_files is not None and len(self.file_cache) > max(1, self.max_files):
+            self.file_cache.popitem(last=False)
+            self.evictions += 1
+    
+    def _store_parsed(self, bd_file, columns, parsed, error=None):
+        """Merge freshly parsed columns (written to the compiled cache unless parsing failed)."""
+        for column_name, slots in parsed.items():
+            if error is None and self.cache_dir:
+                write_compiled_slots(self.cache_dir, bd_file, self.sheet_name, column_name, slots, self.resample)
+            columns[column_name] = slots
+        return columns
+    
+    def _resolve_file(self, date_str, show_progress=False):
+        """BD file for a date string (memoized); None if there is none."""
         if date_str in self.cache:
             return self.cache[date_str]
-        
-        # Find BD file from pre-built list
+        # Find BD file from pre-built index
         bd_file = self._find_file_for_date(date_str)
+        if not bd_file and show_progress:
+            print(f" (file not found)", end="", flush=True)
+        self.cache[date_str] = bd_file
+        return bd_file
+    
+    def _get_day(self, date_str, show_progress=False):
+        """Get {column: 96-slot array} for given date (loads the BD file when not in memory)."""
+        bd_file = self._resolve_file(date_str, show_progress=show_progress)
         if not bd_file:
-            if show_progress:
-                print(f" (file not found)", end="", flush=True)
             return None
         
-        if show_progress:
-            print(f" (loading {bd_file.name})", end="", flush=True)
-        
+        columns = self.file_cache.get(bd_file)
+        if columns is not None:
+            self.hits += 1
+            self.file_cache.move_to_end(bd_file)
+            return columns
+        self.misses += 1
         
-        try:
-            # Check if we already have column info for this file
-            if bd_file in self.column_cache:
-                time_col, target_col, header_row = self.column_cache[bd_file]
-                # Load workbook (we already know columns, so just load once)
-                if show_progress:
-                    print(".", end="", flush=True)  # Progress: opening file
-                wb = openpyxl.load_workbook(bd_file, read_only=True, data_only=True)
-                
-                # Get the specified sheet or active sheet
-                if self.sheet_name:
-                    sheet_found = None
-                    sheet_name_lower = self.sheet_name.lower().strip()
-                    for name in wb.sheetnames:
-                        if name.strip().lower() == sheet_name_lower or sheet_name_lower in name.strip().lower():
-                            sheet_found = name
-                            break
-                    if sheet_found:
-                        ws = wb[sheet_found]
-                    else:
-                        return None
-                else:
-                    ws = wb.active
-            else:
-                # Load workbook ONCE to find columns AND use it
-                if show_progress:
-                    print(".", end="", flush=True)  # Progress: opening file
-                wb = openpyxl.load_workbook(bd_file, read_only=True, data_only=True)
-                
-                # Get the specified sheet or active sheet
-                if self.sheet_name:
-                    # Try to find sheet by name (case-insensitive, flexible matching)
-                    sheet_found = None
-                    sheet_name_lower = self.sheet_name.lower().strip()
-                    for name in wb.sheetnames:
-                        if name.strip().lower() == sheet_name_lower or sheet_name_lower in name.strip().lower():
-                            sheet_found = name
-                            break
-                    if sheet_found:
-                        ws = wb[sheet_found]
-                    else:
-                        wb.close()
-                        return None
-                else:
-                    ws = wb.active
-                
-                # Find columns efficiently - limit column scan to first 30 columns
-                if show_progress:
-                    print(".", end="", flush=True)  # Progress: finding columns
-                time_col = None
-                target_col = None
-                header_row = None
-                
-                # Scan first 10 rows, limit to first 30 columns
-                # Avoid calling max_column/max_row if possible (can be slow for large files)
-                max_cols = 30  # Fixed limit, don't query max_column
-                max_header_rows = 10  # Fixed limit, don't query max_row
-                for row_num in range(1, max_header_rows + 1):
-                    # Read row values in bulk (faster than cell-by-cell)
-                    try:
-                        row_data = next(ws.iter_rows(min_row=row_num, max_row=row_num, min_col=1, max_col=max_cols, values_only=True), None)
-                    except StopIteration:
-                        break
-                    if not row_data:
-                        continue
-                    
-                    for col_idx, cell_val in enumerate(row_data, start=1):
-                        if not cell_val:
-                            continue
-                        
-                        header_val = str(cell_val).strip().lower()
-                        if "time" in header_val and time_col is None:
-                            time_col = col_idx
-                            if header_row is None:
-                                header_row = row_num
-                        if self.column_name.lower() in header_val or header_val in self.column_name.lower():
-                            target_col = col_idx
-                            if header_row is None:
-                                header_row = row_num
-                    
-                    if time_col and target_col:
-                        break
-                
-                if not time_col or not target_col:
-                    wb.close()
-                    return None
-                
-                # Cache column info for this file (for future dates using same file)
-                self.column_cache[bd_file] = (time_col, target_col, header_row)
-            
-            # Build time-to-row mapping efficiently using iter_rows for faster reading
+        columns, missing = self._read_compiled(bd_file)
+        if missing:
             if show_progress:
-                print(".", end="", flush=True)  # Progress: building time map
-            time_map = {}
-            data_start = header_row + 1
-            # Limit to 100 rows (enough for one day: 96 slots + buffer)
-            # Don't query max_row - just read fixed number of rows
-            max_rows_to_read = 100
-            
-            # Use iter_rows for faster reading (reads entire row at once)
-            row_num = data_start
+                print(f" (loading {bd_file.name})", end="", flush=True)
             try:
-                for row_tuple in ws.iter_rows(min_row=data_start, max_row=data_start + max_rows_to_read - 1, min_col=time_col, max_col=time_col, values_only=True):
-                    if not row_tuple or row_tuple[0] is None:
-                        row_num += 1
-                        continue
-                        
-                    time_cell_raw = row_tuple[0]
-                    
-                    # Extract time quickly - avoid format_value() for speed
-                    time_norm = None
-                    if isinstance(time_cell_raw, datetime):
-                        # Direct datetime - extract HH:MM directly (fastest path)
-                        time_norm = f"{time_cell_raw.hour:02d}:{time_cell_raw.minute:02d}"
-                    else:
-                        time_str = str(time_cell_raw)
-                        # Extract time part (last part after space if present)
-                        if " " in time_str:
-                            time_part = time_str.split()[-1]
-                            time_norm = normalize_time_str(time_part)
-                        else:
-                            time_norm = normalize_time_str(time_str)
-                    
-                    if time_norm:
-                        time_map[time_norm] = row_num
-                    
-                    row_num += 1
-                    
-                    # Stop early if we've read enough rows
-                    if row_num >= data_start + max_rows_to_read:
-                        break
-            except StopIteration:
-                pass  # End of data
-            
-            cache_entry = (wb, ws, time_col, target_col, header_row, time_map)
-            self.cache[date_str] = cache_entry
-            
-            if show_progress:
+                parsed = load_bd_slot_arrays(
+                    bd_file, self.sheet_name, missing, show_progress=show_progress, engine=self.engine, resample=self.resample
+                )
+                error = None
+            except Exception as e:
+                if show_progress:
+                    print(f" (error)", end="", flush=True)
+                parsed = dict.fromkeys(missing)
+                error = str(e)
+            self._store_parsed(bd_file, columns, parsed, error)
+            if show_progress and error is None:
                 print("✓", end="", flush=True)  # Progress: done loading
-            
-            return cache_entry
-            
-        except Exception as e:
-            if show_progress:
-                print(f" (error)", end="", flush=True)
+        
+        self._remember(bd_file, columns)
+        return columns
+    
+    def fetch_day(self, date_str):
+        """
+        Load the BD file for a date without touching the in-memory cache (safe on a helper thread).
+        Returns (bd_file, columns) to pass to install_day, or None if there is no file or it is already loaded.
+        """
+        bd_file = self._find_file_for_date(date_str)
+        if not bd_file or bd_file in self.file_cache:
             return None
-    
-    def find_value(self, date_str, time_str, debug=False, show_progress=False):
-        """Find SCADA value for given date and time."""
-        cache_entry = self.get_workbook_for_date(date_str, show_progress=show_progress)
-        if not cache_entry:
+        columns, missing = self._read_compiled(bd_file)
+        if missing:
+            try:
+                parsed = load_bd_slot_arrays(bd_file, self.sheet_name, missing, engine=self.engine, resample=self.resample)
+                error = None
+            except Exception as e:
+                parsed = dict.fromkeys(missing)
+                error = str(e)
+            self._store_parsed(bd_file, columns, parsed, error)
+        return bd_file, columns
+    
+    def install_day(self, date_str, fetched):
+        """Put a fetch_day result into the cache (call on the thread doing the lookups)."""
+        if fetched is None:
+            return
+        bd_file, columns = fetched
+        self.cache[date_str] = bd_file
+        if bd_file not in self.file_cache:
+            self._remember(bd_file, columns)
+    
+    def get_day_slots(self, date_str, show_progress=False, column=None):
+        """Get 96-slot SCADA array for given date and column (default: first column)."""
+        columns = self._get_day(date_str, show_progress=show_progress)
+        if columns is None:
             return None
+        return columns.get(column or self.column_name)
+    
+    def preload(self, date_strs, workers=None, show_progress=False):
+        """
+        Load the BD files for all given dates (in the order they will be needed) up front.
+        Files not already in memory or in the compiled cache are parsed concurrently
+        in a process pool (workers: None = one per CPU core, 1 = serial); each worker
+        returns plain 96-slot arrays. The frozen (PyInstaller) build parses serially.
+        Only the first max_files files are kept in memory; without a compiled cache,
+        files beyond that are not parsed here but loaded on demand.
+        Returns the number of BD files parsed.
+        """
+        needed = []  # BD files in order of first use
+        for date_str in date_strs:
+            if not date_str:
+                continue
+            bd_file = self._resolve_file(date_str)
+            if bd_file and bd_file not in needed:
+                needed.append(bd_file)
+        capacity = len(needed) if self.max_files is None else max(1, self.max_files)
         
-        wb, ws, time_col, target_col, header_row, time_map = cache_entry
-        
-        # Normalize time for lookup
-        time_norm = normalize_time_str(time_str)
-        
-        # Look up row number from cache
-        row_num = time_map.get(time_norm)
-        if row_num:
-            target_cell = ws.cell(row=row_num, column=target_col)
-            return target_cell.value
-        
-        # Fallback: search if not in cache (limit search range)
-        data_start = header_row + 1
-        max_search = min(ws.max_row + 1, data_start + 200)
-        for row_num in range(data_start, max_search):
-            time_cell = ws.cell(row=row_num, column=time_col)
-            if time_cell.value is None:
+        loaded = {}  # {bd_file: columns} to put in memory
+        pending = {}  # {bd_file: (compiled columns, missing column names)} still to parse
+        for position, bd_file in enumerate(needed):
+            if bd_file in self.file_cache:
                 continue
-            
-            time_cell_raw = time_cell.value
-            
-            # Extract time part if it's a datetime string
-            time_cell_norm = None
-            if isinstance(time_cell_raw, datetime):
-                time_cell_norm = normalize_time_str(time_cell_raw.strftime("%H:%M:%S"))
+            if position >= capacity and not self.cache_dir:
+                break  # Would be evicted before use and not persisted; load on demand instead
+            columns, missing = self._read_compiled(bd_file)
+            if missing:
+                pending[bd_file] = (columns, missing)
             else:
-                time_cell_val = format_value(time_cell_raw)
-                if " " in str(time_cell_val):
-                    parts = str(time_cell_val).split()
-                    if len(parts) > 1:
-                        time_part = parts[-1]
-                        time_cell_norm = normalize_time_str(time_part)
-                else:
-                    time_cell_norm = normalize_time_str(time_cell_val)
+                loaded[bd_file] = columns
+        
+        if pending:
+            tasks = [
+                (bd_file, self.sheet_name, missing, self.engine, self.resample)
+                for bd_file, (_columns, missing) in pending.items()
+            ]
+            if workers is None:
+                workers = os.cpu_count() or 1
+            workers = max(1, min(workers, len(tasks)))
+            if show_progress:
+                print(f" (parsing {len(tasks)} BD file(s), {workers} worker(s))", end="", flush=True)
+            results = None
+            if workers > 1 and not getattr(sys, "frozen", False):
+                try:
+                    # spawn: safe when called from a worker thread (e.g. the Streamlit app)
+                    mp_context = multiprocessing.get_context("spawn")
+                    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+                        results = list(pool.map(_compile_bd_file, tasks))
+                except (OSError, BrokenProcessPool):
+                    results = None
+            if results is None:
+                # Serial fallback (frozen build, single worker, or pool unavailable)
+                results = [_compile_bd_file(task) for task in tasks]
             
-            # Match normalized times
-            if time_cell_norm == time_norm or time_norm in str(time_cell_val) or time_norm in str(time_cell_raw):
-                target_cell = ws.cell(row=row_num, column=target_col)
-                return target_cell.value
+            for bd_file, parsed, error in results:
+                columns, _missing = pending[bd_file]
+                loaded[bd_file] = self._store_parsed(bd_file, columns, parsed, error)
         
-        return None
+        # Insert latest-needed first so the earliest-needed files are the most recently used
+        for bd_file in reversed(needed[:capacity]):
+            if bd_file in loaded:
+                self._remember(bd_file, loaded[bd_file])
+            elif bd_file in self.file_cache:
+                self.file_cache.move_to_end(bd_file)
+        if show_progress and pending:
+            print("✓", end="", flush=True)
+        return len(pending)
+    
+    def find_slot(self, date_str, index, show_progress=False, column=None):
+        """SCADA value of slot index (0–95) on a date, or None (O(1) read from the day's slot array)."""
+        slots = self.get_day_slots(date_str, show_progress=show_progress, column=column)
+        if slots is None:
+            return None
+        value = slots[index]
+        if math.isnan(value):
+            return None
+        return value
+    
+    def find_value(self, date_str, time_str, debug=False, show_progress=False, column=None):
+        """Find SCADA value for given date, time and column (O(1) read from the day's slot array)."""
+        minutes = time_to_minutes(normalize_time_str(time_str))
+        if minutes is None:
+            return None
+        return self.find_slot(date_str, minutes // 15, show_progress=show_progress, column=column)
+    
+    def stats(self):
+        """Cache counters: hits, misses, evictions, files in memory and the max_files bound."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "files": len(self.file_cache),
+            "max_files": self.max_files,
+        }
     
     def close_all(self):
-        """Close all cached workbooks."""
-        for cache_entry in self.cache.values():
-            if cache_entry:
-                wb = cache_entry[0]
-                try:
-                    wb.close()
-                except:
-                    pass
+        """Drop all cached slot arrays (workbooks are already closed after loading)."""
         self.cache.clear()
-        self.column_cache.clear()
+        self.file_cache.clear()
 
 
-def find_scada_value(scada_cache, date_str, time_str, debug=False, show_progress=False):
+def find_scada_value(scada_cache, date_str, time_str, debug=False, show_progress=False, column=None):
     """
-    Find SCADA value using cached lookup.
+    Find SCADA value using cached lookup (column: SCADA column, default the cache's first).
     """
     if not scada_cache:
         return None
     
-    return scada_cache.find_value(date_str, time_str, debug=debug, show_progress=show_progress)
+    return scada_cache.find_value(date_str, time_str, debug=debug, show_progress=show_progress, column=column)
 
 
-def find_dc_value(dc_wb, sheet_name, from_time_str, to_time_str, debug=False):
+def parse_scada_column_map(entries):
     """
-    Find DC value from DC workbook sheet for matching time range.
-    Searches for row where 'From' and 'To' columns match the given time range.
-    Returns the 'Final Revison' column value, or None if not found.
+    Parse 'STATION=SCADA column' entries (e.g. CLI arguments or lines of text) into {station: column}.
+    Blank entries and lines starting with '#' are ignored. Raises ValueError for an entry without '='.
+    """
+    column_map = {}
+    for entry in entries:
+        entry = entry.strip()
+        if not entry or entry.startswith("#"):
+            continue
+        station, sep, column = entry.partition("=")
+        if not sep or not station.strip() or not column.strip():
+            raise ValueError(f"Expected 'STATION=SCADA column', got: {entry!r}")
+        column_map[station.strip()] = column.strip()
+    return column_map
+
+
+def scada_column_for_station(column_map, station, default=None):
+    """SCADA column mapped to a station (exact name first, then case-insensitive), else default."""
+    if station in column_map:
+        return column_map[station]
+    station_upper = station.strip().upper()
+    for name, column in column_map.items():
+        if name.upper() == station_upper:
+            return column
+    return default
+
+
+def _find_dc_header(rows):
+    """
+    Locate the DC header row and the From / To / Final Revison columns.
+    rows: list of row value tuples (first rows of the sheet).
+    Returns (header_row, from_col, to_col, final_revision_col); 1-based, None if not found.
     """
-    if dc_wb is None:
-        if debug:
-            print(f"  [DC Lookup] dc_wb is None", file=sys.stderr)
-        return None
-    
-    if not sheet_name:
-        if debug:
-            print(f"  [DC Lookup] sheet_name is empty", file=sys.stderr)
-        return None
-    
-    # Find the sheet by name (case-insensitive, flexible matching)
-    target_sheet = None
-    sheet_name_lower = sheet_name.lower().strip()
-    
-    # Try exact match first (with date format)
-    for name in dc_wb.sheetnames:
-        name_clean = name.strip()
-        if name_clean.lower() == sheet_name_lower:
-            target_sheet = name
-            break
-    
-    # If not found, try partial match (date might be embedded in sheet name)
-    if target_sheet is None:
-        for name in dc_wb.sheetnames:
-            name_clean = name.strip().lower()
-            # Check if the date string is contained in the sheet name
-            if sheet_name_lower in name_clean:
-                target_sheet = name
-                break
-    
-    if target_sheet is None:
-        if debug:
-            print(f"  [DC Lookup] Sheet '{sheet_name}' not found in DC file.", file=sys.stderr)
-            print(f"  [DC Lookup] Available sheets ({len(dc_wb.sheetnames)}): {', '.join(dc_wb.sheetnames[:5])}...", file=sys.stderr)
-        return None
-    
-    if debug:
-        print(f"  [DC Lookup] Found sheet: '{target_sheet}'", file=sys.stderr)
-    
-    ws = dc_wb[target_sheet]
-    
-    # Find column indices for "From", "To", and "Final Revison"
     from_col = None
     to_col = None
     final_revision_col = None
     header_row = None
+    header_rows = rows[:10]
     
     # First pass: find the header row by looking for a row that has multiple expected headers
-    for row_num in range(1, min(11, ws.max_row + 1)):
+    for row_num, row_data in enumerate(header_rows, start=1):
         found_headers = []
-        for col_idx in range(1, min(ws.max_column + 1, 20)):
-            cell = ws.cell(row=row_num, column=col_idx)
-            if cell.value:
-                header_val = str(cell.value).strip().lower()
+        for col_idx, cell_val in enumerate(row_data[:19], start=1):
+            if cell_val:
+                header_val = str(cell_val).strip().lower()
                 if "from" in header_val:
                     found_headers.append(("from", col_idx))
                 elif "to" in header_val and "tb" not in header_val and "no" not in header_val:
@@ -635,11 +1087,10 @@ def find_dc_value(dc_wb, sheet_name, from_time_str, to_time_str, debug=False):
     
     # If we didn't find a good header row, do a second pass with less strict matching
     if header_row is None:
-        for row_num in range(1, min(11, ws.max_row + 1)):
-            for col_idx in range(1, min(ws.max_column + 1, 20)):
-                cell = ws.cell(row=row_num, column=col_idx)
-                if cell.value:
-                    header_val = str(cell.value).strip().lower()
+        for row_num, row_data in enumerate(header_rows, start=1):
+            for col_idx, cell_val in enumerate(row_data[:19], start=1):
+                if cell_val:
+                    header_val = str(cell_val).strip().lower()
                     if "from" in header_val and from_col is None:
                         from_col = col_idx
                         header_row = row_num
@@ -653,106 +1104,622 @@ def find_dc_value(dc_wb, sheet_name, from_time_str, to_time_str, debug=False):
                         if header_row is None:
                             header_row = row_num
     
-    if not (from_col and to_col and final_revision_col):
+    return header_row, from_col, to_col, final_revision_col
+
+
+class DCIndex:
+    """
+    Pre-compiled DC lookup built once per DC workbook.
+    Each date sheet is read once (single iter_rows pass) into a 96-slot array of
+    'Final Revison' values indexed by 15-minute slot; lookups are then O(1).
+    dc_wb may be an openpyxl or xlsx_reader workbook (see xlsx_reader.load_workbook).
+    """
+    def __init__(self, dc_wb):
+        self.dc_wb = dc_wb
+        self.days = {}  # {normalized sheet name: array('d') of 96 slot values, or None}
+        self.sheet_lookup = {}  # {requested sheet name (lower): normalized sheet name or None}
+        self._lock = threading.Lock()  # One sheet compiled at a time (DayPrefetcher reads on a helper thread)
+        # Normalized sheet name (stripped, lower-case) -> actual sheet name; first sheet wins
+        self.sheet_names = {}
+        for name in dc_wb.sheetnames:
+            self.sheet_names.setdefault(name.strip().lower(), name)
+    
+    def _resolve_sheet(self, sheet_name):
+        """Resolve requested sheet name (e.g. '02.01.2026') to normalized sheet key, exact match first."""
+        sheet_name_lower = sheet_name.lower().strip()
+        if sheet_name_lower in self.sheet_lookup:
+            return self.sheet_lookup[sheet_name_lower]
+        key = sheet_name_lower if sheet_name_lower in self.sheet_names else None
+        if key is None:
+            # Partial match (date might be embedded in sheet name)
+            for name_clean in self.sheet_names:
+                if sheet_name_lower in name_clean:
+                    key = name_clean
+                    break
+        self.sheet_lookup[sheet_name_lower] = key
+        return key
+    
+    def _read_rows(self, key):
+        """First rows of a DC sheet: header scan uses the first 10, data search 200 rows after the header."""
+        ws = self.dc_wb[self.sheet_names[key]]
+        rows = []
+        # Header and value columns are within the first 19 columns
+        for row_data in ws.iter_rows(values_only=True, max_col=19):
+            rows.append(row_data)
+            if len(rows) >= 210:
+                break
+        return rows
+    
+    def _compile_sheet(self, key, debug=False):
+        """Read one DC sheet and build its 96-slot Final Revison array. Returns None if columns not found."""
+        try:
+            rows = self._read_rows(key)
+        except xlsx_reader.XlsxReaderError:
+            # Fast reader could not parse this sheet; switch the workbook to openpyxl
+            self.dc_wb = xlsx_reader.reopen_with_openpyxl(self.dc_wb)
+            rows = self._read_rows(key)
+        header_row, from_col, to_col, final_revision_col = _find_dc_header(rows)
+        if not (from_col and to_col and final_revision_col):
+            if debug:
+                print(f"  [DC Lookup] Required columns not found (From={from_col}, To={to_col}, Final={final_revision_col})", file=sys.stderr)
+            return None
         if debug:
-            print(f"  [DC Lookup] Required columns not found (From={from_col}, To={to_col}, Final={final_revision_col})", file=sys.stderr)
+            print(f"  [DC Lookup] Columns found: From={from_col}, To={to_col}, Final={final_revision_col}", file=sys.stderr)
+        
+        slots = _empty_slot_array()
+        filled = bytearray(SLOTS_PER_DAY)
+        for row_data in rows[header_row:header_row + 200]:
+            if len(row_data) < max(from_col, to_col):
+                continue
+            from_raw = row_data[from_col - 1]
+            to_raw = row_data[to_col - 1]
+            if from_raw is None or to_raw is None:
+                continue
+            from_min = time_to_minutes(normalize_time_str(format_value(from_raw)))
+            to_min = time_to_minutes(normalize_time_str(format_value(to_raw)))
+            if from_min is None or to_min is None or from_min % 15 or to_min != (from_min + 15) % (24 * 60):
+                continue
+            slot = from_min // 15
+            # First matching row wins (same as a top-down search)
+            if not filled[slot]:
+                filled[slot] = 1
+                slots[slot] = _to_float(row_data[final_revision_col - 1] if final_revision_col <= len(row_data) else None)
+        return slots
+    
+    def get_day(self, sheet_name, debug=False):
+        """Return 96-slot DC array for a date sheet (e.g. '02.01.2026'), compiling it on first use."""
+        if not sheet_name:
+            return None
+        key = self._resolve_sheet(sheet_name)
+        if key is None:
+            if debug:
+                print(f"  [DC Lookup] Sheet '{sheet_name}' not found in DC file.", file=sys.stderr)
+                print(f"  [DC Lookup] Available sheets ({len(self.dc_wb.sheetnames)}): {', '.join(self.dc_wb.sheetnames[:5])}...", file=sys.stderr)
+            return None
+        if key not in self.days:
+            with self._lock:
+                if key not in self.days:
+                    self.days[key] = self._compile_sheet(key, debug=debug)
+        return self.days[key]
+    
+    def find_slot(self, sheet_name, index, debug=False):
+        """DC 'Final Revison' value of slot index (0–95) on a date sheet, or None."""
+        slots = self.get_day(sheet_name, debug=debug)
+        if slots is None:
+            return None
+        value = slots[index]
+        if math.isnan(value):
+            if debug:
+                print(f"  [DC Lookup] No match found for {' - '.join(slot_times(index * 15))}", file=sys.stderr)
+            return None
+        return value
+    
+    def find_value(self, sheet_name, from_time_str, to_time_str, debug=False):
+        """Find DC 'Final Revison' value for the 15-minute slot from_time_str - to_time_str."""
+        from_min = time_to_minutes(normalize_time_str(from_time_str))
+        to_min = time_to_minutes(normalize_time_str(to_time_str))
+        if from_min is None or to_min is None or from_min % 15 or to_min != (from_min + 15) % (24 * 60):
+            return None
+        return self.find_slot(sheet_name, from_min // 15, debug=debug)
+    
+    def close(self):
+        """Close the underlying DC workbook and drop compiled days."""
+        self.days.clear()
+        try:
+            self.dc_wb.close()
+        except Exception:
+            pass
+
+
+class DayPrefetcher:
+    """
+    Look-ahead loader for the BD and DC data of upcoming dates.
+    dates is the ordered list of instruction dates. Call advance(date_str) when processing
+    moves to a new date: the next `depth` dates are loaded on a helper thread (BD slot
+    arrays via SCADALookupCache.fetch_day, DC sheet via DCIndex.get_day) while the current
+    date is computed. BD results are handed to the cache on the caller's thread.
+    """
+    def __init__(self, dates, scada_cache=None, dc_index=None, depth=1):
+        self.dates = list(dict.fromkeys(d for d in dates if d))  # Ordered, unique
+        self.positions = {d: i for i, d in enumerate(self.dates)}
+        self.scada_cache = scada_cache
+        self.dc_index = dc_index
+        self.depth = max(1, depth)
+        self.futures = {}  # {date_str: Future of the fetch_day result}
+        self.ready = 0  # Dates already loaded when processing reached them
+        self.waited = 0  # Dates still loading when processing reached them
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="day-prefetch")
+    
+    def _fetch(self, date_str):
+        """Helper thread: load one date's BD file and compile its DC sheet."""
+        if self.dc_index:
+            self.dc_index.get_day(convert_date_to_sheet_format(date_str))
+        if self.scada_cache:
+            return self.scada_cache.fetch_day(date_str)
         return None
     
-    if debug:
-        print(f"  [DC Lookup] Columns found: From={from_col}, To={to_col}, Final={final_revision_col}", file=sys.stderr)
+    def advance(self, date_str):
+        """Processing moved to date_str: collect its prefetched data and start loading the next dates."""
+        future = self.futures.pop(date_str, None)
+        if future is not None:
+            if future.done():
+                self.ready += 1
+            else:
+                self.waited += 1
+            try:
+                fetched = future.result()
+            except Exception:
+                fetched = None  # Lookups load it on demand instead
+            if self.scada_cache:
+                self.scada_cache.install_day(date_str, fetched)
+        position = self.positions.get(date_str)
+        if position is None:
+            return
+        for next_date in self.dates[position + 1:position + 1 + self.depth]:
+            if next_date not in self.futures:
+                self.futures[next_date] = self._executor.submit(self._fetch, next_date)
+    
+    def close(self):
+        """Stop the helper thread (pending fetches are cancelled)."""
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+        self._executor.shutdown(wait=True)
+
+
+def find_dc_value(dc_wb, sheet_name, from_time_str, to_time_str, debug=False):
+    """
+    Find DC value from DC workbook sheet for matching time range.
+    Returns the 'Final Revison' column value, or None if not found.
+    For repeated lookups build a DCIndex once and use DCIndex.find_value instead.
+    """
+    if dc_wb is None:
+        if debug:
+            print(f"  [DC Lookup] dc_wb is None", file=sys.stderr)
+        return None
     
-    # Normalize time strings for comparison
-    from_time_norm = normalize_time_str(from_time_str)
-    to_time_norm = normalize_time_str(to_time_str)
+    return DCIndex(dc_wb).find_value(sheet_name, from_time_str, to_time_str, debug=debug)
+
+
+def _find_header_in_rows(header_rows, column_name):
+    """find_column_by_name on header rows already read as value tuples (row 1 first)."""
+    target = column_name.strip().lower()
+    if not target:
+        return None, None
     
-    # Search for matching time range
-    data_start = header_row + 1
-    max_rows_to_check = min(ws.max_row + 1, data_start + 200)
+    for row_num, row_data in enumerate(header_rows, start=1):
+        for col_idx, value in enumerate(row_data, start=1):
+            if value is None:
+                continue
+            val = str(value).strip().lower()
+            # Exact match first
+            if val == target:
+                return col_idx, row_num
+            # Partial match (target contained in header or header contained in target)
+            if target in val or val in target:
+                return col_idx, row_num
     
-    if debug:
-        print(f"  [DC Lookup] Searching for time range: {from_time_norm} - {to_time_norm}", file=sys.stderr)
+    return None, None
+
+
+def find_column_by_name(ws, column_name, max_header_rows=10):
+    """
+    Search for a column in the sheet by header name (case-insensitive, partial match).
+    Scans first max_header_rows for header row.
+    Returns (1-based column index, header_row) or (None, None).
+    """
+    return _find_header_in_rows(islice(ws.iter_rows(values_only=True), max_header_rows), column_name)
+
+
+def _station_matches(cell_val, station_name):
+    """Exact, case-insensitive or partial (station name contained in cell value) match."""
+    return station_name.strip().upper() in cell_val.upper()
+
+
+def find_matching_rows(ws, station_col_idx, station_name, header_row):
+    """
+    Find all rows where the station column matches the given station name.
+    Streams the sheet once with iter_rows. Returns list of (row_num, row_data) tuples.
+    """
+    matches = []
+    data_start = (header_row or 1) + 1
+    rows = islice(ws.iter_rows(values_only=True), data_start - 1, None)
     
-    for row_num in range(data_start, max_rows_to_check):
-        from_cell = ws.cell(row=row_num, column=from_col)
-        to_cell = ws.cell(row=row_num, column=to_col)
-        
-        if from_cell.value is None or to_cell.value is None:
+    for row_num, row_data in enumerate(rows, start=data_start):
+        value = row_data[station_col_idx - 1] if station_col_idx <= len(row_data) else None
+        if value is None:
             continue
+        if _station_matches(str(value).strip(), station_name):
+            matches.append((row_num, list(row_data)))
+    
+    return matches
+
+
+class InstructionsTable:
+    """
+    Instructions sheet read in a single iter_rows pass.
+    The header row and station column are found as find_column_by_name does, every data row is
+    kept as a value tuple, and a station -> row index map serves station discovery (stations),
+    date columns for the report title (column) and match lookup (match) from the same parse.
+    Column indices are 1-based (None if absent): station_col, date_col ('From Date' preferred),
+    from_time_col, to_time_col, to_load_col.
+    """
+    def __init__(self, ws, column_name, max_header_rows=10):
+        rows = ws.iter_rows(values_only=True)
+        header_rows = list(islice(rows, max_header_rows))
+        self.station_col, self.header_row = _find_header_in_rows(header_rows, column_name)
+        self.header = ()  # Header row values
+        self.row_nums = []  # Sheet row number of each data row
+        self.rows = []  # Value tuple of each data row
+        self.station_rows = {}  # {station (stripped): [data row index, ...]} in sheet order
+        self.date_col = self.from_time_col = self.to_time_col = self.to_load_col = None
+        if self.station_col is None:
+            return
+        self.header = header_rows[self.header_row - 1]
+        self._find_columns()
         
-        # Format and normalize cell values for comparison
-        from_val = normalize_time_str(format_value(from_cell.value))
-        to_val = normalize_time_str(format_value(to_cell.value))
+        def _data_rows():
+            yield from header_rows[self.header_row:]
+            yield from rows
         
-        # Match time range
-        if from_val == from_time_norm and to_val == to_time_norm:
-            dc_cell = ws.cell(row=row_num, column=final_revision_col)
-            if debug:
-                print(f"  [DC Lookup] Match found at row {row_num}: DC value = {dc_cell.value}", file=sys.stderr)
-            return dc_cell.value
+        for row_num, row_data in enumerate(_data_rows(), start=self.header_row + 1):
+            index = len(self.rows)
+            self.row_nums.append(row_num)
+            self.rows.append(row_data)
+            value = row_data[self.station_col - 1] if self.station_col <= len(row_data) else None
+            if value is not None:
+                self.station_rows.setdefault(str(value).strip(), []).append(index)
+    
+    def _find_columns(self):
+        """Locate the date, From/To time and To Load columns in the header row."""
+        from_date_col = None
+        for col_idx, value in enumerate(self.header, start=1):
+            val = str(value or "").strip().lower()
+            if "from" in val and "time" in val:
+                self.from_time_col = col_idx
+            elif "to" in val and "time" in val:
+                self.to_time_col = col_idx
+            elif "from" in val and "date" in val:
+                from_date_col = col_idx
+            elif "date" in val and self.date_col is None:
+                self.date_col = col_idx
+            elif "to" in val and "load" in val:
+                self.to_load_col = col_idx
+        if from_date_col is not None:
+            self.date_col = from_date_col
+    
+    def column(self, col_idx, indices=None):
+        """Values of a 1-based column for the given data row indices (default: all rows)."""
+        if indices is None:
+            indices = range(len(self.rows))
+        return [
+            self.rows[i][col_idx - 1] if col_idx and col_idx <= len(self.rows[i]) else None
+            for i in indices
+        ]
+    
+    def stations(self, max_rows=None):
+        """Sorted non-empty station names (only those appearing in the first max_rows data rows, if given)."""
+        return sorted(
+            station for station, indices in self.station_rows.items()
+            if station and (max_rows is None or indices[0] < max_rows)
+        )
+    
+    def match_indices(self, station_name, exact=False):
+        """
+        Data row indices whose station matches station_name (see find_matching_rows), in sheet order.
+        exact=True only takes rows whose station is exactly station_name (e.g. a name from stations()).
+        """
+        if exact:
+            return list(self.station_rows.get(station_name.strip(), []))
+        indices = []
+        for station, station_indices in self.station_rows.items():
+            if _station_matches(station, station_name):
+                indices.extend(station_indices)
+        indices.sort()
+        return indices
+    
+    def match(self, station_name, exact=False):
+        """Matching rows as find_matching_rows returns them: [(row_num, row_data), ...]."""
+        return [(self.row_nums[i], list(self.rows[i])) for i in self.match_indices(station_name, exact=exact)]
+
+
+# Parsed instructions tables kept in memory (the app's station discovery and report worker share them)
+INSTRUCTIONS_CACHE_MAX = 4
+_instructions_cache = OrderedDict()  # {(content digest, sheet, column, data_only, header rows): InstructionsTable}
+
+
+def load_instructions_table(path, column_name, sheet_name="", data_only=True, max_header_rows=10,
+                            engine=xlsx_reader.DEFAULT_ENGINE):
+    """
+    Parse the instructions sheet (sheet_name by flexible match, else the active sheet) into an
+    InstructionsTable. Tables are memoized by file content and options, so repeated loads of the
+    same upload (e.g. under different temp paths) reuse one parse.
+    data_only=True reads cached values with the xlsx_reader engine; False reads formulas with openpyxl.
+    """
+    path = Path(path)
+    digest = hashlib.sha1(path.read_bytes()).hexdigest()
+    key = (digest, sheet_name or "", column_name, bool(data_only), max_header_rows)
+    table = _instructions_cache.get(key)
+    if table is not None:
+        _instructions_cache.move_to_end(key)
+        return table
+    
+    if data_only:
+        wb = xlsx_reader.load_workbook(path, engine=engine)
+    else:
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=False)
     
-    if debug:
-        print(f"  [DC Lookup] No match found for {from_time_norm} - {to_time_norm}", file=sys.stderr)
+    def _select_sheet(wb):
+        if sheet_name:
+            target = sheet_name.strip().lower()
+            for name in wb.sheetnames:
+                if name.strip().lower() == target or target in name.strip().lower():
+                    return wb[name]
+        return wb.active
     
-    return None
+    try:
+        try:
+            table = InstructionsTable(_select_sheet(wb), column_name, max_header_rows=max_header_rows)
+        except xlsx_reader.XlsxReaderError:
+            # Fast reader could not parse this file; read it again with openpyxl
+            wb = xlsx_reader.reopen_with_openpyxl(wb)
+            table = InstructionsTable(_select_sheet(wb), column_name, max_header_rows=max_header_rows)
+    finally:
+        wb.close()
+    
+    _instructions_cache[key] = table
+    while len(_instructions_cache) > INSTRUCTIONS_CACHE_MAX:
+        _instructions_cache.popitem(last=False)
+    return table
+
+
+def _count_slots_and_dates(matches, from_time_col, to_time_col, date_col):
+    """Total 15-minute slots of the matched rows and their dates in order (for progress and BD preload)."""
+    total_slots = 0
+    dates_needed = []
+    for row_num, row_data in matches:
+        if from_time_col and to_time_col and from_time_col <= len(row_data) and to_time_col <= len(row_data):
+            from_time_val = row_data[from_time_col - 1] if from_time_col > 0 else None
+            to_time_val = row_data[to_time_col - 1] if to_time_col > 0 else None
+            if from_time_val is not None and to_time_val is not None:
+                starts = slot_starts(from_time_val, to_time_val)
+                total_slots += len(starts)
+                date_val = row_data[date_col - 1] if date_col and date_col <= len(row_data) else None
+                if starts and date_val:
+                    dates_needed.append(format_value(date_val))
+    return total_slots, dates_needed
+
+
+# (column, type) of the slot report's CSV / Parquet / NDJSON exports (report_export)
+SLOT_REPORT_SCHEMA = [
+    ("Date", "string"),
+    ("From", "string"),
+    ("To", "string"),
+    ("DC (MW)", "float64"),
+    ("As per SLDC Scada in MW", "float64"),
+    ("Diff (MW)", "float64"),
+]
+
+
+def _export_number(value):
+    """DC / SCADA cell value as float for exports; None if empty or not numeric."""
+    try:
+        return float(value) if isinstance(value, (int, float, str)) and str(value).strip() else None
+    except (ValueError, TypeError):
+        return None
+
+
+def write_station_report(station, matches, from_time_col, to_time_col, date_col, output_dir,
+                         dc_index=None, scada_cache=None, scada_column=None, verbose=False, export_formats=()):
+    """
+    Write the 15-minute slot report (Date, From, To, DC, SCADA, Diff) of one station to output_dir.
+    dc_index and scada_cache may be shared by several stations; scada_column selects the
+    station's column in a multi-column SCADALookupCache (None: the cache's first column).
+    export_formats (report_export.EXPORT_FORMATS) also writes the rows as CSV / Parquet / NDJSON
+    next to the xlsx, on helper threads while it is saved.
+    Returns (output_path, counts) where counts holds the DC/SCADA found / not found lookups.
+    """
+    # Create output Excel file
+    output_wb = openpyxl.Workbook()
+    output_sheet = output_wb.active
+    output_sheet.title = "Time Intervals"
+    
+    # Define styles
+    header_font = Font(bold=True, size=11)
+    center_align = Alignment(horizontal='center', vertical='center')
+    thin_border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    # No padding: content starts at A1
+    pad = 0
+    header_row, start_col, start_data_row = 1 + pad, 1 + pad, 2 + pad
+
+    # Headers
+    output_sheet.cell(row=header_row, column=start_col).value = 'Date'
+    output_sheet.cell(row=header_row, column=start_col + 1).value = 'From'
+    output_sheet.cell(row=header_row, column=start_col + 2).value = 'To'
+    output_sheet.cell(row=header_row, column=start_col + 3).value = 'DC (MW)'
+    output_sheet.cell(row=header_row, column=start_col + 4).value = 'As per SLDC Scada in MW'
+    output_sheet.cell(row=header_row, column=start_col + 5).value = 'Diff (MW)'
+
+    # Apply header styles
+    for c in range(6):
+        cell = output_sheet.cell(row=header_row, column=start_col + c)
+        cell.font = header_font
+        cell.alignment = center_align
+        cell.border = thin_border
+    
+    # Populate data rows
+    row_idx = start_data_row
+    counts = {"dc_found": 0, "dc_not_found": 0, "scada_found": 0, "scada_not_found": 0}
+    export_columns = {name: [] for name, _type in SLOT_REPORT_SCHEMA} if export_formats else None
+    
+    # Track progress for SCADA lookups
+    total_slots, _dates = _count_slots_and_dates(matches, from_time_col, to_time_col, date_col)
+    processed_slots = 0
+    current_date = None
+    if scada_cache:
+        print(f"\nProcessing {station}: {len(matches)} time range(s) with {total_slots} total time slots...")
+    
+    for idx, (row_num, row_data) in enumerate(matches, 1):
+        if from_time_col and to_time_col and from_time_col <= len(row_data) and to_time_col <= len(row_data):
+            from_time_val = row_data[from_time_col - 1] if from_time_col > 0 else None
+            to_time_val = row_data[to_time_col - 1] if to_time_col > 0 else None
+            date_val = row_data[date_col - 1] if date_col and date_col > 0 and date_col <= len(row_data) else None
+            
+            if from_time_val is not None and to_time_val is not None:
+                starts = slot_starts(from_time_val, to_time_val)
+                if starts:
+                    date_str = format_value(date_val) if date_val else ""
+                    
+                    for slot_idx, start in enumerate(starts):
+                        index = slot_index(start)
+                        # Show progress for new dates
+                        if date_str and date_str != current_date:
+                            current_date = date_str
+                            if scada_cache:
+                                print(f"\n  Processing date: {date_str}...", flush=True)
+                        
+                        # Write date in first slot of each time range group
+                        if slot_idx == 0 and date_str:
+                            output_sheet.cell(row=row_idx, column=start_col).value = date_str
+                        else:
+                            output_sheet.cell(row=row_idx, column=start_col).value = ""  # Empty for subsequent slots in same range
+                        
+                        slot_from, slot_to = slot_times(start)
+                        output_sheet.cell(row=row_idx, column=start_col + 1).value = slot_from
+                        output_sheet.cell(row=row_idx, column=start_col + 2).value = slot_to
+                        
+                        # Lookup DC value if DC file is provided
+                        dc_value = None
+                        if dc_index and date_str:
+                            sheet_name = convert_date_to_sheet_format(date_str)
+                            if sheet_name:
+                                dc_value = dc_index.find_slot(sheet_name, index, debug=verbose)
+                                if dc_value is not None:
+                                    counts["dc_found"] += 1
+                                else:
+                                    counts["dc_not_found"] += 1
+                            elif verbose:
+                                print(f"  Warning: Could not convert date '{date_str}' to sheet format", file=sys.stderr)
+                        elif verbose and slot_idx == 0 and not dc_index:
+                            print(f"  Warning: DC workbook not available for lookup", file=sys.stderr)
+                        
+                        output_sheet.cell(row=row_idx, column=start_col + 3).value = dc_value if dc_value is not None else ""
+                        
+                        # Lookup SCADA value using cache
+                        scada_value = None
+                        if scada_cache and date_str:
+                            # Show progress only for first slot of each date (when loading file)
+                            show_progress_now = (slot_idx == 0)
+                            scada_value = scada_cache.find_slot(date_str, index, show_progress=show_progress_now, column=scada_column)
+                            if scada_value is not None:
+                                counts["scada_found"] += 1
+                            else:
+                                counts["scada_not_found"] += 1
+                            
+                            # Increment counter and show progress
+                            processed_slots += 1
+                            if slot_idx == len(starts) - 1:  # Last slot of this range
+                                print(f" ({processed_slots}/{total_slots} slots)", flush=True)
+                            elif processed_slots % 50 == 0:
+                                print(".", end="", flush=True)
+                        
+                        output_sheet.cell(row=row_idx, column=start_col + 4).value = scada_value if scada_value is not None else ""
+                        
+                        # Calculate difference: DC - SCADA
+                        diff_value = None
+                        if dc_value is not None and scada_value is not None:
+                            try:
+                                dc_num = float(dc_value) if isinstance(dc_value, (int, float, str)) and str(dc_value).strip() else None
+                                scada_num = float(scada_value) if isinstance(scada_value, (int, float, str)) and str(scada_value).strip() else None
+                                if dc_num is not None and scada_num is not None:
+                                    diff_value = dc_num - scada_num
+                            except (ValueError, TypeError):
+                                pass  # Keep as None if conversion fails
+                        
+                        output_sheet.cell(row=row_idx, column=start_col + 5).value = diff_value if diff_value is not None else ""
 
+                        if export_columns is not None:
+                            for name, value in zip(export_columns, (
+                                date_str if slot_idx == 0 and date_str else None, slot_from, slot_to,
+                                _export_number(dc_value), _export_number(scada_value), diff_value,
+                            )):
+                                export_columns[name].append(value)
 
-def find_column_by_name(ws, column_name, max_header_rows=10):
-    """
-    Search for a column in the sheet by header name (case-insensitive, partial match).
-    Scans first max_header_rows for header row.
-    Returns (1-based column index, header_row) or (None, None).
-    """
-    target = column_name.strip().lower()
-    if not target:
-        return None, None
-    
-    for row_num in range(1, min(max_header_rows + 1, ws.max_row + 1)):
-        for col_idx, cell in enumerate(ws[row_num], start=1):
-            if cell.value is None:
-                continue
-            val = str(cell.value).strip().lower()
-            # Exact match first
-            if val == target:
-                return col_idx, row_num
-            # Partial match (target contained in header or header contained in target)
-            if target in val or val in target:
-                return col_idx, row_num
-    
-    return None, None
+                        # Apply borders
+                        for c in range(6):
+                            output_sheet.cell(row=row_idx, column=start_col + c).border = thin_border
+                        
+                        row_idx += 1
 
+    last_row = row_idx - 1
+    last_content_col = start_col + 5
 
-def find_matching_rows(ws, station_col_idx, station_name, header_row):
-    """
-    Find all rows where the station column matches the given station name.
-    Returns list of (row_num, row_data) tuples.
-    """
-    target = station_name.strip()
-    matches = []
-    data_start = (header_row or 1) + 1
+    # Freeze header row so it stays visible on scroll
+    output_sheet.freeze_panes = output_sheet.cell(row=start_data_row, column=start_col).coordinate
+
+    # Hide gridlines so only content cells (with borders) are visible
+    output_sheet.sheet_view.showGridLines = False
+
+    # Adjust column widths (A through F)
+    for i, w in enumerate([15, 10, 10, 12, 25, 12]):  # Date, From, To, DC, SCADA, Diff
+        output_sheet.column_dimensions[get_column_letter(start_col + i)].width = w
+
+    # Limit print area to content only
+    output_sheet.print_area = f'A1:{get_column_letter(last_content_col)}{last_row}'
     
-    for row_num in range(data_start, ws.max_row + 1):
-        cell = ws.cell(row=row_num, column=station_col_idx)
-        if cell.value is None:
-            continue
-        
-        cell_val = str(cell.value).strip()
-        # Exact match
-        if cell_val == target:
-            row_data = [ws.cell(row=row_num, column=c).value 
-                       for c in range(1, ws.max_column + 1)]
-            matches.append((row_num, row_data))
-        # Case-insensitive match
-        elif cell_val.upper() == target.upper():
-            row_data = [ws.cell(row=row_num, column=c).value 
-                       for c in range(1, ws.max_column + 1)]
-            matches.append((row_num, row_data))
-        # Partial match (station name contained in cell value)
-        elif target.upper() in cell_val.upper():
-            row_data = [ws.cell(row=row_num, column=c).value 
-                       for c in range(1, ws.max_column + 1)]
-            matches.append((row_num, row_data))
+    # Generate output filename with station name and timestamp (human-readable format with AM/PM)
+    # Best practice: Use dashes for all separators (safe on all OS, readable)
+    now = datetime.now()
+    date_part = now.strftime("%d-%b-%Y")
+    # Format time as "2-30-25-PM" (dashes instead of colons, no spaces, no leading zero on hour)
+    hour = now.hour % 12
+    if hour == 0:
+        hour = 12
+    time_part = f"{hour}-{now.minute:02d}-{now.second:02d}-{now.strftime('%p')}"
+    timestamp = f"{date_part}_{time_part}"
+    station_safe = station.replace(" ", "_").replace("/", "_")
+    output_filename = f"{station_safe}_{timestamp}.xlsx"
     
-    return matches
+    # Create output directory if it doesn't exist
+    output_dir.mkdir(exist_ok=True)
+    
+    output_path = output_dir / output_filename
+    
+    # Exports are written on helper threads while the xlsx is saved
+    exports = report_export.write_exports(output_dir / output_path.stem, export_formats, SLOT_REPORT_SCHEMA, export_columns) if export_formats else {}
+    output_wb.save(output_path)
+    print(f"\nOutput file created: {output_path}")
+    for fmt, future in exports.items():
+        try:
+            print(f"Export file created: {future.result()}")
+        except Exception as e:
+            print(f"Warning: {fmt} export failed: {e}", file=sys.stderr)
+    return output_path, counts
 
 
 def main():
@@ -767,8 +1734,21 @@ def main():
     )
     parser.add_argument(
         "--station",
-        required=True,
-        help="Station name to search for (e.g., HINDUJA)",
+        action="append",
+        default=[],
+        help="Station name to search for (e.g., HINDUJA); repeat for several stations (one report each)",
+    )
+    parser.add_argument(
+        "--all-stations",
+        action="store_true",
+        help="Write one report for every station in the instructions sheet",
+    )
+    parser.add_argument(
+        "--scada-map",
+        action="append",
+        default=[],
+        metavar="STATION=COLUMN",
+        help="SCADA column for one station (repeatable); stations not listed use --scada-column",
     )
     parser.add_argument(
         "--sheet",
@@ -824,8 +1804,60 @@ def main():
         help="Sheet name to read from BD files (e.g., 'DATA-CMD'). If not specified, uses active sheet.",
         default=None,
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Directory for compiled BD SCADA arrays (default: cache/bd next to this script)",
+        default=Path(__file__).resolve().parent / "cache" / "bd",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the compiled BD cache",
+    )
+    parser.add_argument(
+        "--reader",
+        choices=xlsx_reader.ENGINES,
+        default=xlsx_reader.DEFAULT_ENGINE,
+        help="xlsx reader for BD and DC files: 'fast' streams the sheet XML (falls back to openpyxl), 'openpyxl' (default: fast)",
+    )
+    parser.add_argument(
+        "--bd-cache-size",
+        type=int,
+        default=BD_CACHE_MAX_FILES,
+        help=f"Max BD files held in memory at once (default: {BD_CACHE_MAX_FILES})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes used to parse BD files up front (default: one per CPU core; 1 = serial)",
+    )
+    parser.add_argument(
+        "--bd-resample",
+        choices=RESAMPLE_METHODS,
+        default=DEFAULT_RESAMPLE,
+        help="How SCADA samples are reduced to 15-minute slots: 'last', 'mean' or 'twa' (time-weighted average) "
+             "read the whole day; 'sample' = legacy value at slot start, first 100 rows only (default: last)",
+    )
+    parser.add_argument(
+        "--export",
+        action="append",
+        choices=report_export.EXPORT_FORMATS,
+        default=[],
+        help="Also write each report as csv, parquet or ndjson next to the xlsx (repeatable)",
+    )
     
     args = parser.parse_args()
+    if not args.station and not args.all_stations:
+        parser.error("one of --station or --all-stations is required")
+    unavailable = [fmt for fmt in args.export if fmt not in report_export.available_formats()]
+    if unavailable:
+        parser.error(f"--export {unavailable[0]} needs pyarrow (pip install pyarrow)")
+    try:
+        scada_columns = parse_scada_column_map(args.scada_map)
+    except ValueError as e:
+        parser.error(f"--scada-map: {e}")
     
     xlsx_path = args.instructions_file
     if not xlsx_path.is_file():
@@ -854,7 +1886,7 @@ def main():
             pass  # BD folder found, continue
         elif bd_folder:
             bd_folder = None
-    elif args.scada_column:
+    elif args.scada_column or scada_columns:
         # If scada-column is provided but no bd-folder, try default
         default_bd = Path("data/BD")
         if default_bd.exists() and default_bd.is_dir():
@@ -862,7 +1894,7 @@ def main():
         else:
             bd_folder = None
     
-    if args.scada_column and not bd_folder:
+    if (args.scada_column or scada_columns) and not bd_folder:
         print("Warning: BD folder not found. SCADA values will not be filled.", file=sys.stderr)
     
     # Load DC workbook if provided
@@ -899,7 +1931,7 @@ def main():
         
         if dc_path_resolved and dc_path_resolved.is_file():
             try:
-                dc_wb = openpyxl.load_workbook(dc_path_resolved, read_only=True, data_only=True)
+                dc_wb = xlsx_reader.load_workbook(dc_path_resolved, engine=args.reader)
             except Exception as e:
                 print(f"Error loading DC file: {e}", file=sys.stderr)
                 print("Continuing without DC values...", file=sys.stderr)
@@ -925,8 +1957,9 @@ def main():
     else:
         ws = wb.active
     
-    # Find column
-    col_idx, header_row = find_column_by_name(ws, args.column, max_header_rows=args.header_rows)
+    # Read the sheet once: header row, station column and all data rows
+    table = InstructionsTable(ws, args.column, max_header_rows=args.header_rows)
+    col_idx, header_row = table.station_col, table.header_row
     if col_idx is None:
         print(f"Error: No column matching '{args.column}' found in sheet '{ws.title}'", file=sys.stderr)
         print(f"Searched first {args.header_rows} rows.", file=sys.stderr)
@@ -936,237 +1969,88 @@ def main():
         wb.close()
         sys.exit(1)
     
-    # Find matching rows
-    matches = find_matching_rows(ws, col_idx, args.station, header_row)
-    
-    # Try to find "From Time" and "To Time" columns for 15-minute extraction
-    from_time_col = None
-    to_time_col = None
-    date_col = None
-    
-    for col_idx_header in range(1, ws.max_column + 1):
-        header_cell = ws.cell(row=header_row, column=col_idx_header)
-        if header_cell.value:
-            header_val = str(header_cell.value).strip().lower()
-            if "from" in header_val and "time" in header_val:
-                from_time_col = col_idx_header
-            elif "to" in header_val and "time" in header_val:
-                to_time_col = col_idx_header
-            elif "date" in header_val:
-                date_col = col_idx_header
-    
-    if not date_col and (args.dc_file or args.scada_column):
+    # Stations to report on: every station in the sheet, or the --station names given
+    if args.all_stations:
+        stations = table.stations()
+    else:
+        stations = list(dict.fromkeys(args.station))
+    station_jobs = []  # [(station, matches, SCADA column)]
+    for station in stations:
+        # Names taken from the sheet itself match exactly; --station keeps the partial match
+        matches = table.match(station, exact=args.all_stations)
+        if not matches:
+            print(f"No rows found where '{args.column}' = '{station}'")
+            continue
+        station_jobs.append((station, matches, scada_column_for_station(scada_columns, station, args.scada_column)))
+    
+    # "From Time" / "To Time" columns for 15-minute extraction and the date column (From Date when present),
+    # as the table found them: the same columns the app's report uses
+    from_time_col, to_time_col, date_col = table.from_time_col, table.to_time_col, table.date_col
+
+    scada_columns_needed = list(dict.fromkeys(column for _station, _matches, column in station_jobs if column))
+    if not date_col and (args.dc_file or scada_columns_needed):
         print("Warning: Date column not found.", file=sys.stderr)
     if not from_time_col or not to_time_col:
         print("Warning: From/To Time columns not found.", file=sys.stderr)
     
-    if not matches:
-        print(f"No rows found where '{args.column}' = '{args.station}'")
+    if not station_jobs:
         wb.close()
         sys.exit(0)
     
-    # Create output Excel file
-    output_wb = openpyxl.Workbook()
-    output_sheet = output_wb.active
-    output_sheet.title = "Time Intervals"
-    
-    # Define styles
-    header_font = Font(bold=True, size=11)
-    center_align = Alignment(horizontal='center', vertical='center')
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    # No padding: content starts at A1
-    pad = 0
-    header_row, start_col, start_data_row = 1 + pad, 1 + pad, 2 + pad
-
-    # Headers
-    output_sheet.cell(row=header_row, column=start_col).value = 'Date'
-    output_sheet.cell(row=header_row, column=start_col + 1).value = 'From'
-    output_sheet.cell(row=header_row, column=start_col + 2).value = 'To'
-    output_sheet.cell(row=header_row, column=start_col + 3).value = 'DC (MW)'
-    output_sheet.cell(row=header_row, column=start_col + 4).value = 'As per SLDC Scada in MW'
-    output_sheet.cell(row=header_row, column=start_col + 5).value = 'Diff (MW)'
-
-    # Apply header styles
-    for c in range(6):
-        cell = output_sheet.cell(row=header_row, column=start_col + c)
-        cell.font = header_font
-        cell.alignment = center_align
-        cell.border = thin_border
+    # Pre-compiled DC lookup (each date sheet is read once), shared by all stations
+    dc_index = DCIndex(dc_wb) if dc_wb else None
     
-    # Initialize SCADA cache if BD folder is provided (builds file list, loads files on demand)
+    # Initialize SCADA cache if BD folder is provided (builds file list, loads files on demand);
+    # one cache extracts every station's SCADA column in the same pass over each BD file
     scada_cache = None
-    if bd_folder and args.scada_column:
-        scada_cache = SCADALookupCache(bd_folder, args.scada_column, args.bd_sheet)
-    
-    # Populate data rows
-    row_idx = start_data_row
-    dc_found_count = 0
-    dc_not_found_count = 0
-    scada_found_count = 0
-    scada_not_found_count = 0
-    
-    # Track progress for SCADA lookups
-    total_slots = 0
-    processed_slots = 0
-    current_date = None
-    
-    # Count total slots first (for progress calculation)
-    for idx, (row_num, row_data) in enumerate(matches, 1):
-        if from_time_col and to_time_col and from_time_col <= len(row_data) and to_time_col <= len(row_data):
-            from_time_val = row_data[from_time_col - 1] if from_time_col > 0 else None
-            to_time_val = row_data[to_time_col - 1] if to_time_col > 0 else None
-            if from_time_val is not None and to_time_val is not None:
-                slots = slots_15min(from_time_val, to_time_val)
-                total_slots += len(slots) if slots else 0
+    if bd_folder and scada_columns_needed:
+        scada_cache = SCADALookupCache(bd_folder, scada_columns_needed, args.bd_sheet, cache_dir=None if args.no_cache else args.cache_dir, engine=args.reader,
+                                       max_files=args.bd_cache_size, resample=args.bd_resample)
+        for warning in bd_duplicate_warnings(scada_cache.duplicate_dates):
+            print(f"Warning: {warning}", file=sys.stderr)
     
     if scada_cache:
-        print(f"\nProcessing {len(matches)} time range(s) with {total_slots} total time slots...")
-    
-    for idx, (row_num, row_data) in enumerate(matches, 1):
-        if from_time_col and to_time_col and from_time_col <= len(row_data) and to_time_col <= len(row_data):
-            from_time_val = row_data[from_time_col - 1] if from_time_col > 0 else None
-            to_time_val = row_data[to_time_col - 1] if to_time_col > 0 else None
-            date_val = row_data[date_col - 1] if date_col and date_col > 0 and date_col <= len(row_data) else None
-            
-            if from_time_val is not None and to_time_val is not None:
-                slots = slots_15min(from_time_val, to_time_val)
-                if slots:
-                    date_str = format_value(date_val) if date_val else ""
-                    
-                    for slot_idx, (slot_from, slot_to) in enumerate(slots):
-                        # Show progress for new dates
-                        if date_str and date_str != current_date:
-                            current_date = date_str
-                            if scada_cache:
-                                print(f"\n  Processing date: {date_str}...", flush=True)
-                        
-                        # Write date in first slot of each time range group
-                        if slot_idx == 0 and date_str:
-                            output_sheet.cell(row=row_idx, column=start_col).value = date_str
-                        else:
-                            output_sheet.cell(row=row_idx, column=start_col).value = ""  # Empty for subsequent slots in same range
-                        
-                        output_sheet.cell(row=row_idx, column=start_col + 1).value = slot_from
-                        output_sheet.cell(row=row_idx, column=start_col + 2).value = slot_to
-                        
-                        # Lookup DC value if DC file is provided
-                        dc_value = None
-                        if dc_wb and date_str:
-                            sheet_name = convert_date_to_sheet_format(date_str)
-                            if sheet_name:
-                                debug_lookup = args.verbose
-                                dc_value = find_dc_value(dc_wb, sheet_name, slot_from, slot_to, debug=debug_lookup)
-                                if dc_value is not None:
-                                    dc_found_count += 1
-                                else:
-                                    dc_not_found_count += 1
-                            elif args.verbose:
-                                print(f"  Warning: Could not convert date '{date_str}' to sheet format", file=sys.stderr)
-                        elif args.verbose and slot_idx == 0 and not dc_wb:
-                            print(f"  Warning: DC workbook not available for lookup", file=sys.stderr)
-                        
-                        output_sheet.cell(row=row_idx, column=start_col + 3).value = dc_value if dc_value is not None else ""
-                        
-                        # Lookup SCADA value using cache
-                        scada_value = None
-                        if scada_cache and date_str:
-                            # Show progress only for first slot of each date (when loading file)
-                            show_progress_now = (slot_idx == 0)
-                            scada_value = find_scada_value(scada_cache, date_str, slot_from, debug=args.verbose, show_progress=show_progress_now)
-                            if scada_value is not None:
-                                scada_found_count += 1
-                            else:
-                                scada_not_found_count += 1
-                            
-                            # Increment counter and show progress
-                            processed_slots += 1
-                            if slot_idx == len(slots) - 1:  # Last slot of this range
-                                print(f" ({processed_slots}/{total_slots} slots)", flush=True)
-                            elif processed_slots % 50 == 0:
-                                print(".", end="", flush=True)
-                        
-                        output_sheet.cell(row=row_idx, column=start_col + 4).value = scada_value if scada_value is not None else ""
-                        
-                        # Calculate difference: DC - SCADA
-                        diff_value = None
-                        if dc_value is not None and scada_value is not None:
-                            try:
-                                dc_num = float(dc_value) if isinstance(dc_value, (int, float, str)) and str(dc_value).strip() else None
-                                scada_num = float(scada_value) if isinstance(scada_value, (int, float, str)) and str(scada_value).strip() else None
-                                if dc_num is not None and scada_num is not None:
-                                    diff_value = dc_num - scada_num
-                            except (ValueError, TypeError):
-                                pass  # Keep as None if conversion fails
-                        
-                        output_sheet.cell(row=row_idx, column=start_col + 5).value = diff_value if diff_value is not None else ""
-
-                        # Apply borders
-                        for c in range(6):
-                            output_sheet.cell(row=row_idx, column=start_col + c).border = thin_border
-                        
-                        row_idx += 1
-
-    last_row = row_idx - 1
-    last_content_col = start_col + 5
-
-    # Freeze header row so it stays visible on scroll
-    output_sheet.freeze_panes = output_sheet.cell(row=start_data_row, column=start_col).coordinate
-
-    # Hide gridlines so only content cells (with borders) are visible
-    output_sheet.sheet_view.showGridLines = False
-
-    # Adjust column widths (A through F)
-    for i, w in enumerate([15, 10, 10, 12, 25, 12]):  # Date, From, To, DC, SCADA, Diff
-        output_sheet.column_dimensions[get_column_letter(start_col + i)].width = w
-
-    # Limit print area to content only
-    output_sheet.print_area = f'A1:{get_column_letter(last_content_col)}{last_row}'
-    
-    # Generate output filename with station name and timestamp (human-readable format with AM/PM)
-    # Best practice: Use dashes for all separators (safe on all OS, readable)
-    now = datetime.now()
-    date_part = now.strftime("%d-%b-%Y")
-    # Format time as "2-30-25-PM" (dashes instead of colons, no spaces, no leading zero on hour)
-    hour = now.hour % 12
-    if hour == 0:
-        hour = 12
-    time_part = f"{hour}-{now.minute:02d}-{now.second:02d}-{now.strftime('%p')}"
-    timestamp = f"{date_part}_{time_part}"
-    station_safe = args.station.replace(" ", "_").replace("/", "_")
-    output_filename = f"{station_safe}_{timestamp}.xlsx"
+        # Collect dates of every station for BD preload
+        dates_needed = []
+        for _station, matches, _column in station_jobs:
+            dates_needed.extend(_count_slots_and_dates(matches, from_time_col, to_time_col, date_col)[1])
+        print("  Loading BD files", end="", flush=True)
+        scada_cache.preload(dict.fromkeys(dates_needed), workers=args.workers, show_progress=True)
+        print(flush=True)
     
-    # Create output directory if it doesn't exist
     output_dir = xlsx_path.parent / "output"
-    output_dir.mkdir(exist_ok=True)
-    
-    output_path = output_dir / output_filename
-    
-    output_wb.save(output_path)
-    print(f"\nOutput file created: {output_path}")
-    
-    # Show summary only if there were issues
-    if dc_wb:
-        total_dc_lookups = dc_found_count + dc_not_found_count
-        if total_dc_lookups > 0 and dc_found_count == 0:
-            print(f"\nWarning: No DC values found ({dc_not_found_count} lookups). Use --verbose for details.", file=sys.stderr)
-    
-    if bd_folder and args.scada_column:
-        total_scada_lookups = scada_found_count + scada_not_found_count
-        if total_scada_lookups > 0 and scada_found_count == 0:
-            print(f"\nWarning: No SCADA values found ({scada_not_found_count} lookups). Use --verbose for details.", file=sys.stderr)
+    for station, matches, scada_column in station_jobs:
+        _output_path, counts = write_station_report(
+            station, matches, from_time_col, to_time_col, date_col, output_dir,
+            dc_index=dc_index, scada_cache=scada_cache if scada_column else None, scada_column=scada_column,
+            verbose=args.verbose, export_formats=args.export,
+        )
+        
+        # Show summary only if there were issues
+        if dc_wb:
+            total_dc_lookups = counts["dc_found"] + counts["dc_not_found"]
+            if total_dc_lookups > 0 and counts["dc_found"] == 0:
+                print(f"\nWarning: No DC values found for {station} ({counts['dc_not_found']} lookups). Use --verbose for details.", file=sys.stderr)
+        
+        if bd_folder and scada_column:
+            total_scada_lookups = counts["scada_found"] + counts["scada_not_found"]
+            if total_scada_lookups > 0 and counts["scada_found"] == 0:
+                print(f"\nWarning: No SCADA values found for {station} ({counts['scada_not_found']} lookups). Use --verbose for details.", file=sys.stderr)
     
     # Close all workbooks and caches
     wb.close()
-    if dc_wb:
-        dc_wb.close()
+    if dc_index:
+        dc_index.close()
     if scada_cache:
+        if args.verbose:
+            stats = scada_cache.stats()
+            print(f"BD cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions "
+                  f"({stats['files']}/{stats['max_files']} files in memory)", file=sys.stderr)
         scada_cache.close_all()
-
+    if args.verbose:
+        stats = date_keys_stats()
+        print(f"Date cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['entries']}/{stats['max_entries']} dates in memory)", file=sys.stderr)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,91 @@
+"""
+Resolved DC / SCADA slot lookups of a report run, cached per input fingerprint.
+A re-run with the same inputs and only different ramp rates skips the instructions,
+DC and BD files and only recomputes the ramp / MU columns (ramp_engine.ReportAssembler).
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# Bump when the cached block layout or the lookup rules change
+LOOKUP_CACHE_VERSION = 2
+
+
+def _file_digest(path):
+    """sha1 of a file's content (None when there is no file)."""
+    if not path:
+        return None
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _folder_state(folder):
+    """(name, mtime_ns, size) of every file in a folder; any added, removed or edited file changes it."""
+    if not folder:
+        return None
+    folder = Path(folder)
+    state = []
+    for path in sorted(folder.iterdir(), key=lambda p: p.name):
+        if path.is_file():
+            stat = path.stat()
+            state.append([path.name, stat.st_mtime_ns, stat.st_size])
+    return [str(folder.resolve()), state]
+
+
+def input_fingerprint(instructions_path, dc_path, bd_folder, options):
+    """
+    Fingerprint of everything the DC / SCADA lookups depend on: instructions and DC file content,
+    the BD folder's files (name, mtime, size) and the lookup options (sheet, columns, stations, ...).
+    Ramp rates are deliberately not part of it.
+    """
+    key = {
+        "version": LOOKUP_CACHE_VERSION,
+        "instructions": _file_digest(instructions_path),
+        "dc": _file_digest(dc_path),
+        "bd": _folder_state(bd_folder),
+        "options": options,
+    }
+    return hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _cache_file(cache_dir, fingerprint):
+    return Path(cache_dir) / f"{fingerprint}.json"
+
+
+def load(cache_dir, fingerprint):
+    """Cached lookups for a fingerprint, or None when missing or unreadable."""
+    cache_file = _cache_file(cache_dir, fingerprint)
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != LOOKUP_CACHE_VERSION or data.get("fingerprint") != fingerprint:
+        return None
+    try:
+        os.utime(cache_file)  # Recently used entries survive pruning
+    except OSError:
+        pass
+    return data
+
+
+def save(cache_dir, fingerprint, data, max_entries=20):
+    """Write lookups for a fingerprint atomically and keep only the max_entries most recent entries."""
+    cache_dir = Path(cache_dir)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_file = _cache_file(cache_dir, fingerprint)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(dict(data, version=LOOKUP_CACHE_VERSION, fingerprint=fingerprint), f)
+        os.replace(tmp_file, cache_file)
+        entries = sorted(cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in entries[max_entries:]:
+            old.unlink()
+    except OSError:
+        pass  # Cache is best-effort; the next run resolves the lookups again
@@ -0,0 +1,126 @@
+"""
+Report rows as CSV, Parquet or NDJSON for downstream systems that should not need an Excel parser.
+Every format has the same fixed schema (column names and types); blanks are empty / null,
+never "" placeholders in numeric columns.
+"""
+
+import csv
+import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from report_rows import NUMERIC_COLUMNS, TIME_TEXT, ReportRows, RowKind
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export needs pyarrow (see available_formats)
+    pa = None
+
+EXPORT_FORMATS = ("csv", "parquet", "ndjson")
+EXPORT_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "ndjson": ".ndjson"}
+
+
+def available_formats():
+    """Export formats usable in this install (parquet needs pyarrow)."""
+    return tuple(fmt for fmt in EXPORT_FORMATS if fmt != "parquet" or pa is not None)
+
+
+# (column, type) of the engine's report rows; types are "string", "float64" or "bool"
+REPORT_SCHEMA = [
+    ("Date", "string"),
+    ("From", "string"),
+    ("To", "string"),
+    *((column, "float64") for column in NUMERIC_COLUMNS),
+    ("Row kind", "string"),  # slot, gap or sum (report_rows.RowKind)
+    ("Instruction end", "bool"),
+]
+
+
+def report_columns(rows: ReportRows) -> dict:
+    """REPORT_SCHEMA columns of report rows: {column: list of values}, None for blanks."""
+    texts = rows.date_table()[1]
+    columns = {
+        "Date": [texts[i] or None for i in rows.date],
+        "From": [TIME_TEXT[m] if m >= 0 else None for m in rows.time_from],
+        "To": [TIME_TEXT[m] if m >= 0 else None for m in rows.time_to],
+    }
+    for column, attr in NUMERIC_COLUMNS.items():
+        columns[column] = [None if math.isnan(v) else v for v in getattr(rows, attr)]
+    columns["Row kind"] = [RowKind(kind).name.lower() for kind in rows.kind]
+    columns["Instruction end"] = [bool(v) for v in rows.ins_end]
+    return columns
+
+
+def export_path(base_path: Path, fmt: str) -> Path:
+    """base_path (a path without extension) with the format's extension."""
+    base_path = Path(base_path)
+    return base_path.with_name(base_path.name + EXPORT_EXTENSIONS[fmt])
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def _write_csv(schema, columns, path):
+    names = [name for name, _type in schema]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        for values in zip(*(columns[name] for name in names)):
+            writer.writerow([_csv_value(v) for v in values])
+
+
+def _write_ndjson(schema, columns, path):
+    names = [name for name, _type in schema]
+    with open(path, "w", encoding="utf-8") as f:
+        for values in zip(*(columns[name] for name in names)):
+            f.write(json.dumps(dict(zip(names, values)), ensure_ascii=False, allow_nan=False))
+            f.write("\n")
+
+
+def _write_parquet(schema, columns, path):
+    if pa is None:
+        raise RuntimeError("Parquet export needs pyarrow")
+    types = {"string": pa.string(), "float64": pa.float64(), "bool": pa.bool_()}
+    arrow_schema = pa.schema([(name, types[kind]) for name, kind in schema])
+    table = pa.table({name: pa.array(columns[name], type=types[kind]) for name, kind in schema}, schema=arrow_schema)
+    pq.write_table(table, path)
+
+
+_WRITERS = {"csv": _write_csv, "parquet": _write_parquet, "ndjson": _write_ndjson}
+
+
+def write_export(base_path: Path, fmt: str, schema, columns) -> Path:
+    """Write columns ({column: values}, None = blank) in one format, atomically; returns the file path."""
+    path = export_path(base_path, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        _WRITERS[fmt](schema, columns, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return path
+
+
+def write_exports(base_path: Path, formats, schema, columns) -> dict:
+    """
+    Start writing columns in every format on helper threads (e.g. while the xlsx is saved);
+    returns {format: Future of the written path}. This does not wait: a file exists only once
+    its future's result() has returned, so callers must wait on every future before using them.
+    """
+    formats = list(dict.fromkeys(formats))
+    if not formats:
+        return {}
+    executor = ThreadPoolExecutor(max_workers=len(formats))
+    futures = {fmt: executor.submit(write_export, base_path, fmt, schema, columns) for fmt in formats}
+    executor.shutdown(wait=False)  # Running writes finish on their threads
+    return futures
@@ -0,0 +1,235 @@
+"""
+Report generation as a chain of generator stages, one station at a time:
+
+    instruction rows -> slot expansion -> DC / SCADA enrichment -> ramp / MU with gap and Sum rows -> sinks
+
+expand_instructions and enrich_blocks are generators and assemble pulls from them, so each instruction
+is expanded, looked up, computed and shown to the sinks before the next row is read. Only the report
+rows themselves (ReportRows) grow. Sinks see every block with the rows so far and then the finished rows:
+the xlsx report, CSV / Parquet / NDJSON exports, the live partial preview and progress / stats counters.
+"""
+
+import json
+
+import find_station_rows as fsr
+import ramp_engine
+import report_export
+from excel_builder import build_report_workbook
+
+MINUTES_PER_DAY = ramp_engine.MINUTES_PER_DAY
+
+
+def expand_instructions(matches, table):
+    """
+    Slot expansion: per matched instruction row (InstructionsTable.match) with a From and To time,
+    {"date", "from_min", "slots", "to_load"} with integer slot starts. Rows without slots are skipped.
+    """
+    from_time_col, to_time_col = table.from_time_col, table.to_time_col
+    date_col = table.date_col  # "From Date" preferred for instruction block date
+    to_load_col = table.to_load_col  # To Load (MW) = floor for MW as per ramp
+    for _row_num, row_data in matches:
+        if not (from_time_col and to_time_col and from_time_col <= len(row_data) and to_time_col <= len(row_data)):
+            continue
+        from_time_val = row_data[from_time_col - 1]
+        to_time_val = row_data[to_time_col - 1]
+        if from_time_val is None or to_time_val is None:
+            continue
+        starts = fsr.slot_starts(from_time_val, to_time_val)
+        if not starts:
+            continue
+        date_val = row_data[date_col - 1] if date_col and date_col <= len(row_data) else None
+        to_load = None
+        if to_load_col and to_load_col <= len(row_data):
+            try:
+                to_load = float(fsr.format_value(row_data[to_load_col - 1])) if row_data[to_load_col - 1] else None
+            except (TypeError, ValueError):
+                to_load = None
+        yield {
+            "date": fsr.format_value(date_val) if date_val else "",
+            "from_min": fsr.time_to_minutes(from_time_val),
+            "slots": starts,
+            "to_load": to_load,
+        }
+
+
+class SlotLookup:
+    """DC and SCADA numbers of slots from a DCIndex and one SCADALookupCache column (either may be None)."""
+
+    def __init__(self, dc_index=None, scada_cache=None, scada_column="", debug=False):
+        self.dc_index = dc_index
+        self.scada_cache = scada_cache
+        self.scada_column = scada_column
+        self.debug = debug
+
+    def __call__(self, slot_dates, starts):
+        """(DC values, SCADA values) of slots, each looked up on its own date; None where missing."""
+        dc_values = []
+        scada_values = []
+        for date_str, start in zip(slot_dates, starts):
+            index = fsr.slot_index(start)
+            dc_value = None
+            if self.dc_index and date_str:
+                sheet_name = fsr.convert_date_to_sheet_format(date_str)
+                if sheet_name:
+                    dc_value = self.dc_index.find_slot(sheet_name, index, debug=self.debug)
+            scada_value = None
+            if self.scada_cache and self.scada_column and date_str:
+                scada_value = self.scada_cache.find_slot(date_str, index, column=self.scada_column)
+            dc_values.append(ramp_engine.to_number(dc_value))
+            scada_values.append(ramp_engine.to_number(scada_value))
+        return dc_values, scada_values
+
+
+def enrich_blocks(instructions, lookup, prefetcher=None):
+    """
+    DC / SCADA enrichment: turn expanded instructions into the resolved blocks ramp_engine.ReportAssembler
+    takes, each with the looked-up gap slots since the previous instruction. The prefetcher (DayPrefetcher)
+    is advanced whenever the instruction date changes.
+    """
+    current_date = None
+    prev_end = None  # To (minutes since midnight) of the previous instruction's last slot
+    prev_date = None  # Date for gap rows between blocks
+    for instruction in instructions:
+        date_str, starts = instruction["date"], instruction["slots"]
+        if date_str and date_str != current_date:
+            current_date = date_str
+            if prefetcher:
+                prefetcher.advance(date_str)
+
+        # Gap from previous instruction to this one (its rows go after the previous instruction)
+        gap = None
+        if prev_end is not None and prev_end != starts[0] % MINUTES_PER_DAY and prev_date:
+            gap_starts = list(fsr.slot_range(prev_end, instruction["from_min"]))
+            # Gap slots after midnight (day offset 1) belong to the new instruction's date
+            dates_differ = prev_date != date_str
+            gap_dates = [date_str if dates_differ and start >= MINUTES_PER_DAY else prev_date for start in gap_starts]
+            gap_dc, gap_scada = lookup(gap_dates, gap_starts)
+            gap = {"slots": gap_starts, "dc": gap_dc, "scada": gap_scada}
+
+        dc_values, scada_values = lookup([date_str] * len(starts), starts)
+        yield {"date": date_str, "slots": starts, "dc": dc_values, "scada": scada_values,
+               "to_load": instruction["to_load"], "gap": gap}
+
+        prev_end = (starts[-1] + 15) % MINUTES_PER_DAY
+        prev_date = date_str
+
+
+def assemble(blocks, rates, sinks=()):
+    """
+    Ramp / MU computation with gap and Sum rows: feed resolved blocks to a ReportAssembler, calling
+    sink.add_block(block, rows) after each block and sink.finish(rows, summary) at the end with the
+    daily / monthly totals (ramp_engine.ReportSummary). Returns the ReportRows.
+    """
+    assembler = ramp_engine.ReportAssembler(rates)
+    for block in blocks:
+        assembler.add_block(block)
+        for sink in sinks:
+            sink.add_block(block, assembler.rows)
+    rows = assembler.finish()
+    summary = assembler.summary()
+    for sink in sinks:
+        sink.finish(rows, summary)
+    return rows
+
+
+class Sink:
+    """Receives every block with the rows assembled so far, then the finished rows and their summary."""
+
+    def add_block(self, block, rows):
+        pass
+
+    def finish(self, rows, summary):
+        pass
+
+
+class StatsSink(Sink):
+    """
+    Counts instructions, slots and gap slots as they pass (across stations when reused) and calls
+    on_progress(processed slots, block date) every `every` slots.
+    """
+
+    def __init__(self, on_progress=None, every=1):
+        self.on_progress = on_progress
+        self.every = max(1, every)
+        self.instructions = 0
+        self.slots = 0
+        self.gap_slots = 0
+        self._last_progress = 0
+
+    def add_block(self, block, rows):
+        self.instructions += 1
+        self.slots += len(block["slots"])
+        if block["gap"]:
+            self.gap_slots += len(block["gap"]["slots"])
+        if self.on_progress and self.slots - self._last_progress >= self.every:
+            self._last_progress = self.slots
+            self.on_progress(self.slots, block["date"])
+
+
+class PartialPreviewSink(Sink):
+    """Write the rows so far as JSON columns (live table) after the first block and then every `every` slots."""
+
+    def __init__(self, path, every):
+        self.path = path
+        self.every = max(1, every)
+        self._slots = 0
+        self._last_write = None
+
+    def add_block(self, block, rows):
+        self._slots += len(block["slots"])
+        if self._last_write is None or self._slots - self._last_write >= self.every:
+            self._last_write = self._slots
+            try:
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump(rows.to_columns(), f, default=str)
+            except Exception:
+                pass
+
+
+class BlockCollector(Sink):
+    """Keep the resolved blocks (for the lookup cache and ramp-rate scenarios)."""
+
+    def __init__(self):
+        self.blocks = []
+
+    def add_block(self, block, rows):
+        self.blocks.append(block)
+
+
+class WorkbookSink(Sink):
+    """xlsx report: build the workbook (with its Summary sheet) and hand it to save(workbook, rows)."""
+
+    def __init__(self, save):
+        self.save = save
+        self.result = None  # What save returned (e.g. the saved filename)
+
+    def finish(self, rows, summary):
+        self.result = self.save(build_report_workbook(rows, summary), rows)
+
+
+class ExportSink(Sink):
+    """
+    CSV / Parquet / NDJSON copies of the report (report_export) at base_path + extension. They are written
+    on helper threads from finish(), so put this sink before the WorkbookSink to overlap them with the xlsx.
+    """
+
+    def __init__(self, base_path, formats):
+        self.base_path = base_path
+        self.formats = formats
+        self.errors = []  # "format: error" of exports that failed
+        self._futures = {}
+
+    def finish(self, rows, summary):
+        """Start the exports and return without waiting; call result() before using the files."""
+        columns = report_export.report_columns(rows)
+        self._futures = report_export.write_exports(self.base_path, self.formats, report_export.REPORT_SCHEMA, columns)
+
+    def result(self):
+        """Wait for the exports; {format: written path} of those that succeeded."""
+        paths = {}
+        for fmt, future in self._futures.items():
+            try:
+                paths[fmt] = future.result()
+            except Exception as e:
+                self.errors.append(f"{fmt}: {e}")
+        return paths
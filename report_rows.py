@@ -0,0 +1,140 @@
+"""Compact columnar store for report rows (instruction slots, gap rows and Sum rows)."""
+
+import math
+from array import array
+from enum import IntEnum
+
+# Report columns in sheet order (the last one is the hidden instruction-end marker)
+COLUMNS = ["Date", "From", "To", "DC (MW)", "As per SLDC Scada in MW", "DC , Scada Diff (MW)", "Mus", "Sum Mus", "MW as per ramp", "Diff", "MU", "Sum MU", "_ins_end"]
+
+# Numeric columns: report column -> ReportRows attribute (NaN = blank cell)
+NUMERIC_COLUMNS = {
+    "DC (MW)": "dc",
+    "As per SLDC Scada in MW": "scada",
+    "DC , Scada Diff (MW)": "diff",
+    "Mus": "mus",
+    "Sum Mus": "sum_mus",
+    "MW as per ramp": "mw",
+    "Diff": "scada_mw_diff",
+    "MU": "mu",
+    "Sum MU": "sum_mu",
+}
+
+_NAN = float("nan")
+
+# "HH:MM" for every minute of the day: From / To are kept as minutes and only formatted on output
+TIME_TEXT = [f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60)]
+
+
+class RowKind(IntEnum):
+    """What a report row is."""
+    SLOT = 0  # 15-min slot of an instruction
+    GAP = 1  # Filled slot between two instructions (ramp up)
+    SUM = 2  # Sum Mus / Sum MU of an instruction
+
+
+def _blank_if_nan(value):
+    return "" if math.isnan(value) else value
+
+
+class ReportRows:
+    """
+    Report rows kept column by column: one typed array per numeric column (NaN for blanks),
+    From / To as minutes since midnight (-1 for blanks), Date as an index into a table of
+    distinct strings, plus the row kind and instruction-end marker. A row costs ~90 bytes
+    instead of a 13-key dict.
+    """
+
+    __slots__ = ("kind", "date", "time_from", "time_to", "ins_end", "_texts", "_text_index", *NUMERIC_COLUMNS.values())
+
+    def __init__(self):
+        self.kind = array("b")
+        self.ins_end = array("b")
+        self.date = array("I")  # Index into _texts (0 = no date)
+        self.time_from = array("h")  # Minutes since midnight (-1 = blank)
+        self.time_to = array("h")
+        for attr in NUMERIC_COLUMNS.values():
+            setattr(self, attr, array("d"))
+        self._texts = [""]
+        self._text_index = {"": 0}
+
+    def __len__(self):
+        return len(self.kind)
+
+    def _text_id(self, text):
+        text = "" if text is None else str(text)
+        idx = self._text_index.get(text)
+        if idx is None:
+            idx = self._text_index[text] = len(self._texts)
+            self._texts.append(text)
+        return idx
+
+    def append_slot(self, kind, date, time_from, time_to, dc, scada, mw, diff, mus, scada_mw_diff, mu, ins_end=False):
+        """Add a slot or gap row; From / To in minutes since midnight, values already rounded, None for blank."""
+        self.kind.append(kind)
+        self.ins_end.append(1 if ins_end else 0)
+        self.date.append(self._text_id(date))
+        self.time_from.append(time_from)
+        self.time_to.append(time_to)
+        for column, value in (
+            (self.dc, dc), (self.scada, scada), (self.mw, mw), (self.diff, diff), (self.mus, mus),
+            (self.scada_mw_diff, scada_mw_diff), (self.mu, mu),
+        ):
+            column.append(_NAN if value is None else value)
+        self.sum_mus.append(_NAN)
+        self.sum_mu.append(_NAN)
+
+    def append_sum(self, sum_mus, sum_mu):
+        """Add the Sum Mus / Sum MU row of an instruction."""
+        self.kind.append(RowKind.SUM)
+        self.ins_end.append(0)
+        self.date.append(0)
+        self.time_from.append(-1)
+        self.time_to.append(-1)
+        for attr in NUMERIC_COLUMNS.values():
+            getattr(self, attr).append(_NAN)
+        self.sum_mus[-1] = sum_mus
+        self.sum_mu[-1] = sum_mu
+
+    def numeric(self, column, start=0):
+        """Values of a numeric report column from row `start` on; None for blanks."""
+        return [None if math.isnan(v) else v for v in getattr(self, NUMERIC_COLUMNS[column])[start:]]
+
+    def date_table(self):
+        """(Date text index per row, distinct Date texts); index 0 is the blank Date."""
+        return self.date, list(self._texts)
+
+    def dates(self):
+        """Non-empty Date values in row order."""
+        texts = self._texts
+        return [texts[i] for i in self.date if i]
+
+    def _column_values(self, column):
+        """One report column as a list of report values ('' for blanks)."""
+        if column in NUMERIC_COLUMNS:
+            values = [_blank_if_nan(v) for v in getattr(self, NUMERIC_COLUMNS[column])]
+            if column == "MU":
+                # Non-positive MU is reported as integer 0
+                values = [0 if v == 0 else v for v in values]
+            return values
+        if column == "_ins_end":
+            return [bool(v) for v in self.ins_end]
+        if column == "Date":
+            texts = self._texts
+            return [texts[i] for i in self.date]
+        minutes = self.time_from if column == "From" else self.time_to
+        return [TIME_TEXT[m] if m >= 0 else "" for m in minutes]
+
+    def to_columns(self):
+        """{report column: list of values}, e.g. for pd.DataFrame or JSON."""
+        return {column: self._column_values(column) for column in COLUMNS}
+
+    def iter_rows(self):
+        """Yield (RowKind, tuple of report values in COLUMNS order) per row."""
+        columns = [self._column_values(column) for column in COLUMNS]
+        for kind, values in zip(self.kind, zip(*columns)):
+            yield RowKind(kind), values
+
+    def to_dicts(self):
+        """Rows as {column: value} dicts (the old output_rows format)."""
+        return [dict(zip(COLUMNS, values)) for _kind, values in self.iter_rows()]
@@ -2,10 +2,27 @@
 
 import json
 import os
-import shutil
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from typing import Optional
 
-from config import REPORTS_DIR, REPORTS_INDEX_FILE
+import numpy as np
+import pandas as pd
+
+from config import DOWNLOAD_CACHE_MAX_BYTES, EXPORTS_DIR, REPORTS_DIR, REPORTS_INDEX_FILE
+from report_export import EXPORT_FORMATS, export_path
+from report_rows import COLUMNS, NUMERIC_COLUMNS, TIME_TEXT, ReportRows
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # No sidecars: reports are read from their xlsx
+    pa = None
+
+# Columnar copy of a report's rows next to its xlsx (the xlsx is kept for download)
+SIDECAR_SUFFIX = ".parquet"
+SIDECAR_VERSION = b"1"
 
 
 def ensure_dir() -> None:
@@ -35,9 +52,133 @@ def append_entry(entry: dict) -> None:
         os.fsync(f.fileno())
 
 
-def save_file(src_path: Path, filename: str) -> Path:
-    """Copy report file to reports dir; returns destination path."""
+def save_bytes(data, filename: str, rows: Optional[ReportRows] = None) -> Path:
+    """
+    Write a serialized report (bytes or a buffer) into the reports dir atomically; returns its path.
+    With rows, also write the report's columnar sidecar (see load_frame).
+    """
     ensure_dir()
     dest = REPORTS_DIR / filename
-    shutil.copy2(src_path, dest)
+    tmp_path = dest.with_name(f"{dest.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, dest)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    if rows is not None:
+        write_sidecar(rows, sidecar_path(filename))
     return dest
+
+
+# Stored files served by download buttons: {(path, mtime_ns, size): bytes}, LRU bounded by total size
+_download_cache = OrderedDict()
+_download_cache_bytes = 0
+_download_lock = threading.Lock()  # Shared by every Streamlit session thread
+
+
+def file_bytes(path: Path) -> Optional[bytes]:
+    """
+    Content of a stored report / export file for a download button; None if it cannot be read.
+    Each file version (path, mtime, size) is read once and kept while the cache stays within
+    DOWNLOAD_CACHE_MAX_BYTES, so reruns do not re-read it; larger files are not kept.
+    """
+    global _download_cache_bytes
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _download_lock:
+        data = _download_cache.get(key)
+        if data is not None:
+            _download_cache.move_to_end(key)
+            return data
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    if len(data) > DOWNLOAD_CACHE_MAX_BYTES:
+        return data
+    with _download_lock:
+        if key not in _download_cache:
+            _download_cache[key] = data
+            _download_cache_bytes += len(data)
+        while _download_cache_bytes > DOWNLOAD_CACHE_MAX_BYTES:
+            _old_key, old_data = _download_cache.popitem(last=False)
+            _download_cache_bytes -= len(old_data)
+    return data
+
+
+def export_base(filename: str) -> Path:
+    """Path (without extension) of a report's exports."""
+    return EXPORTS_DIR / Path(filename).stem
+
+
+def export_files(filename: str) -> list:
+    """Existing export files of a report, in EXPORT_FORMATS order."""
+    paths = (export_path(export_base(filename), fmt) for fmt in EXPORT_FORMATS)
+    return [path for path in paths if path.exists()]
+
+
+def sidecar_path(filename: str) -> Path:
+    return REPORTS_DIR / (Path(filename).stem + SIDECAR_SUFFIX)
+
+
+def write_sidecar(rows: ReportRows, path: Path) -> None:
+    """
+    Write report rows as Parquet: Date dictionary-encoded, From / To as minutes since midnight,
+    numeric columns as float64 (NaN = blank), plus the row kind (report_rows.RowKind) and _ins_end.
+    Best effort: without pyarrow or on error there is no sidecar and the xlsx is read instead.
+    """
+    if pa is None:
+        return
+    date_index, date_texts = rows.date_table()
+    date_index = np.frombuffer(date_index, dtype=np.uint32).astype(np.int32)
+    arrays = {
+        "Date": pa.DictionaryArray.from_arrays(
+            pa.array(date_index, mask=date_index == 0), pa.array(date_texts, type=pa.string())
+        ),
+    }
+    for column, minutes in (("From", rows.time_from), ("To", rows.time_to)):
+        minutes = np.frombuffer(minutes, dtype=np.int16)
+        arrays[column] = pa.array(minutes, mask=minutes < 0)
+    for column, attr in NUMERIC_COLUMNS.items():
+        arrays[column] = pa.array(np.frombuffer(getattr(rows, attr), dtype=np.float64))
+    arrays["_ins_end"] = pa.array(np.frombuffer(rows.ins_end, dtype=np.int8).astype(bool))
+    arrays["_kind"] = pa.array(np.frombuffer(rows.kind, dtype=np.int8))
+    table = pa.table(arrays).replace_schema_metadata({b"report_sidecar": SIDECAR_VERSION})
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def load_frame(filename: str) -> Optional["pd.DataFrame"]:
+    """
+    A saved report's rows from its sidecar as the viewer's DataFrame (report columns in order,
+    blanks as NaN, _ins_end as bool), i.e. what reading the xlsx gives. None when there is no sidecar.
+    """
+    path = sidecar_path(filename)
+    if pa is None or not path.exists():
+        return None
+    try:
+        table = pq.read_table(path)
+        if (table.schema.metadata or {}).get(b"report_sidecar") != SIDECAR_VERSION:
+            return None
+    except Exception:
+        return None
+    nan = float("nan")
+    data = {"Date": [text if text else nan for text in table.column("Date").to_pylist()]}
+    for column in ("From", "To"):
+        data[column] = [TIME_TEXT[m] if m is not None else nan for m in table.column(column).to_pylist()]
+    for column in NUMERIC_COLUMNS:
+        data[column] = table.column(column).to_numpy()
+    data["_ins_end"] = table.column("_ins_end").to_numpy()
+    return pd.DataFrame(data, columns=COLUMNS)
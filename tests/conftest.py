@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The app's modules live at the repository root (no package)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,69 @@
+"""BD sample reduction to 96 slots: the default reads the whole day whatever the SCADA export interval."""
+
+import math
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+import config
+import find_station_rows as fsr
+
+COLUMN = "HNJA4_AG.STTN.X_BUS_GEN.MW"
+JANUARY_BD = Path(__file__).resolve().parent.parent / "data" / "january" / "BD" / "BD  LR  01-01-2026.xlsx"
+
+
+def _bd_workbook(path, interval_minutes):
+    """BD sheet as SLDC exports it: title row, header row, one row per sample; value = minutes since midnight."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "DATA-CMD"
+    ws.append(["REPORT FOR AP Demand_cmd FROM 1/1/2026 TO 1/2/2026"])
+    ws.append(["Time", "SYSCA_AT.SYSTEM.GEN_SOLAR.MW", COLUMN])
+    start = datetime(2026, 1, 1)
+    for minutes in range(0, 24 * 60 + 1, interval_minutes):  # Ends with the next day's 00:00
+        ws.append([start + timedelta(minutes=minutes), 1.0, float(minutes)])
+    wb.save(path)
+    return path
+
+
+def _slots(path, resample=None):
+    kwargs = {} if resample is None else {"resample": resample}
+    return list(fsr.load_bd_slot_arrays(path, "DATA-CMD", [COLUMN], **kwargs)[COLUMN])
+
+
+def test_default_is_a_whole_day_method():
+    assert fsr.DEFAULT_RESAMPLE == config.BD_RESAMPLE == "last"
+
+
+def test_default_keeps_the_whole_day_of_5_minute_data(tmp_path):
+    path = _bd_workbook(tmp_path / "bd.xlsx", 5)
+    assert _slots(path) == [float(slot * 15 + 10) for slot in range(96)]
+    # Legacy slot-start mode stops after 100 rows: a third of the day
+    legacy = _slots(path, "sample")
+    assert legacy[:34] == [float(slot * 15) for slot in range(34)]
+    assert all(math.isnan(v) for v in legacy[34:])
+
+
+def test_default_matches_slot_start_values_for_15_minute_data(tmp_path):
+    assert _slots(_bd_workbook(tmp_path / "bd.xlsx", 15)) == [float(slot * 15) for slot in range(96)]
+    assert _slots(JANUARY_BD) == _slots(JANUARY_BD, "sample")
+
+
+@pytest.mark.parametrize("method, first_slot", [("mean", 5.0), ("twa", 5.0), ("last", 10.0)])
+def test_whole_day_methods_reduce_each_slot(tmp_path, method, first_slot):
+    # Slot 00:00-00:15 holds the samples 0, 5 and 10
+    slots = _slots(_bd_workbook(tmp_path / "bd.xlsx", 5), method)
+    assert slots[0] == first_slot
+    assert slots[95] == first_slot + 95 * 15
+
+
+@pytest.mark.parametrize("method", ["last", "twa"])
+def test_duplicate_timestamps_resolve_by_file_order(method):
+    # 00:05 appears twice; the later row wins whether its value is larger or smaller
+    for first, second in ((100.0, 40.0), (40.0, 100.0)):
+        samples = [(0, 10.0), (5, first), (5, second), (15, 70.0)]
+        slots = fsr.resample_slots(samples, method)
+        assert slots[0] == (second if method == "last" else (10.0 * 5 + second * 10) / 15)
+        assert slots[1] == 70.0
@@ -0,0 +1,54 @@
+"""Instructions sheet parsing: one cached InstructionsTable shared by station discovery and the report worker."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+import find_station_rows as fsr
+from instructions_parser import extract_stations_and_title
+
+INSTRUCTIONS = Path(__file__).resolve().parent.parent / "data" / "january" / "instructions.xlsx"
+COLUMN = "Name of the station"
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    fsr._instructions_cache.clear()
+    yield
+    fsr._instructions_cache.clear()
+
+
+def test_worker_load_reuses_station_discovery_table(tmp_path):
+    # The app copies each upload to its own temp file for discovery and for the worker
+    discovery_path = tmp_path / "discovery.xlsx"
+    worker_path = tmp_path / "worker" / "instructions.xlsx"
+    worker_path.parent.mkdir()
+    shutil.copy(INSTRUCTIONS, discovery_path)
+    shutil.copy(INSTRUCTIONS, worker_path)
+
+    stations, title = extract_stations_and_title(discovery_path, COLUMN)
+    assert stations == ["HINDUJA"]
+    assert title == "⚡ GENERATE REPORT FROM 01-Jan-2026 TO 31-Jan-2026"
+    discovered = fsr.load_instructions_table(discovery_path, COLUMN)
+    # The worker's call with the app's defaults (app.py: header_rows = 10, data_only = True)
+    worker = fsr.load_instructions_table(worker_path, COLUMN, "", data_only=True, max_header_rows=10)
+    assert worker is discovered
+    assert len(fsr._instructions_cache) == 1
+
+
+def test_other_options_get_their_own_table():
+    table = fsr.load_instructions_table(INSTRUCTIONS, COLUMN)
+    assert fsr.load_instructions_table(INSTRUCTIONS, COLUMN, max_header_rows=5) is not table
+    assert fsr.load_instructions_table(INSTRUCTIONS, COLUMN, data_only=False) is not table
+    assert fsr.load_instructions_table(INSTRUCTIONS, COLUMN) is table
+
+
+def test_table_columns_and_matches():
+    table = fsr.load_instructions_table(INSTRUCTIONS, COLUMN)
+    assert table.header[:6] == ("S.No", COLUMN, "From Date", "From Time", "To Date", "To Time")
+    assert (table.station_col, table.date_col, table.from_time_col, table.to_time_col) == (2, 3, 4, 6)
+    matches = table.match("hinduja")
+    assert len(matches) == len(table.rows)
+    assert table.match("HINDUJA", exact=True) == matches
+    assert table.match("NOT A STATION") == []
@@ -0,0 +1,131 @@
+"""lookup_cache: every input of the DC / SCADA lookups invalidates the cache; ramp-rate reruns hit it."""
+
+import json
+import os
+
+import pytest
+
+import lookup_cache
+
+OPTIONS = {
+    "sheet_name": "DATA-CMD",
+    "column_name": "HINDUJA",
+    "header_rows": [2],
+    "data_only": True,
+    "stations": ["HINDUJA"],
+    "scada_column": "HNPCL",
+    "scada_columns": {},
+    "bd_sheet": None,
+    "bd_resample": None,
+}
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    """Instructions file, DC file and a BD folder with two files."""
+    instructions = tmp_path / "instructions.xlsx"
+    instructions.write_bytes(b"instructions v1")
+    dc = tmp_path / "dc.xlsx"
+    dc.write_bytes(b"dc v1")
+    bd_folder = tmp_path / "BD"
+    bd_folder.mkdir()
+    for day in (1, 2):
+        (bd_folder / f"BD LR {day:02d}-01-2026.xlsx").write_bytes(b"scada")
+    return instructions, dc, bd_folder
+
+
+def _fingerprint(inputs, **options):
+    instructions, dc, bd_folder = inputs
+    return lookup_cache.input_fingerprint(instructions, dc, bd_folder, dict(OPTIONS, **options))
+
+
+def test_same_inputs_same_fingerprint(inputs):
+    assert _fingerprint(inputs) == _fingerprint(inputs)
+
+
+def test_instructions_and_dc_content_change_fingerprint(inputs):
+    instructions, dc, _bd_folder = inputs
+    before = _fingerprint(inputs)
+    stat = dc.stat()
+    dc.write_bytes(b"dc v2")  # Same size and mtime: only the content differs
+    os.utime(dc, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    after_dc = _fingerprint(inputs)
+    assert after_dc != before
+    instructions.write_bytes(b"instructions v2")
+    assert _fingerprint(inputs) not in (before, after_dc)
+
+
+def test_touching_a_bd_file_changes_fingerprint(inputs):
+    bd_file = next(inputs[2].iterdir())
+    before = _fingerprint(inputs)
+    stat = bd_file.stat()
+    os.utime(bd_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert _fingerprint(inputs) != before
+
+
+def test_bd_file_size_added_and_removed_files_change_fingerprint(inputs):
+    bd_folder = inputs[2]
+    bd_file = bd_folder / "BD LR 01-01-2026.xlsx"
+    seen = {_fingerprint(inputs)}
+    stat = bd_file.stat()
+    bd_file.write_bytes(b"scada, longer")
+    os.utime(bd_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    seen.add(_fingerprint(inputs))
+    (bd_folder / "BD LR 03-01-2026.xlsx").write_bytes(b"scada")
+    seen.add(_fingerprint(inputs))
+    bd_file.unlink()
+    seen.add(_fingerprint(inputs))
+    assert len(seen) == 4
+
+
+@pytest.mark.parametrize("option, value", [
+    ("bd_resample", "mean"),
+    ("bd_sheet", "Sheet2"),
+    ("column_name", "OTHER"),
+    ("header_rows", [2, 3]),
+    ("data_only", False),
+    ("stations", ["HINDUJA", "OTHER"]),
+    ("scada_columns", {"HINDUJA": "HNPCL-2"}),
+])
+def test_lookup_options_change_fingerprint(inputs, option, value):
+    assert _fingerprint(inputs, **{option: value}) != _fingerprint(inputs)
+
+
+def test_missing_inputs_are_part_of_fingerprint(inputs):
+    instructions, dc, bd_folder = inputs
+    full = lookup_cache.input_fingerprint(instructions, dc, bd_folder, OPTIONS)
+    assert lookup_cache.input_fingerprint(instructions, dc, None, OPTIONS) != full
+    assert lookup_cache.input_fingerprint(instructions, None, bd_folder, OPTIONS) != full
+
+
+def test_save_and_load_round_trip(tmp_path, inputs):
+    cache_dir = tmp_path / "cache"
+    fingerprint = _fingerprint(inputs)
+    data = {"stations": [{"name": "HINDUJA", "blocks": [[1, 2]]}], "warnings": ["missing BD file"]}
+    assert lookup_cache.load(cache_dir, fingerprint) is None
+    lookup_cache.save(cache_dir, fingerprint, data)
+    loaded = lookup_cache.load(cache_dir, fingerprint)
+    assert loaded["stations"] == data["stations"] and loaded["warnings"] == data["warnings"]
+    assert lookup_cache.load(cache_dir, _fingerprint(inputs, bd_resample="mean")) is None
+
+
+def test_load_rejects_other_version_and_corrupt_entries(tmp_path):
+    cache_dir = tmp_path / "cache"
+    lookup_cache.save(cache_dir, "a" * 40, {"stations": []})
+    cache_file = cache_dir / f"{'a' * 40}.json"
+    data = json.loads(cache_file.read_text(encoding="utf-8"))
+    cache_file.write_text(json.dumps(dict(data, version=lookup_cache.LOOKUP_CACHE_VERSION - 1)), encoding="utf-8")
+    assert lookup_cache.load(cache_dir, "a" * 40) is None
+    cache_file.write_text("{not json", encoding="utf-8")
+    assert lookup_cache.load(cache_dir, "a" * 40) is None
+
+
+def test_save_keeps_most_recent_entries(tmp_path):
+    cache_dir = tmp_path / "cache"
+    for i in range(5):
+        fingerprint = f"{i:040d}"
+        lookup_cache.save(cache_dir, fingerprint, {"stations": []}, max_entries=3)
+        cache_file = cache_dir / f"{fingerprint}.json"
+        os.utime(cache_file, (1_000_000 + i, 1_000_000 + i))  # Distinct mtimes regardless of clock resolution
+    assert sorted(p.stem for p in cache_dir.glob("*.json")) == [f"{i:040d}" for i in (2, 3, 4)]
+    assert not list(cache_dir.glob("*.tmp"))
@@ -0,0 +1,210 @@
+"""ramp_engine against the per-slot loop it replaced, the scenario sweep and the rate grid parser."""
+
+import random
+
+import pytest
+
+import ramp_engine
+from ramp_engine import RampRates
+from report_rows import RowKind
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def reference_block(slot_starts, dc_values, scada_values, floor, rates, prev_end=None, prev_end_mw=None):
+    """The report worker's per-slot loop before ramp_engine (times as minutes instead of "HH:MM")."""
+    mw_values, diffs, mus_values, scada_mw_diffs, mu_values = [], [], [], [], []
+    prev_slot_mw = None
+    for slot_idx, start in enumerate(slot_starts):
+        slot_min = start % MINUTES_PER_DAY
+        dc = dc_values[slot_idx]
+        scada = scada_values[slot_idx]
+        if slot_idx == 0:
+            if prev_end is not None and slot_min == prev_end and prev_end_mw is not None:
+                raw = prev_end_mw - rates.down_15
+                if scada is not None and raw > scada:
+                    raw = scada
+                mw = max(floor, raw)
+                if prev_end_mw <= floor:
+                    mw = floor
+            else:
+                if prev_end is None:
+                    gap_min = slot_min - (slot_min // 15) * 15
+                    if gap_min == 0:
+                        gap_min = 15
+                else:
+                    gap_min = (slot_min - prev_end) % MINUTES_PER_DAY
+                    if gap_min <= 0:
+                        gap_min += MINUTES_PER_DAY
+                ramp_down = rates.down_15 if gap_min >= 15 else (rates.down_10 if gap_min >= 10 else rates.down_5)
+                mw = (dc - ramp_down) if dc is not None else None
+        elif prev_slot_mw is not None:
+            mw = max(floor, prev_slot_mw - rates.down_15)
+            if prev_slot_mw <= floor:
+                mw = floor
+        else:
+            mw = None
+        prev_slot_mw = mw
+        diff = round(dc - scada, 2) if dc is not None and scada is not None else None
+        mus = round(float(diff) / 4000, 10) if diff is not None else None
+        scada_mw_diff = round(scada - mw, 2) if scada is not None and mw is not None else None
+        mu = round(scada_mw_diff / 4000, 10) if scada_mw_diff is not None and scada_mw_diff / 4000 > 0 else 0
+        mw_values.append(mw)
+        diffs.append(diff)
+        mus_values.append(mus)
+        scada_mw_diffs.append(scada_mw_diff)
+        mu_values.append(mu)
+    return mw_values, diffs, mus_values, scada_mw_diffs, mu_values
+
+
+def reference_gap(prev_mw, dc_values, scada_values, rates):
+    """The worker's gap-row loop before ramp_engine: ramp up until SCADA would be exceeded."""
+    mw_values, diffs, mus_values, scada_mw_diffs, mu_values = [], [], [], [], []
+    for dc, scada in zip(dc_values, scada_values):
+        if prev_mw is not None:
+            would_be = prev_mw + rates.up_15
+            if scada is not None and would_be > scada:
+                break
+            mw = would_be
+            if dc is not None and mw > dc:
+                mw = dc
+        else:
+            mw = None
+        prev_mw = mw
+        diff = round(dc - scada, 2) if dc is not None and scada is not None else None
+        mus = round(diff / 4000, 10) if diff is not None else None
+        scada_mw_diff = round(scada - mw, 2) if scada is not None and mw is not None else None
+        mu = round(scada_mw_diff / 4000, 10) if scada_mw_diff is not None and scada_mw_diff / 4000 > 0 else 0
+        mw_values.append(mw)
+        diffs.append(diff)
+        mus_values.append(mus)
+        scada_mw_diffs.append(scada_mw_diff)
+        mu_values.append(mu)
+    return mw_values, diffs, mus_values, scada_mw_diffs, mu_values
+
+
+def _value(rng, low, high, missing=0.1):
+    """Random MW value or None; some on a 5 MW grid so ramp steps land exactly on DC / SCADA / floor."""
+    if rng.random() < missing:
+        return None
+    if rng.random() < 0.4:
+        return float(rng.randrange(int(low), int(high), 5))
+    return round(rng.uniform(low, high), rng.choice([0, 1, 2, 3]))
+
+
+def _typed(columns):
+    """Columns with each value's type, so 0 (MU of a non-positive Diff) and 0.0 differ."""
+    return [[(type(v), v) for v in column] for column in columns]
+
+
+def _random_rates(rng):
+    return RampRates(*(rng.choice([10, 15, 20, 25, 27.5, 33.3, 40, 55]) for _ in RampRates._fields))
+
+
+def _random_blocks(rng, count):
+    """Resolved blocks (as report_pipeline.enrich_blocks yields them) with gaps, overnight ranges and blanks."""
+    blocks = []
+    start = rng.randrange(0, MINUTES_PER_DAY, 15)
+    prev_end = None
+    for _ in range(count):
+        if prev_end is not None:
+            start = (prev_end + rng.choice([0, 0, 15, 30, 45, 60, 120])) % MINUTES_PER_DAY
+        slots = [start + 15 * i for i in range(rng.randint(1, 30))]
+        gap = None
+        if prev_end is not None and prev_end != start:
+            gap_slots = list(range(prev_end, prev_end + (start - prev_end) % MINUTES_PER_DAY, 15))
+            gap = {
+                "slots": gap_slots,
+                "dc": [_value(rng, 300, 700) for _ in gap_slots],
+                "scada": [_value(rng, 250, 750) for _ in gap_slots],
+            }
+        blocks.append({
+            "date": f"{rng.randint(1, 28):02d}-Jan-2026",
+            "slots": slots,
+            "dc": [_value(rng, 300, 700) for _ in slots],
+            "scada": [_value(rng, 250, 750) for _ in slots],
+            "to_load": rng.choice([None, 250.0, 300.0, 420.5]),
+            "gap": gap,
+        })
+        prev_end = (slots[-1] + 15) % MINUTES_PER_DAY
+    return blocks
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_compute_block_matches_per_slot_loop(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        rates = _random_rates(rng)
+        start = rng.randrange(0, 2 * MINUTES_PER_DAY - 15, rng.choice([5, 15]))
+        slot_starts = [start + 15 * i for i in range(rng.randint(1, 40))]
+        dc_values = [_value(rng, 280, 700) for _ in slot_starts]
+        scada_values = [_value(rng, 250, 750) for _ in slot_starts]
+        floor = ramp_engine.floor_mw(rng.choice([None, 200.0, 300.0, 450.0]))
+        prev_end = rng.choice([None, start % MINUTES_PER_DAY, rng.randrange(0, MINUTES_PER_DAY, 5)])
+        prev_end_mw = rng.choice([None, 260.0, _value(rng, 250, 700, missing=0)])
+        result = ramp_engine.compute_block(slot_starts, dc_values, scada_values, floor, rates, prev_end, prev_end_mw)
+        assert _typed(result) == _typed(reference_block(slot_starts, dc_values, scada_values, floor, rates, prev_end, prev_end_mw))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_compute_gap_matches_per_slot_loop(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        rates = _random_rates(rng)
+        count = rng.randint(0, 20)
+        dc_values = [_value(rng, 300, 700) for _ in range(count)]
+        scada_values = [_value(rng, 250, 900) for _ in range(count)]
+        prev_mw = rng.choice([None, _value(rng, 250, 500, missing=0)])
+        result = ramp_engine.compute_gap(prev_mw, dc_values, scada_values, rates)
+        assert _typed(result) == _typed(reference_gap(prev_mw, dc_values, scada_values, rates))
+
+
+def test_ramp_down_block_stays_on_floor():
+    assert ramp_engine.ramp_down_block(400.0, 6, 40, 300.0) == [400.0, 360.0, 320.0, 300.0, 300.0, 300.0]
+    assert ramp_engine.ramp_down_block(None, 3, 40, 300.0) == [None, None, None]
+    assert ramp_engine.ramp_down_block(400.0, 0, 40, 300.0) == []
+
+
+def test_gap_ramp_up_stops_at_scada_and_caps_at_dc():
+    assert ramp_engine.gap_ramp_up(300.0, [330.0, 500.0, 500.0], [600.0, 600.0, 360.0], 40) == [330.0, 370.0]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_sweep_matches_per_scenario_assembly(seed):
+    rng = random.Random(seed)
+    blocks = _random_blocks(rng, rng.randint(1, 25))
+    scenarios = [_random_rates(rng) for _ in range(4)]
+    sweeps = ramp_engine.sweep_instruction_sums(blocks, scenarios)
+    for rates, sums in zip(scenarios, sweeps):
+        rows = ramp_engine.assemble_report_rows(blocks, rates)
+        sum_rows = [i for i, kind in enumerate(rows.kind) if kind == RowKind.SUM]
+        assert sums == [(rows.sum_mus[i], rows.sum_mu[i]) for i in sum_rows]
+        assert len(sums) == len(blocks)
+
+
+def test_parse_rate_grid_combinations():
+    base = RampRates()
+    scenarios = ramp_engine.parse_rate_grid(["down_15 = 30, 40, 50", "", "# comment", "Ramp Up 15 = 40; 60"], base)
+    assert [(s.down_15, s.up_15) for s in scenarios] == [
+        (30.0, 40.0), (30.0, 60.0), (40.0, 40.0), (40.0, 60.0), (50.0, 40.0), (50.0, 60.0),
+    ]
+    assert all(s.up_5 == base.up_5 and s.down_10 == base.down_10 for s in scenarios)
+    assert ramp_engine.parse_rate_grid(["ramp_down_5 = 12.5"], base) == [base._replace(down_5=12.5)]
+    assert ramp_engine.parse_rate_grid(["", "  ", "# only comments"], base) == []
+
+
+@pytest.mark.parametrize("entry, message", [
+    ("down_15 30, 40", "Expected 'RATE = value"),
+    ("down_15 =", "Expected 'RATE = value"),
+    ("sideways_15 = 30", "Unknown ramp rate"),
+    ("down_15 = 30, fast", "must be numbers"),
+])
+def test_parse_rate_grid_rejects_bad_input(entry, message):
+    with pytest.raises(ValueError, match=message):
+        ramp_engine.parse_rate_grid([entry], RampRates())
+
+
+def test_scenario_label():
+    base = RampRates()
+    assert ramp_engine.scenario_label(base, base) == "current"
+    assert ramp_engine.scenario_label(base._replace(down_15=30, up_5=12.5), base) == "up_5=12.5 down_15=30"
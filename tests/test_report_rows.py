@@ -0,0 +1,64 @@
+"""ReportRows: columns written in and read back as report values."""
+
+import math
+
+from report_rows import COLUMNS, ReportRows, RowKind
+
+
+def _sample_rows():
+    rows = ReportRows()
+    rows.append_slot(RowKind.SLOT, "01-Jan-2026", 20 * 60 + 15, 20 * 60 + 30, 492.7, 455.44, 452.7, 37.26,
+                     0.009315, 2.74, 0.000685)
+    rows.append_slot(RowKind.SLOT, "", 23 * 60 + 45, 0, 492.7, None, 412.7, None, None, None, 0, ins_end=True)
+    rows.append_slot(RowKind.GAP, None, 0, 15, None, 400.0, 380.0, None, None, 20.0, 0.005)
+    rows.append_sum(0.009, 0.006)
+    rows.append_slot(RowKind.SLOT, "02-Jan-2026", 60, 75, 500.0, 510.0, 460.0, -10.0, -0.0025, 50.0, 0.0125)
+    return rows
+
+
+def test_to_columns_round_trip():
+    columns = _sample_rows().to_columns()
+    assert list(columns) == COLUMNS
+    assert columns["Date"] == ["01-Jan-2026", "", "", "", "02-Jan-2026"]
+    assert columns["From"] == ["20:15", "23:45", "00:00", "", "01:00"]
+    assert columns["To"] == ["20:30", "00:00", "00:15", "", "01:15"]
+    assert columns["DC (MW)"] == [492.7, 492.7, "", "", 500.0]
+    assert columns["As per SLDC Scada in MW"] == [455.44, "", 400.0, "", 510.0]
+    assert columns["Mus"] == [0.009315, "", "", "", -0.0025]
+    assert columns["Sum Mus"] == ["", "", "", 0.009, ""]
+    assert columns["Sum MU"] == ["", "", "", 0.006, ""]
+    assert columns["_ins_end"] == [False, True, False, False, False]
+
+
+def test_zero_mu_is_integer_zero():
+    mu = _sample_rows().to_columns()["MU"]
+    assert mu == [0.000685, 0, 0.005, "", 0.0125]
+    assert type(mu[1]) is int
+
+
+def test_iter_rows_and_dicts_follow_columns():
+    rows = _sample_rows()
+    kinds = [kind for kind, _values in rows.iter_rows()]
+    assert kinds == [RowKind.SLOT, RowKind.SLOT, RowKind.GAP, RowKind.SUM, RowKind.SLOT]
+    dicts = rows.to_dicts()
+    columns = rows.to_columns()
+    assert len(rows) == len(dicts) == 5
+    for i, row in enumerate(dicts):
+        assert list(row) == COLUMNS
+        assert all(row[column] == columns[column][i] for column in COLUMNS)
+
+
+def test_numeric_dates_and_date_table():
+    rows = _sample_rows()
+    assert rows.numeric("MW as per ramp") == [452.7, 412.7, 380.0, None, 460.0]
+    assert rows.numeric("Sum MU", start=3) == [0.006, None]
+    assert rows.dates() == ["01-Jan-2026", "02-Jan-2026"]
+    index, texts = rows.date_table()
+    assert [texts[i] for i in index] == ["01-Jan-2026", "", "", "", "02-Jan-2026"]
+    assert texts[0] == ""
+
+
+def test_blank_numbers_are_nan_in_storage():
+    rows = _sample_rows()
+    assert math.isnan(rows.scada[1]) and math.isnan(rows.sum_mus[0])
+    assert list(rows.time_from) == [1215, 1425, 0, -1, 60]
@@ -0,0 +1,132 @@
+"""xlsx_reader's fast engine against openpyxl read-only mode: same cell values, row by row."""
+
+import re
+import zipfile
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+import xlsx_reader
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+FIXTURES = [
+    DATA_DIR / "january" / "instructions.xlsx",
+    DATA_DIR / "january" / "HNPCL revised DC for the month January 2026 SLDC.xlsx",
+    DATA_DIR / "january" / "BD" / "BD  LR  01-01-2026.xlsx",
+    DATA_DIR / "january" / "BD" / "BD LR_MBED 15-01-2026.xlsx",
+    DATA_DIR / "calculation sheet for BD and non compliance of HNPCL for Jan 26.xlsx",
+]
+
+
+def _rows(path, engine, max_col=None):
+    """{sheet name: rows} of a workbook read with one engine."""
+    wb = xlsx_reader.load_workbook(path, engine=engine)
+    # load_workbook falls back to openpyxl when the fast reader fails, which would compare openpyxl with itself
+    assert isinstance(wb, xlsx_reader.FastWorkbook) == (engine == "fast")
+    try:
+        return {name: list(wb[name].iter_rows(values_only=True, max_col=max_col)) for name in wb.sheetnames}
+    finally:
+        wb.close()
+
+
+def _assert_same_values(path, max_col=None):
+    fast = _rows(path, "fast", max_col)
+    reference = _rows(path, "openpyxl", max_col)
+    assert list(fast) == list(reference)
+    for name, rows in reference.items():
+        assert len(fast[name]) == len(rows), name
+        for row_num, (fast_row, row) in enumerate(zip(fast[name], rows), start=1):
+            assert fast_row == row, f"{name} row {row_num}"
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda p: p.name)
+def test_fixture_workbooks_match_openpyxl(path):
+    _assert_same_values(path)
+
+
+@pytest.mark.parametrize("path", FIXTURES[:3], ids=lambda p: p.name)
+def test_fixture_workbooks_match_openpyxl_with_max_col(path):
+    _assert_same_values(path, max_col=5)
+
+
+def _share_strings(path, cell_refs):
+    """Move the given inline-string cells of the first sheet into a shared string table (as Excel writes them)."""
+    with zipfile.ZipFile(path) as zf:
+        parts = {name: zf.read(name) for name in zf.namelist()}
+    sheet = parts["xl/worksheets/sheet1.xml"]
+    shared = []
+    for ref in cell_refs:
+        match = re.search(rb'<c r="' + ref.encode() + rb'"([^>]*?) t="inlineStr"([^>]*)><is>(.*?)</is></c>', sheet)
+        assert match, ref
+        cell = b'<c r="%s"%s t="s"%s><v>%d</v></c>' % (ref.encode(), match.group(1), match.group(2), len(shared))
+        shared.append(match.group(3))
+        sheet = sheet[:match.start()] + cell + sheet[match.end():]
+    parts["xl/worksheets/sheet1.xml"] = sheet
+    parts["xl/sharedStrings.xml"] = (
+        b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="%d" uniqueCount="%d">'
+        % (len(shared), len(shared))
+        + b"".join(b"<si>" + text + b"</si>" for text in shared) + b"</sst>"
+    )
+    parts["xl/_rels/workbook.xml.rels"] = parts["xl/_rels/workbook.xml.rels"].replace(
+        b"</Relationships>",
+        b'<Relationship Id="rIdShared" Target="sharedStrings.xml" '
+        b'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/></Relationships>',
+    )
+    parts["[Content_Types].xml"] = parts["[Content_Types].xml"].replace(
+        b"</Types>",
+        b'<Override PartName="/xl/sharedStrings.xml" '
+        b'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>',
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+
+
+def test_edge_cases_match_openpyxl(tmp_path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "DATA-CMD"
+    ws.append(["Name of the station", "Date", "Time", "MW", "Flag", "Note"])
+    ws.append(["HINDUJA", date(2026, 1, 1), time(0, 15), 455.44, True, "shared"])
+    ws.append(["HINDUJA", datetime(2026, 1, 1, 23, 45), time(23, 45), -12, False, None])
+    ws["A6"] = "sparse row after empty rows"
+    ws["H6"] = 1.5  # Beyond the other rows' last column
+    ws["B7"] = timedelta(hours=30, minutes=15)
+    ws["C7"] = "=D2*2"  # Formula without a cached value
+    ws["D8"] = 0.1 + 0.2
+    ws["E8"] = "  padded  "
+    ws["F8"] = "über ✓"
+    ws.merge_cells("A9:C10")
+    ws["A9"] = "merged"
+    ws["D9"] = 10 ** 15
+    other = wb.create_sheet("01.01.2026")
+    other["B3"] = "second sheet"
+    other["C3"] = 492.7
+    path = tmp_path / "edge.xlsx"
+    wb.save(path)
+    _share_strings(path, ["A1", "F2", "E8"])
+
+    _assert_same_values(path)
+    _assert_same_values(path, max_col=3)
+    rows = _rows(path, "fast")
+    assert rows["DATA-CMD"][0][0] == "Name of the station"  # Shared string
+    assert rows["DATA-CMD"][5][0] == "sparse row after empty rows"  # Inline string
+    assert rows["DATA-CMD"][3] == rows["DATA-CMD"][4]  # Empty rows stay in place
+
+
+def test_malformed_file_raises_reader_error(tmp_path):
+    path = tmp_path / "broken.xlsx"
+    wb = openpyxl.Workbook()
+    wb.active["A1"] = "value"
+    wb.save(path)
+    with zipfile.ZipFile(path) as zf:
+        parts = {name: zf.read(name) for name in zf.namelist() if name != "xl/workbook.xml"}
+        parts["xl/workbook.xml"] = zf.read("xl/workbook.xml")[:-40]  # Truncated XML
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+    with pytest.raises(xlsx_reader.XlsxReaderError):
+        xlsx_reader.FastWorkbook(path)
@@ -0,0 +1,311 @@
+"""Fast read-only xlsx value reader: streams sheet XML straight from the zip, with openpyxl as fallback."""
+
+import posixpath
+import re
+import zipfile
+from pathlib import Path
+from xml.etree.ElementTree import ParseError, iterparse
+
+import openpyxl
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.cell import column_index_from_string
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, WINDOWS_EPOCH, from_ISO8601, from_excel
+
+# Reader engines: "fast" streams the XML (falls back to openpyxl if it can't), "openpyxl" always uses openpyxl
+ENGINES = ("fast", "openpyxl")
+DEFAULT_ENGINE = "fast"
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+DOC_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+ROW_TAG = f"{MAIN_NS}row"
+CELL_TAG = f"{MAIN_NS}c"
+VALUE_TAG = f"{MAIN_NS}v"
+TEXT_TAG = f"{MAIN_NS}t"
+RUN_TAG = f"{MAIN_NS}r"
+INLINE_STRING_TAG = f"{MAIN_NS}is"
+DIMENSION_TAG = f"{MAIN_NS}dimension"
+
+_CELL_REF = re.compile(r"([A-Z]+)(\d*)")
+
+# Errors that mean "this file can't be read by the fast reader" (caller should use openpyxl)
+_PARSE_ERRORS = (ParseError, KeyError, IndexError, ValueError, zipfile.BadZipFile, zipfile.LargeZipFile)
+
+
+class XlsxReaderError(Exception):
+    """The fast reader could not read the file; read it with openpyxl instead."""
+
+
+def _text_content(node):
+    """Text of a shared/inline string: plain <t> plus rich-text runs (phonetic runs ignored), as openpyxl."""
+    snippets = []
+    plain = node.find(TEXT_TAG)
+    if plain is not None and plain.text is not None:
+        snippets.append(plain.text)
+    for run in node.findall(RUN_TAG):
+        text = run.findtext(TEXT_TAG)
+        if text is not None:
+            snippets.append(text)
+    return "".join(snippets)
+
+
+def _cast_number(value):
+    """Convert a numeric cell string to int or float (same rule as openpyxl)."""
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+class FastSheet:
+    """One worksheet of a FastWorkbook; only supports iter_rows(values_only=True)."""
+
+    def __init__(self, workbook, title, part):
+        self.parent = workbook
+        self.title = title
+        self._part = part
+
+    def iter_rows(self, values_only=True, max_col=None):
+        """
+        Yield row value tuples from row 1, like openpyxl read-only iter_rows(values_only=True).
+        Missing rows are yielded as empty rows; rows are padded to max_col (or the sheet dimension).
+        Cells right of max_col are skipped without converting their values.
+        """
+        if not values_only:
+            raise ValueError("FastSheet only supports values_only=True")
+        wb = self.parent
+        try:
+            source = wb._zip.open(self._part)
+        except (KeyError, zipfile.BadZipFile) as e:
+            raise XlsxReaderError(str(e)) from e
+        try:
+            width = max_col
+            row_counter = 0
+            for _event, element in iterparse(source):
+                tag = element.tag
+                if tag == DIMENSION_TAG:
+                    if width is None:
+                        ref = element.get("ref", "").split(":")[-1]
+                        match = _CELL_REF.match(ref)
+                        if match:
+                            width = column_index_from_string(match.group(1))
+                    continue
+                if tag != ROW_TAG:
+                    continue
+                row_num = int(element.get("r") or row_counter + 1)
+                # Rows absent from the XML are empty
+                while row_counter + 1 < row_num:
+                    row_counter += 1
+                    yield (None,) * (width or 0)
+                row_counter = row_num
+                values = self._row_values(element, max_col)
+                element.clear()
+                if width and len(values) < width:
+                    values.extend([None] * (width - len(values)))
+                yield tuple(values)
+        except _PARSE_ERRORS as e:
+            raise XlsxReaderError(f"{self.title}: {e}") from e
+        finally:
+            source.close()
+
+    def _row_values(self, row, max_col):
+        """Convert the <c> elements of one <row> to a list of values indexed by column."""
+        wb = self.parent
+        values = []
+        col_counter = 0
+        for cell in row.iter(CELL_TAG):
+            ref = cell.get("r")
+            if ref:
+                col_counter = column_index_from_string(_CELL_REF.match(ref).group(1))
+            else:
+                col_counter += 1
+            if max_col and col_counter > max_col:
+                break
+            data_type = cell.get("t", "n")
+            if data_type == "inlineStr":
+                node = cell.find(INLINE_STRING_TAG)
+                value = _text_content(node) if node is not None else None
+            else:
+                value = cell.findtext(VALUE_TAG) or None
+                if value is not None:
+                    if data_type == "n":
+                        value = _cast_number(value)
+                        style_id = int(cell.get("s") or 0)
+                        if style_id in wb.date_styles:
+                            try:
+                                value = from_excel(value, wb.epoch, timedelta=style_id in wb.timedelta_styles)
+                            except (OverflowError, ValueError):
+                                value = "#VALUE!"
+                    elif data_type == "s":
+                        value = wb.shared_strings[int(value)]
+                    elif data_type == "b":
+                        value = bool(int(value))
+                    elif data_type == "d":
+                        value = from_ISO8601(value)
+            if col_counter > len(values):
+                values.extend([None] * (col_counter - len(values)))
+            values[col_counter - 1] = value
+        return values
+
+
+class FastWorkbook:
+    """
+    Read-only xlsx workbook that streams worksheet XML straight from the zip.
+    Only cell values are read: styles.xml is scanned just far enough to know which
+    cell formats are dates, and sharedStrings.xml is loaded on first use.
+    Mirrors the subset of openpyxl's read-only API used here (sheetnames, wb[name], active, close).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        try:
+            self._zip = zipfile.ZipFile(self.path)
+        except (OSError, zipfile.BadZipFile) as e:
+            raise XlsxReaderError(str(e)) from e
+        self._names = set(self._zip.namelist())
+        try:
+            self._read_workbook()
+        except _PARSE_ERRORS as e:
+            self._zip.close()
+            raise XlsxReaderError(str(e)) from e
+        self._shared_strings = None
+        self._date_styles = None
+        self._timedelta_styles = set()
+
+    def _read_rels(self, part):
+        """Return {relationship id: (type, target part)} for a package part."""
+        rels_part = posixpath.join(posixpath.dirname(part), "_rels", posixpath.basename(part) + ".rels")
+        rels = {}
+        if rels_part not in self._names:
+            return rels
+        for _event, element in iterparse(self._zip.open(rels_part)):
+            if element.tag != f"{PKG_REL_NS}Relationship":
+                continue
+            target = element.get("Target", "")
+            if target.startswith("/"):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(posixpath.dirname(part), target))
+            rels[element.get("Id")] = (element.get("Type", ""), target)
+        return rels
+
+    def _read_workbook(self):
+        """Read sheet names, their parts, the active sheet and the date epoch from workbook.xml."""
+        self._part = "xl/workbook.xml"
+        for rel_type, target in self._read_rels("").values():
+            if rel_type.endswith("/officeDocument"):
+                self._part = target
+                break
+        rels = self._read_rels(self._part)
+        self._sheets = []  # [(title, part)] in workbook order
+        self._active_index = 0
+        self.epoch = WINDOWS_EPOCH
+        active_seen = False
+        for _event, element in iterparse(self._zip.open(self._part)):
+            tag = element.tag
+            if tag == f"{MAIN_NS}sheet":
+                rel_id = element.get(f"{DOC_REL_NS}id")
+                if rel_id in rels:
+                    self._sheets.append((element.get("name"), rels[rel_id][1]))
+            elif tag == f"{MAIN_NS}workbookView" and not active_seen:
+                active_seen = True
+                self._active_index = int(element.get("activeTab") or 0)
+            elif tag == f"{MAIN_NS}workbookPr":
+                if element.get("date1904") in ("1", "true"):
+                    self.epoch = CALENDAR_MAC_1904
+        self._styles_part = None
+        self._strings_part = None
+        for rel_type, target in rels.values():
+            if rel_type.endswith("/styles"):
+                self._styles_part = target
+            elif rel_type.endswith("/sharedStrings"):
+                self._strings_part = target
+
+    def _read_styles(self):
+        """Index which cellXfs entries use a date / timedelta number format (stops after cellXfs)."""
+        self._date_styles = set()
+        if not self._styles_part or self._styles_part not in self._names:
+            return
+        custom_formats = {}
+        in_cell_xfs = False
+        idx = 0
+        for event, element in iterparse(self._zip.open(self._styles_part), events=("start", "end")):
+            tag = element.tag
+            if tag == f"{MAIN_NS}numFmt" and event == "end":
+                custom_formats[int(element.get("numFmtId"))] = element.get("formatCode")
+            elif tag == f"{MAIN_NS}cellXfs":
+                if event == "end":
+                    break  # Named styles, dxfs etc. follow; not needed for values
+                in_cell_xfs = True
+            elif tag == f"{MAIN_NS}xf" and in_cell_xfs and event == "start":
+                num_fmt_id = int(element.get("numFmtId") or 0)
+                fmt = custom_formats.get(num_fmt_id, BUILTIN_FORMATS.get(num_fmt_id))
+                if is_date_format(fmt):
+                    self._date_styles.add(idx)
+                if is_timedelta_format(fmt):
+                    self._timedelta_styles.add(idx)
+                idx += 1
+
+    @property
+    def date_styles(self):
+        if self._date_styles is None:
+            self._read_styles()
+        return self._date_styles
+
+    @property
+    def timedelta_styles(self):
+        if self._date_styles is None:
+            self._read_styles()
+        return self._timedelta_styles
+
+    @property
+    def shared_strings(self):
+        if self._shared_strings is None:
+            strings = []
+            if self._strings_part and self._strings_part in self._names:
+                for _event, element in iterparse(self._zip.open(self._strings_part)):
+                    if element.tag == f"{MAIN_NS}si":
+                        strings.append(_text_content(element).replace("x005F_", ""))
+                        element.clear()
+            self._shared_strings = strings
+        return self._shared_strings
+
+    @property
+    def sheetnames(self):
+        return [title for title, _part in self._sheets]
+
+    def __getitem__(self, name):
+        for title, part in self._sheets:
+            if title == name:
+                return FastSheet(self, title, part)
+        raise KeyError(f"Worksheet {name} does not exist.")
+
+    @property
+    def active(self):
+        try:
+            title, part = self._sheets[self._active_index]
+        except IndexError:
+            return None
+        return FastSheet(self, title, part)
+
+    def close(self):
+        self._zip.close()
+
+
+def load_workbook(path, engine=DEFAULT_ENGINE):
+    """
+    Open an xlsx for reading cell values (the equivalent of openpyxl read_only=True, data_only=True).
+    engine 'fast' returns a FastWorkbook, or an openpyxl workbook if the file can't be read that way
+    (e.g. .xls); engine 'openpyxl' always uses openpyxl.
+    """
+    if engine == "fast" and Path(path).suffix.lower() in (".xlsx", ".xlsm"):
+        try:
+            return FastWorkbook(path)
+        except XlsxReaderError:
+            pass
+    return openpyxl.load_workbook(path, read_only=True, data_only=True)
+
+
+def reopen_with_openpyxl(wb):
+    """Close a FastWorkbook that failed mid-read and reopen the same file with openpyxl."""
+    wb.close()
+    return openpyxl.load_workbook(wb.path, read_only=True, data_only=True)